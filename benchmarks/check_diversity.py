@@ -0,0 +1,123 @@
+"""多样性选择的行为检查
+
+几家媒体对同一事件的不同标题（改写、换动词、中英文）应归为一个故事，在选出的 Top K 中只出现一次；
+不同事件即使标题句式相同（"X releases A" 与 "Y releases B"）也不应被合并。不需要网络和密钥。
+
+用法：
+    python -m benchmarks.check_diversity
+    python -m benchmarks.check_diversity --threshold 0.3 --verbose
+"""
+import argparse
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.article import Article, NewsCategory
+from src.processor.diversity import StorySelector
+
+# 事件 -> 各家媒体的（标题, 导语）
+STORIES = {
+    "gpt5": [
+        ("OpenAI launches GPT-5 with better reasoning",
+         "OpenAI on Thursday released GPT-5, its new flagship model, saying it reasons better and hallucinates less."),
+        ("OpenAI unveils GPT-5, its most capable model yet",
+         "Sam Altman introduced GPT-5 at a livestream event, calling it a major step for ChatGPT users."),
+        ("GPT-5 is here: what you need to know",
+         "The new model from OpenAI is rolling out to ChatGPT free and paid users starting today."),
+        ("OpenAI's GPT-5 arrives for ChatGPT users",
+         "GPT-5 replaces GPT-4o as the default model in ChatGPT, OpenAI said."),
+    ],
+    "gemini": [
+        ("Google releases Gemini 3",
+         "Google DeepMind's Gemini 3 model is now available in the Gemini app and API."),
+        ("Gemini 3 is Google's answer to GPT-5",
+         "Google says Gemini 3 tops benchmarks in coding and math, as Sundar Pichai touts the launch."),
+        ("Google DeepMind debuts Gemini 3 Pro",
+         "The Gemini 3 Pro model brings longer context and better agents, DeepMind said."),
+    ],
+    "nvidia": [
+        ("Nvidia earnings beat expectations as AI demand soars",
+         "Nvidia reported record data center revenue in its fiscal third quarter."),
+        ("Nvidia posts record revenue on data center boom",
+         "Jensen Huang said demand for Blackwell chips remains off the charts."),
+        ("Nvidia Q3 results top Wall Street estimates",
+         "Shares of Nvidia rose after hours as revenue beat analyst forecasts."),
+    ],
+    "fed": [
+        ("Fed holds rates steady",
+         "The Federal Reserve left its benchmark interest rate unchanged on Wednesday."),
+        ("Federal Reserve keeps interest rates unchanged, signals patience",
+         "Powell said the Fed will wait for more inflation data before cutting."),
+        ("Powell: Fed in no hurry to cut rates",
+         "The Federal Reserve kept rates on hold as inflation stays above target."),
+    ],
+    "rrr": [
+        ("央行宣布降准0.5个百分点", "中国人民银行决定下调金融机构存款准备金率0.5个百分点，释放长期资金约1万亿元。"),
+        ("央行降准 释放长期资金约1万亿元", "人民银行宣布全面降准0.5个百分点，支持实体经济。"),
+        ("中国人民银行下调存款准备金率", "降准0.5个百分点将于下周生效，释放流动性约1万亿元。"),
+    ],
+    "tesla": [
+        ("Tesla recalls Model Y over software bug",
+         "Tesla is recalling about 200,000 Model Y vehicles due to a rearview camera software issue."),
+        ("Tesla issues recall for 200,000 Model Y SUVs",
+         "An over-the-air software update will fix the camera issue, NHTSA said."),
+    ],
+    "msft_earnings": [
+        ("Microsoft earnings beat expectations", "Microsoft's cloud revenue grew 30% as Azure demand stayed strong."),
+    ],
+    "msft_copilot": [
+        ("Microsoft announces new Copilot features", "Copilot gets memory and vision features in Windows."),
+    ],
+    "apple": [("Apple releases iOS 19 beta", "Developers can now download the first beta of iOS 19.")],
+    "meta": [("Meta releases Llama 4 open weights", "Meta made Llama 4 available to developers with open weights.")],
+    "anthropic": [("Anthropic raises new funding round", "Anthropic raised $13 billion at a $183 billion valuation.")],
+    "huawei": [("华为发布新款手机", "华为发布Mate 80系列手机，搭载麒麟芯片。")],
+}
+
+
+def build_articles(seed: int):
+    """每篇报道一篇文章，评分随机（同一事件的报道评分相近），返回文章和 URL -> 事件"""
+    rng = random.Random(seed)
+    articles, labels = [], {}
+    for story, reports in STORIES.items():
+        base = rng.uniform(6.0, 9.5)
+        for i, (title, lead) in enumerate(reports):
+            url = f"https://news{i}.example.com/{story}"
+            article = Article(title, url, lead, NewsCategory.TECH, f"outlet-{i}")
+            article.score = round(min(base + rng.uniform(-0.5, 0.5), 10.0), 1)
+            articles.append(article)
+            labels[article.norm_url] = story
+    return articles, labels
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="检查同一事件的多家报道是否只选出一篇")
+    parser.add_argument("--threshold", type=float, default=None, help="归组阈值，默认 DIVERSITY_CLUSTER_THRESHOLD")
+    parser.add_argument("--seeds", type=int, default=20, help="用多少组随机评分检查")
+    parser.add_argument("--verbose", action="store_true", help="打印每组的选择结果")
+    args = parser.parse_args()
+
+    selector = StorySelector(threshold=args.threshold)
+    failures = 0
+    for seed in range(args.seeds):
+        articles, labels = build_articles(seed)
+        # 要的篇数与事件数相同：每个事件应恰好出现一次
+        selected = selector.select(articles, top_k=len(STORIES))
+        counts = Counter(labels[article.norm_url] for article in selected)
+        duplicated = sorted(story for story, count in counts.items() if count > 1)
+        missing = sorted(set(STORIES) - set(counts))
+        if args.verbose or duplicated or missing:
+            print(f"seed={seed}: " + ", ".join(f"{labels[a.norm_url]}({a.score})" for a in selected))
+        if duplicated or missing:
+            failures += 1
+            print(f"  ✗ 重复: {duplicated or '无'}  被误合并: {missing or '无'}")
+
+    print(f"阈值 {selector.threshold}: {args.seeds - failures}/{args.seeds} 组通过")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
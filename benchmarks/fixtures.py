@@ -0,0 +1,114 @@
+"""基准测试用的 feed 数据
+
+可以回放录制好的 feed 文件（目录下的 *.xml），也可以按指定规模生成可复现的合成 feed。
+合成数据包含 HTML 内容、feed 模板文字、中英文标题和一定比例的近重复标题。
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+EN_SUBJECTS = ["OpenAI", "Anthropic", "Google", "Nvidia", "Apple", "Microsoft", "Meta", "DeepSeek", "Tesla", "AMD"]
+EN_VERBS = ["launches", "releases", "unveils", "acquires", "invests in", "delays", "open-sources", "updates"]
+EN_OBJECTS = [
+    "a new reasoning model", "its latest GPU", "an AI agent platform", "a coding assistant",
+    "a multimodal LLM", "a robotics startup", "new privacy controls", "an inference chip",
+]
+ZH_SUBJECTS = ["央行", "证监会", "腾讯", "阿里巴巴", "字节跳动", "华为", "小米", "比亚迪", "宁德时代", "美团"]
+ZH_VERBS = ["发布", "宣布", "推出", "下调", "完成", "启动", "披露", "加码"]
+ZH_OBJECTS = ["新一代大模型", "季度财报", "存款准备金率", "新能源汽车战略", "芯片研发计划", "海外扩张计划", "智能体平台", "数亿元融资"]
+
+BOILERPLATE = [
+    '<p>The post {title} appeared first on Example News.</p>',
+    '<p><a href="https://example.com/read">Read more</a></p>',
+    '<p><a href="https://example.com/full">阅读全文</a></p>',
+]
+
+
+def _title(rng: random.Random, index: int, chinese: bool) -> str:
+    if chinese:
+        return f"{rng.choice(ZH_SUBJECTS)}{rng.choice(ZH_VERBS)}{rng.choice(ZH_OBJECTS)}（第{index}期）"
+    return f"{rng.choice(EN_SUBJECTS)} {rng.choice(EN_VERBS)} {rng.choice(EN_OBJECTS)} #{index}"
+
+
+def _reword(rng: random.Random, title: str) -> str:
+    """生成近重复标题（大小写、标点、少量措辞变化）"""
+    variants = [title.upper(), title + "!", title.replace(" ", "  "), "快讯：" + title, title + " - report"]
+    return rng.choice(variants)
+
+
+def generate_feed(name: str, entries: int, seed: int = 0, chinese: bool = False,
+                  duplicate_rate: float = 0.1, now: Optional[datetime] = None) -> bytes:
+    """
+    生成一个 RSS 2.0 feed
+
+    Args:
+        name: feed 名称（同时作为链接的 host）
+        entries: 条目数量
+        seed: 随机种子
+        chinese: 是否生成中文标题
+        duplicate_rate: 近重复条目的比例
+        now: 最新条目的发布时间
+    """
+    rng = random.Random(f"{name}-{seed}")
+    now = now or datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+    titles: List[str] = []
+    items = []
+
+    for i in range(entries):
+        if titles and rng.random() < duplicate_rate:
+            title = _reword(rng, rng.choice(titles))
+        else:
+            title = _title(rng, i, chinese)
+        titles.append(title)
+
+        paragraphs = "".join(
+            f"<p>{escape(title)} — paragraph {p} with <b>details</b> and "
+            f"<a href=\"https://t.example.com/?utm_source=rss&amp;id={i}\">tracking links</a>.</p>"
+            for p in range(rng.randint(1, 6))
+        )
+        description = paragraphs + '<img src="https://t.example.com/pixel.gif"/>' + rng.choice(BOILERPLATE).format(
+            title=escape(title)
+        )
+        published = format_datetime(now - timedelta(minutes=7 * i + rng.randint(0, 6)))
+        items.append(
+            "<item>"
+            f"<title>{escape(title)}</title>"
+            f"<link>https://{name}.example.com/articles/{i}?utm_source=rss</link>"
+            f"<description>{escape(description)}</description>"
+            f"<pubDate>{published}</pubDate>"
+            "</item>"
+        )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<rss version="2.0"><channel><title>{escape(name)}</title>'
+        f'<link>https://{name}.example.com/</link><description>benchmark feed</description>'
+        + "".join(items) +
+        "</channel></rss>"
+    ).encode("utf-8")
+
+
+def load_fixtures(directory: Path) -> Dict[str, bytes]:
+    """读取目录下录制好的 feed（文件名去掉扩展名作为 feed 名称）"""
+    return {path.stem: path.read_bytes() for path in sorted(Path(directory).glob("*.xml"))}
+
+
+def build_fixtures(total_entries: int, sources: int, seed: int = 0,
+                   now: Optional[datetime] = None) -> Dict[str, bytes]:
+    """
+    生成 sources 个 feed，共约 total_entries 个条目，一半中文一半英文
+
+    Args:
+        now: 最新条目的发布时间，默认为固定时间（测试新鲜度截止时传入当前时间）
+
+    Returns:
+        feed 名称 -> feed 内容
+    """
+    per_source = max(total_entries // max(sources, 1), 1)
+    return {
+        f"feed{i}": generate_feed(f"feed{i}", per_source, seed=seed, chinese=i % 2 == 1, now=now)
+        for i in range(sources)
+    }
@@ -0,0 +1,262 @@
+"""本地 Mock Anthropic 服务 - 用于离线测试和基准测试
+
+支持 /v1/messages 和 Message Batches 接口（创建、查询、取消、结果），
+回复内容根据提示词自动生成：批量评分返回 JSON 数组，单篇评分返回 JSON 对象，其余返回摘要文本。
+
+用法：
+    python -m benchmarks.mock_llm --port 8765 --batch-delay 5
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 AI_MODE=batch python run.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+_ITEM_RE = re.compile(r"^\[(\d+)\]", re.M)
+
+
+def _now_iso(offset: float = 0) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=offset)).isoformat()
+
+
+def _text_of(params: dict) -> str:
+    """取出最后一条用户消息的文本"""
+    content = params.get("messages", [{}])[-1].get("content", "")
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content
+
+
+def _score_for(text: str) -> int:
+    """按内容生成稳定的伪随机分数"""
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest(), 16) % 10 + 1
+
+
+def make_reply(params: dict) -> str:
+    """根据提示词生成回复"""
+    text = _text_of(params)
+    ids = _ITEM_RE.findall(text)
+    if ids:
+        lines = {int(i): line for i, line in zip(ids, re.split(r"^\[\d+\]", text, flags=re.M)[1:])}
+        return json.dumps(
+            [{"id": i, "score": _score_for(lines[i]), "reason": "mock"} for i in sorted(lines)],
+            ensure_ascii=False
+        )
+    if '"score"' in text:
+        return json.dumps({"score": _score_for(text), "reason": "mock"}, ensure_ascii=False)
+    title = text.splitlines()[0] if text else ""
+    return f"摘要：{title[:60]}"
+
+
+def make_message(params: dict) -> dict:
+    """构造 Message 响应体"""
+    reply = make_reply(params)
+    system = params.get("system") or []
+    system_text = "".join(block.get("text", "") for block in system) if isinstance(system, list) else system
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model", "mock"),
+        "content": [{"type": "text", "text": reply}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": len(_text_of(params)) // 2,
+            "output_tokens": len(reply) // 2,
+            "cache_read_input_tokens": len(system_text) // 2,
+            "cache_creation_input_tokens": 0,
+        },
+    }
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    """多线程 HTTP 服务（默认的 listen 队列只有 5，高并发时客户端会连接超时）"""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class MockLLMServer:
+    """
+    Mock Anthropic 服务
+
+    Args:
+        port: 监听端口，0 表示随机端口
+        latency: 每次 /v1/messages 请求的延迟（秒）
+        error_rate: 返回 429/529 错误的概率
+        batch_delay: message batch 从提交到完成的时间（秒）
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, error_rate: float = 0.0,
+                 batch_delay: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.batch_delay = batch_delay
+        self.random = random.Random(seed)
+        self.batches = {}
+        self.counts = {"messages": 0, "errors": 0, "batches": 0, "batch_requests": 0}
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status: int, body, headers: Optional[dict] = None):
+                data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_POST(self):
+                path = self.path.split("?")[0]
+                if path == "/v1/messages":
+                    server._handle_message(self, self._body())
+                elif path == "/v1/messages/batches":
+                    self._json(200, server._create_batch(self._body()))
+                elif path.startswith("/v1/messages/batches/") and path.endswith("/cancel"):
+                    batch_id = path.split("/")[-2]
+                    self._json(200, server._cancel_batch(batch_id))
+                else:
+                    self._json(404, {"type": "error", "error": {"type": "not_found_error", "message": path}})
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                parts = path.split("/")
+                if path.startswith("/v1/messages/batches/") and path.endswith("/results"):
+                    self._json(200, server._batch_results(parts[-2]),
+                               headers={"Content-Type": "application/binary"})
+                elif path.startswith("/v1/messages/batches/"):
+                    self._json(200, server._batch_view(parts[-1]))
+                else:
+                    self._json(404, {"type": "error", "error": {"type": "not_found_error", "message": path}})
+
+        self.httpd = MockHTTPServer(("127.0.0.1", port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._thread = None
+
+    # ---------------------------- messages ----------------------------
+
+    def _handle_message(self, handler, params: dict):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.counts["messages"] += 1
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.counts["errors"] += 1
+
+        if failed:
+            status = self.random.choice([429, 529])
+            error_type = "rate_limit_error" if status == 429 else "overloaded_error"
+            handler._json(status, {"type": "error", "error": {"type": error_type, "message": "mock"}},
+                          headers={"retry-after": "0"})
+            return
+        handler._json(200, make_message(params))
+
+    # ---------------------------- batches -----------------------------
+
+    def _create_batch(self, body: dict) -> dict:
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+        with self._lock:
+            self.counts["batches"] += 1
+            self.counts["batch_requests"] += len(body.get("requests", []))
+            self.batches[batch_id] = {
+                "requests": body.get("requests", []),
+                "created": time.time(),
+                "created_at": _now_iso(),
+                "canceled": False,
+            }
+        return self._batch_view(batch_id)
+
+    def _cancel_batch(self, batch_id: str) -> dict:
+        with self._lock:
+            self.batches[batch_id]["canceled"] = True
+        return self._batch_view(batch_id)
+
+    def _batch_view(self, batch_id: str) -> dict:
+        batch = self.batches[batch_id]
+        total = len(batch["requests"])
+        ended = batch["canceled"] or time.time() - batch["created"] >= self.batch_delay
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else total,
+                "succeeded": total if ended and not batch["canceled"] else 0,
+                "errored": 0,
+                "canceled": total if batch["canceled"] else 0,
+                "expired": 0,
+            },
+            "created_at": batch["created_at"],
+            "expires_at": _now_iso(86400),
+            "ended_at": _now_iso() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": _now_iso() if batch["canceled"] else None,
+            "results_url": f"{self.base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _batch_results(self, batch_id: str) -> bytes:
+        batch = self.batches[batch_id]
+        lines = []
+        for request in batch["requests"]:
+            if batch["canceled"]:
+                result = {"type": "canceled"}
+            else:
+                result = {"type": "succeeded", "message": make_message(request["params"])}
+            lines.append(json.dumps({"custom_id": request["custom_id"], "result": result}, ensure_ascii=False))
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    # ---------------------------- 生命周期 -----------------------------
+
+    def start(self) -> "MockLLMServer":
+        """在后台线程启动服务"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Anthropic 服务")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="每次请求的延迟（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 429/529 的概率")
+    parser.add_argument("--batch-delay", type=float, default=0.0, help="message batch 完成所需时间（秒）")
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.port, args.latency, args.error_rate, args.batch_delay)
+    print(f"Mock Anthropic 服务已启动: {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
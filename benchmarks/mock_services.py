@@ -0,0 +1,154 @@
+"""本地 Mock 服务 - feed 源、Hacker News API 和飞书 Webhook"""
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from typing import Dict, Optional
+
+from benchmarks.mock_llm import MockHTTPServer
+
+
+class _MockServer:
+    """在后台线程运行的 HTTP 服务基类"""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status: int, body: bytes, content_type: str = "application/json",
+                      headers: Optional[dict] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                server._dispatch(self, "GET")
+
+            def do_POST(self):
+                server._dispatch(self, "POST")
+
+        self.httpd = MockHTTPServer(("127.0.0.1", port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+
+    def _dispatch(self, handler, method: str):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.counts["requests"] += 1
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.counts["errors"] += 1
+        self.handle(handler, method, failed)
+
+    def handle(self, handler, method: str, failed: bool):
+        raise NotImplementedError
+
+    def start(self):
+        """在后台线程启动服务"""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class MockFeedServer(_MockServer):
+    """
+    feed 源和 Hacker News API
+
+    /feeds/<name> 返回 feed 内容（支持 ETag 条件请求），
+    /v0/topstories.json 和 /v0/item/<id>.json 模拟 Hacker News。
+    """
+
+    def __init__(self, feeds: Dict[str, bytes], hn_stories: int = 500, **kwargs):
+        super().__init__(**kwargs)
+        self.feeds = feeds
+        self.hn_stories = hn_stories
+
+    def feed_url(self, name: str) -> str:
+        return f"{self.base_url}/feeds/{name}"
+
+    def handle(self, handler, method: str, failed: bool):
+        if failed:
+            handler.reply(503, b"unavailable", "text/plain")
+            return
+
+        path = handler.path.split("?")[0]
+        if path.startswith("/feeds/"):
+            name = path[len("/feeds/"):]
+            body = self.feeds.get(name)
+            if body is None:
+                handler.reply(404, b"not found", "text/plain")
+                return
+            etag = f'"{hash(body) & 0xffffffff:x}"'
+            if handler.headers.get("If-None-Match") == etag:
+                with self._lock:
+                    self.counts["not_modified"] += 1
+                handler.reply(304, b"", headers={"ETag": etag})
+                return
+            with self._lock:
+                self.counts["bytes"] += len(body)
+            handler.reply(200, body, "application/rss+xml; charset=utf-8", headers={"ETag": etag})
+
+        elif path == "/v0/topstories.json":
+            handler.reply(200, json.dumps(list(range(1, self.hn_stories + 1))).encode())
+
+        elif path.startswith("/v0/item/"):
+            story_id = int(path.rsplit("/", 1)[-1].split(".")[0])
+            topic = "LLM agents" if story_id % 4 == 0 else "Rust compilers"
+            story = {
+                "id": story_id,
+                "title": f"Show HN: {topic} in production #{story_id}",
+                "url": f"https://hn.example.com/{story_id}",
+                "score": (story_id * 37) % 600,
+                "time": 1767261600 - story_id * 60,
+                "type": "story",
+            }
+            handler.reply(200, json.dumps(story).encode())
+
+        else:
+            handler.reply(404, b"not found", "text/plain")
+
+
+class MockFeishuServer(_MockServer):
+    """飞书自定义机器人 Webhook，失败时返回限流错误码"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.payload_bytes = 0
+
+    def webhook_url(self, name: str = "bench") -> str:
+        return f"{self.base_url}/open-apis/bot/v2/hook/{name}"
+
+    def handle(self, handler, method: str, failed: bool):
+        length = int(handler.headers.get("Content-Length") or 0)
+        handler.rfile.read(length)
+        with self._lock:
+            self.payload_bytes += length
+
+        if failed:
+            body = {"code": 9499, "msg": "too many request", "data": {}}
+        else:
+            body = {"code": 0, "msg": "success", "data": {}}
+        handler.reply(200, json.dumps(body).encode())
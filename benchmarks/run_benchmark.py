@@ -0,0 +1,357 @@
+"""离线端到端基准测试
+
+在本地启动 Mock feed/Hacker News、Mock Anthropic 和 Mock 飞书服务，
+用指定规模的 feed 数据依次运行 获取 -> 归一化 -> 去重 -> 预排序 -> 筛选 -> 摘要 -> 推送，
+报告每个阶段的耗时、内存峰值、请求数和吞吐量。不需要网络和真实的密钥。
+
+用法：
+    python -m benchmarks.run_benchmark --entries 5000 --sources 12
+    python -m benchmarks.run_benchmark --entries 20000 --llm-latency 0.2 --llm-error-rate 0.05
+    python -m benchmarks.run_benchmark --fixtures-dir recorded_feeds/ --pipeline --json result.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import Config
+from src.models.article import NewsCategory, ProcessedArticle
+from src.utils.metrics import metrics
+
+from benchmarks.fixtures import build_fixtures, load_fixtures
+from benchmarks.mock_llm import MockLLMServer
+from benchmarks.mock_services import MockFeedServer, MockFeishuServer
+
+
+class StageResult:
+    """单个阶段的测量结果"""
+
+    def __init__(self, name: str, seconds: float, peak_mb: Optional[float], items_in: int, items_out: int,
+                 requests: Dict[str, int]):
+        self.name = name
+        self.seconds = seconds
+        self.peak_mb = peak_mb
+        self.items_in = items_in
+        self.items_out = items_out
+        self.requests = requests
+
+    @property
+    def throughput(self) -> float:
+        """每秒处理的输入条目数"""
+        return self.items_in / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "seconds": round(self.seconds, 4),
+            "peak_mb": round(self.peak_mb, 2) if self.peak_mb is not None else None,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "throughput": round(self.throughput, 1),
+            "requests": self.requests,
+        }
+
+
+class Benchmark:
+    """基准测试运行器"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.results: List[StageResult] = []
+
+        if args.fixtures_dir:
+            feeds = load_fixtures(Path(args.fixtures_dir))
+            if not feeds:
+                raise SystemExit(f"× {args.fixtures_dir} 下没有 *.xml 文件")
+        else:
+            # 条目按 7 分钟左右的间隔从当前时间往前排，--max-age-hours 才有意义
+            feeds = build_fixtures(args.entries, args.sources, seed=args.seed, now=datetime.now(timezone.utc))
+        self.feeds = feeds
+
+        self.feed_server = MockFeedServer(feeds, hn_stories=args.hn_stories, latency=args.feed_latency,
+                                          error_rate=args.feed_error_rate, seed=args.seed)
+        self.llm_server = MockLLMServer(latency=args.llm_latency, error_rate=args.llm_error_rate,
+                                        batch_delay=args.batch_delay, seed=args.seed)
+        self.feishu_server = MockFeishuServer(latency=args.feishu_latency, error_rate=args.feishu_error_rate,
+                                              seed=args.seed)
+
+    # ------------------------------------------------------------------
+    # 环境准备
+    # ------------------------------------------------------------------
+
+    def _configure(self, data_dir: Path):
+        """把所有外部地址指向本地 Mock 服务，数据目录指向临时目录"""
+        Config.DATA_DIR = data_dir
+        Config.LOGS_DIR = data_dir / "logs"
+        Config.ANTHROPIC_API_KEY = "bench"
+        Config.ANTHROPIC_BASE_URL = self.llm_server.base_url
+        Config.FEISHU_WEBHOOK = self.feishu_server.webhook_url()
+        Config.FEISHU_WEBHOOKS = ",".join(
+            self.feishu_server.webhook_url(f"group{i}") for i in range(1, self.args.webhooks)
+        )
+        Config.FEISHU_BACKOFF_BASE = 0.05
+        Config.FEED_MAX_AGE_HOURS = self.args.max_age_hours
+        Config.LLM_CACHE_ENABLED = self.args.llm_cache
+        Config.AI_RPM = self.args.ai_rpm
+        Config.AI_BACKOFF_BASE = 0.05
+        Config.AI_BATCH_API_POLL = 0.2
+        Config.AI_MODE = self.args.ai_mode
+        Config.validate()
+
+    def _sources(self) -> Dict[NewsCategory, List[dict]]:
+        """把 feed 轮流分配到各分类"""
+        categories = list(NewsCategory)
+        sources: Dict[NewsCategory, List[dict]] = {category: [] for category in categories}
+        for i, name in enumerate(self.feeds):
+            sources[categories[i % len(categories)]].append({"name": name, "url": self.feed_server.feed_url(name)})
+        return sources
+
+    def _build(self):
+        """创建各组件（与 run.py 相同的组合方式）"""
+        from src.fetcher.hn_fetcher import HackerNewsFetcher
+        from src.fetcher.rss_fetcher import RSSFetcher
+        from src.processor.ai_processor import AIProcessor
+        from src.processor.deduplication import DeduplicationProcessor
+        from src.processor.normalizer import ContentNormalizer
+        from src.processor.pre_ranker import PreRanker
+        from src.sender.feishu_card import FeishuCardSender
+        from src.storage.http_cache import HTTPCache
+
+        http_cache = HTTPCache() if self.args.http_cache else None
+        rss_fetcher = RSSFetcher(cache=http_cache)
+        rss_fetcher.SOURCES = self._sources()
+        hn_fetcher = HackerNewsFetcher(cache=http_cache, base_url=f"{self.feed_server.base_url}/v0")
+
+        return {
+            "rss": rss_fetcher,
+            "hn": hn_fetcher,
+            "normalizer": ContentNormalizer(),
+            "dedup": DeduplicationProcessor(Config.DEDUP_THRESHOLD),
+            "pre_ranker": PreRanker(multiplier=self.args.pre_rank_multiplier),
+            "ai": AIProcessor(),
+            "sender": FeishuCardSender(),
+        }
+
+    # ------------------------------------------------------------------
+    # 测量
+    # ------------------------------------------------------------------
+
+    def _request_counts(self) -> Counter:
+        return Counter({
+            "feed": self.feed_server.counts["requests"],
+            "llm": self.llm_server.counts["messages"] + self.llm_server.counts["batch_requests"],
+            "feishu": self.feishu_server.counts["requests"],
+        })
+
+    def measure(self, name: str, func: Callable[[], object], items_in: int,
+                count_out: Optional[Callable[[object], int]] = None):
+        """运行一个阶段并记录耗时、内存峰值和请求数"""
+        before = self._request_counts()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+
+        requests = self._request_counts()
+        requests.subtract(before)
+        items_out = count_out(result) if count_out else items_in
+        peak_mb = (peak - base) / 1024 / 1024 if tracing else None
+        self.results.append(StageResult(name, seconds, peak_mb, items_in, items_out,
+                                        {key: value for key, value in requests.items() if value}))
+        return result
+
+    def run(self) -> List[StageResult]:
+        """启动 Mock 服务，按阶段运行一轮"""
+        for server in (self.feed_server, self.llm_server, self.feishu_server):
+            server.start()
+        metrics.reset()
+
+        # tracemalloc 会明显拖慢纯 Python 代码，只关心耗时时可以用 --no-memory 关闭
+        if self.args.memory:
+            tracemalloc.start()
+        try:
+            with tempfile.TemporaryDirectory(prefix="news-bench-") as data_dir:
+                self._configure(Path(data_dir))
+                if self.args.pipeline:
+                    self._run_pipeline()
+                else:
+                    self._run_stages()
+        finally:
+            tracemalloc.stop()
+            for server in (self.feed_server, self.llm_server, self.feishu_server):
+                server.stop()
+        return self.results
+
+    def _run_stages(self):
+        """逐个阶段运行，分别测量"""
+        # 各异步阶段共用一个事件循环，AI 客户端只创建一次（与流水线一致）
+        loop = asyncio.new_event_loop()
+        components = self._build()
+        try:
+            self._stages(components, loop)
+        finally:
+            for name in ("rss", "hn", "ai"):
+                loop.run_until_complete(components[name].aclose())
+            loop.close()
+
+    def _stages(self, components: dict, loop: asyncio.AbstractEventLoop):
+        categories = list(NewsCategory)
+        top_k = Config.NEWS_PER_CATEGORY
+        ai = components["ai"]
+
+        def total(categorized: dict) -> int:
+            return sum(len(articles) for articles in categorized.values())
+
+        def per_category(coro_factory):
+            async def run():
+                results = await asyncio.gather(*[coro_factory(articles) for articles in categorized.values()])
+                return dict(zip(categorized, results))
+            return loop.run_until_complete(run())
+
+        async def fetch():
+            results = await components["rss"].fetch_all_async(categories, limit=self.args.limit)
+            hn = await components["hn"].fetch_async(NewsCategory.AI, limit=Config.HN_TARGET_STORIES)
+            results[NewsCategory.AI].extend(hn)
+            return results
+
+        categorized = self.measure("fetch", lambda: loop.run_until_complete(fetch()), len(self.feeds), total)
+        count = total(categorized)
+
+        self.measure("normalize", lambda: [components["normalizer"].process(a) for a in categorized.values()], count)
+
+        categorized = self.measure("dedup", lambda: components["dedup"].process_all(categorized), count, total)
+        count = total(categorized)
+
+        categorized = self.measure("pre_rank", lambda: {
+            category: components["pre_ranker"].rank(articles, top_k=top_k, category=category)
+            for category, articles in categorized.items()
+        }, count, total)
+        count = total(categorized)
+
+        if self.args.ai_mode == "batch":
+            categorized = self.measure("ai_batch", lambda: loop.run_until_complete(
+                ai.process_categories_batch_async(categorized, top_k=top_k)
+            ), count, total)
+        else:
+            categorized = self.measure("filter", lambda: per_category(
+                lambda articles: ai.filter_articles_async(articles, top_k=top_k)
+            ), count, total)
+            count = total(categorized)
+            categorized = self.measure("summarize", lambda: per_category(ai.summarize_articles_async), count, total)
+
+        processed = [
+            ProcessedArticle(article=article, rank=i, category=category)
+            for category in categories
+            for i, article in enumerate(categorized.get(category, []), 1)
+        ]
+        self.measure("send", lambda: components["sender"].send_daily_news(processed), len(processed),
+                     lambda ok: len(processed) if ok else 0)
+
+    def _run_pipeline(self):
+        """运行完整流水线，测量端到端耗时"""
+        from src.pipeline import NewsPipeline
+
+        components = self._build()
+        pipeline = NewsPipeline(
+            rss_fetcher=components["rss"],
+            hn_fetcher=components["hn"],
+            dedup_processor=components["dedup"],
+            ai_processor=components["ai"],
+            pre_ranker=components["pre_ranker"],
+            normalizer=components["normalizer"],
+        )
+        # 流水线按 iter_fetch_async 的默认 limit 获取每个源，--limit 不生效
+        processed = self.measure("pipeline", pipeline.run, len(self.feeds), len)
+        self.measure("send", lambda: components["sender"].send_daily_news(processed), len(processed),
+                     lambda ok: len(processed) if ok else 0)
+
+
+def print_report(results: List[StageResult]):
+    """打印结果表格"""
+    print()
+    print(f"{'阶段':<12}{'耗时(s)':>10}{'峰值(MB)':>10}{'输入':>8}{'输出':>8}{'吞吐(条/s)':>14}  请求")
+    print("-" * 80)
+    for result in results:
+        requests = ", ".join(f"{key}={value}" for key, value in result.requests.items()) or "-"
+        peak = f"{result.peak_mb:.2f}" if result.peak_mb is not None else "-"
+        print(f"{result.name:<12}{result.seconds:>10.3f}{peak:>10}{result.items_in:>8}"
+              f"{result.items_out:>8}{result.throughput:>14.1f}  {requests}")
+    print("-" * 80)
+    print(f"{'合计':<12}{sum(r.seconds for r in results):>10.3f}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="离线端到端基准测试")
+    parser.add_argument("--entries", type=int, default=2000, help="合成 feed 的条目总数")
+    parser.add_argument("--sources", type=int, default=12, help="合成 feed 的数量")
+    parser.add_argument("--fixtures-dir", help="回放目录下录制好的 *.xml feed，代替合成数据")
+    parser.add_argument("--limit", type=int, default=100000, help="每个源最多获取的条目数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-age-hours", type=float, default=0,
+                        help="只解析这么多小时内发布的条目（FEED_MAX_AGE_HOURS，0 表示不限）")
+    parser.add_argument("--hn-stories", type=int, default=500, help="Mock Hacker News 的热门故事数")
+
+    parser.add_argument("--feed-latency", type=float, default=0.0, help="feed/HN 请求延迟（秒）")
+    parser.add_argument("--feed-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="LLM 请求延迟（秒）")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="LLM 返回 429/529 的概率")
+    parser.add_argument("--batch-delay", type=float, default=1.0, help="message batch 完成所需时间（秒）")
+    parser.add_argument("--feishu-latency", type=float, default=0.0)
+    parser.add_argument("--feishu-error-rate", type=float, default=0.0, help="飞书返回限流错误的概率")
+    parser.add_argument("--webhooks", type=int, default=1, help="推送的飞书 Webhook 数量")
+
+    parser.add_argument("--ai-mode", choices=["async", "batch"], default="async")
+    parser.add_argument("--ai-rpm", type=int, default=0, help="LLM 限流（每分钟请求数，0 表示不限）")
+    parser.add_argument("--pre-rank-multiplier", type=int, default=None,
+                        help="预排序倍数（0 表示全部送入 LLM），默认使用 PRE_RANK_MULTIPLIER")
+    parser.add_argument("--llm-cache", action="store_true", help="启用 LLM 结果缓存")
+    parser.add_argument("--http-cache", action="store_true", help="启用 HTTP 条件请求缓存")
+    parser.add_argument("--pipeline", action="store_true", help="运行完整流水线而不是逐阶段测量")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="不统计内存峰值（耗时更准确）")
+    parser.add_argument("--json", help="把结果写入 JSON 文件")
+    parser.add_argument("--metrics-dir", help="把运行指标（metrics.jsonl / metrics.prom）导出到该目录")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    benchmark = Benchmark(args)
+    entries = args.entries if not args.fixtures_dir else "录制数据"
+    print(f"基准测试: {len(benchmark.feeds)} 个源, {entries} 条目, AI 模式 {args.ai_mode}")
+
+    results = benchmark.run()
+    print_report(results)
+
+    if args.json:
+        report = {
+            "args": vars(args),
+            "stages": [result.to_dict() for result in results],
+            "servers": {
+                "feed": dict(benchmark.feed_server.counts),
+                "llm": dict(benchmark.llm_server.counts),
+                "feishu": dict(benchmark.feishu_server.counts),
+            },
+        }
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"✓ 结果已写入 {args.json}")
+
+    if args.metrics_dir:
+        jsonl_path, prom_path = metrics.export(Path(args.metrics_dir))
+        print(f"✓ 运行指标已写入 {jsonl_path} 和 {prom_path}")
+
+
+if __name__ == "__main__":
+    main()
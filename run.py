@@ -1,109 +1,63 @@
 """每日新闻推送系统 - 主程序"""
+import argparse
+import asyncio
 import sys
 from pathlib import Path
+from typing import Optional
 
 # 添加项目路径
 sys.path.insert(0, str(Path(__file__).parent))
 
+from src.app import NewsApp
 from src.config import Config
-from src.fetcher.rss_fetcher import RSSFetcher
-from src.fetcher.hn_fetcher import HackerNewsFetcher
-from src.processor.deduplication import DeduplicationProcessor
-from src.processor.ai_processor import AIProcessor
-from src.sender.feishu_card import FeishuCardSender
-from src.models.article import NewsCategory
+from src.scheduler import Daemon, DailySchedule
+from src.storage.checkpoints import STAGES
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="每日新闻推送系统")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--daemon", action="store_true",
+                      help="常驻运行，每天在 SCHEDULE_TIME 和 SCHEDULE_EXTRA_TIMES 的时间点推送")
+    mode.add_argument("--resume", nargs="?", const="", metavar="RUN_ID",
+                      help="继续一轮未完成的运行（默认最近一轮），已完成的阶段和已送达的订阅者不再重复")
+    mode.add_argument("--replay", metavar="RUN_ID",
+                      help="以某轮运行的检查点开始新的一轮，不重新获取数据")
+    parser.add_argument("--from-stage", choices=STAGES, default=STAGES[0],
+                        help="--replay 使用的检查点阶段（默认 fetched），之后的阶段重新执行")
+    return parser.parse_args()
+
+
+async def serve(schedule: Optional[DailySchedule], args: argparse.Namespace):
+    """单次运行、继续或重放一轮，或按调度表常驻运行，退出前关闭所有客户端"""
+    app = NewsApp()
+    try:
+        if schedule is not None:
+            await Daemon(app.run_once, schedule).serve()
+        elif args.resume is not None:
+            await app.resume(args.resume or None)
+        elif args.replay:
+            await app.replay(args.replay, args.from_stage)
+        else:
+            await app.run_once()
+    finally:
+        await app.aclose()
 
 
 def main():
     """主函数"""
-    print("=" * 50)
-    print("每日新闻推送系统启动")
-    print("=" * 50)
+    args = parse_args()
 
     try:
-        # 1. 验证配置
+        # 验证配置
         Config.validate()
+        schedule = DailySchedule.from_config() if args.daemon else None
         print("✓ 配置验证通过")
+    except ValueError as e:
+        print(f"× 配置错误: {e}")
+        return
 
-        # 2. 初始化模块
-        rss_fetcher = RSSFetcher()
-        hn_fetcher = HackerNewsFetcher()
-        dedup_processor = DeduplicationProcessor()
-        ai_processor = AIProcessor()
-        card_sender = FeishuCardSender()
-
-        # 3. 获取数据
-        print("\n📡 正在获取新闻数据...")
-
-        all_articles = {
-            NewsCategory.AI: [],
-            NewsCategory.FINANCE: [],
-            NewsCategory.TECH: []
-        }
-
-        # 获取 AI 新闻（RSS + HN）
-        print("  - 获取 AI 资讯...")
-        all_articles[NewsCategory.AI].extend(rss_fetcher.fetch(NewsCategory.AI))
-        all_articles[NewsCategory.AI].extend(hn_fetcher.fetch(NewsCategory.AI))
-
-        # 获取财经新闻
-        print("  - 获取财经资讯...")
-        all_articles[NewsCategory.FINANCE].extend(rss_fetcher.fetch(NewsCategory.FINANCE))
-
-        # 获取科技新闻
-        print("  - 获取科技资讯...")
-        all_articles[NewsCategory.TECH].extend(rss_fetcher.fetch(NewsCategory.TECH))
-
-        # 4. 去重
-        print(f"\n🔄 正在去重...")
-        for category in NewsCategory:
-            all_articles[category] = dedup_processor.process(all_articles[category])
-            print(f"  - {category.value}: {len(all_articles[category])} 篇")
-
-        # 5. AI 筛选和摘要
-        print(f"\n🤖 正在使用 AI 处理...")
-        processed_articles = []
-
-        for category in NewsCategory:
-            articles = all_articles[category]
-
-            if not articles:
-                continue
-
-            # 筛选前 10 篇
-            top_articles = ai_processor.filter_articles(articles, top_k=Config.NEWS_PER_CATEGORY)
-
-            # 生成摘要
-            top_articles = ai_processor.summarize_articles(top_articles)
-
-            # 添加到结果列表
-            for i, article in enumerate(top_articles, 1):
-                from src.models.article import ProcessedArticle
-                processed_articles.append(ProcessedArticle(
-                    article=article,
-                    rank=i,
-                    category=category
-                ))
-
-            print(f"  - {category.value}: 已筛选 {len(top_articles)} 篇")
-
-        # 6. 发送到飞书
-        print(f"\n📤 正在发送到飞书...")
-        success = card_sender.send_daily_news(processed_articles)
-
-        if success:
-            print("✓ 发送成功！")
-        else:
-            print("× 发送失败")
-
-        print("\n" + "=" * 50)
-        print("任务完成")
-        print("=" * 50)
-
-    except Exception as e:
-        print(f"\n× 运行出错: {e}")
-        import traceback
-        traceback.print_exc()
+    asyncio.run(serve(schedule, args))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+"""应用 - 组装各模块并执行一轮日报任务"""
+import asyncio
+import traceback
+from typing import Optional
+from src.config import Config
+from src.fetcher.rss_fetcher import RSSFetcher
+from src.fetcher.registry import SourceRegistry, load_sources
+from src.processor.deduplication import DeduplicationProcessor
+from src.processor.ai_processor import AIProcessor
+from src.processor.pre_ranker import PreRanker
+from src.models.subscription import load_subscriptions
+from src.sender.feishu_card import FeishuCardSender
+from src.models.article import NewsCategory
+from src.pipeline import NewsPipeline
+from src.storage.checkpoints import CheckpointStore, RunCheckpoint
+from src.storage.http_cache import HTTPCache
+from src.storage.seen_store import SeenStore
+from src.storage.source_state import SourceStateStore
+from src.utils.metrics import metrics
+
+
+class NewsApp:
+    """
+    日报任务
+
+    各模块只创建一次：单次运行时执行一轮后关闭；常驻模式下多轮运行共用同一个事件循环，
+    HTTP/LLM 客户端的连接池、飞书会话和各缓存在多轮之间保持可用。
+    每轮的各阶段结果保存为检查点，失败后可以继续（resume）或从某个阶段重放（replay）。
+    """
+
+    def __init__(self):
+        self.http_cache = HTTPCache()
+        self.seen_store = SeenStore()
+        self.source_state = SourceStateStore()
+        self.rss_fetcher = RSSFetcher(cache=self.http_cache)
+        self.registry = SourceRegistry(load_sources(), self.rss_fetcher, state=self.source_state)
+        self.dedup_processor = DeduplicationProcessor(similarity_threshold=Config.DEDUP_THRESHOLD)
+        self.ai_processor = AIProcessor()
+        self.card_sender = FeishuCardSender()
+        self.checkpoints = CheckpointStore()
+
+    async def resume(self, run_id: Optional[str] = None):
+        """继续一轮未完成的运行（默认最近一轮）：各分类从最后完成的阶段之后继续，只推送给尚未送达的订阅者"""
+        try:
+            run = self.checkpoints.open(run_id) if run_id else self.checkpoints.latest()
+        except ValueError as e:
+            print(f"× {e}")
+            return
+        if run is None:
+            print("× 没有可以继续的运行")
+            return
+        if run.finished:
+            print(f"✓ 运行 {run.run_id} 已全部推送完成，无需继续")
+            return
+        await self.run_once(run)
+
+    async def replay(self, run_id: str, stage: str = "fetched"):
+        """以某轮运行某个阶段的结果开始新的一轮，之前的阶段（包括获取）不再执行，也不按已处理索引过滤"""
+        try:
+            run = self.checkpoints.replay(run_id, stage)
+        except ValueError as e:
+            print(f"× {e}")
+            return
+        await self.run_once(run)
+
+    async def run_once(self, run: Optional[RunCheckpoint] = None):
+        """
+        执行一轮：获取 -> 去重 -> AI 筛选 -> 摘要 -> 推送，异常只打印不抛出
+
+        Args:
+            run: 要继续的运行，默认开始新的一轮（CHECKPOINT_ENABLED 为 false 时不保存检查点）
+        """
+        print("=" * 50)
+        print("每日新闻推送系统启动")
+        print("=" * 50)
+
+        metrics.reset()
+        self.ai_processor.usage.clear()
+
+        try:
+            # 订阅和数据源配置每轮重新读取，常驻模式下修改后无需重启
+            subscriptions = load_subscriptions()
+            self.registry.sources = load_sources()
+            print(f"✓ 已加载 {len(subscriptions)} 个订阅，{len(self.registry.sources)} 个数据源")
+
+            if run is None and Config.CHECKPOINT_ENABLED:
+                run = self.checkpoints.create(list(NewsCategory))
+            if run is not None:
+                print(f"✓ 运行 {run.run_id}（检查点）")
+                # 已送达的订阅者不再重复推送
+                subscriptions_to_send = [s for s in subscriptions if s.webhook.name not in run.delivered]
+            else:
+                subscriptions_to_send = subscriptions
+
+            # 重放的是已处理（可能已推送）过的文章，不按已处理索引过滤，推送后也不再记录
+            replaying = run is not None and run.replay_of is not None
+
+            # 流水线处理：获取 -> 去重 -> AI 筛选 -> 摘要，各分类就绪即进入下一阶段
+            print("\n🚀 正在运行处理流水线...")
+            pipeline = NewsPipeline(
+                rss_fetcher=self.rss_fetcher,
+                hn_fetcher=None,
+                dedup_processor=self.dedup_processor,
+                ai_processor=self.ai_processor,
+                seen_store=None if replaying else self.seen_store,
+                pre_ranker=PreRanker(reference_titles=self.seen_store.recent_pushed_titles()),
+                # 只处理一次，保留的篇数满足要求最多的订阅者
+                top_k=max([subscription.top_n for subscription in subscriptions] or [Config.NEWS_PER_CATEGORY]),
+                registry=self.registry,
+                checkpoint=run
+            )
+            with metrics.stage("pipeline"):
+                processed_articles = await pipeline.run_async(run.categories if run is not None else None)
+            self.http_cache.evict()
+            # 常驻模式下进程不重启，LLM 缓存的条目上限和有效期每轮执行一次
+            if self.ai_processor.cache is not None:
+                self.ai_processor.cache.evict()
+            print(f"  - Token 用量: {self.ai_processor.usage_report()}")
+
+            # 发送到飞书（同步请求放到线程中执行，等待期间事件循环仍能响应信号）
+            print(f"\n📤 正在发送到飞书...")
+            delivered_to = set()
+            with metrics.stage("send"):
+                delivered = await asyncio.get_running_loop().run_in_executor(
+                    None, self.card_sender.send_subscriptions, processed_articles, subscriptions_to_send,
+                    delivered_to
+                )
+            if run is not None:
+                run.mark_delivered(delivered_to)
+                if all(s.webhook.name in run.delivered for s in subscriptions):
+                    run.finish()
+                else:
+                    print(f"  - 有订阅者未送达，可用 --resume {run.run_id} 重新推送")
+
+            if delivered:
+                if not replaying:
+                    self.seen_store.mark_pushed(item.article for item in delivered)
+                print(f"✓ 发送成功！共送达 {len(delivered)} 篇")
+            else:
+                print("× 没有送达任何文章")
+
+            self.seen_store.compact()
+
+            print("\n" + "=" * 50)
+            print("任务完成")
+            print("=" * 50)
+
+        except Exception as e:
+            print(f"\n× 运行出错: {e}")
+            traceback.print_exc()
+            if run is not None:
+                print(f"  可用 --resume {run.run_id} 从已完成的阶段继续")
+
+        finally:
+            # 导出运行指标
+            try:
+                jsonl_path, prom_path = metrics.export()
+                print(f"📊 运行指标已写入 {jsonl_path} 和 {prom_path}")
+            except Exception as e:
+                print(f"× 导出运行指标失败: {e}")
+
+    async def aclose(self):
+        """关闭客户端、飞书会话和缓存"""
+        await self.registry.aclose()
+        await self.ai_processor.aclose()
+        self.rss_fetcher.client.close()
+        self.card_sender.bot.close()
+        if self.ai_processor.cache is not None:
+            self.ai_processor.cache.close()
+        self.http_cache.close()
+        self.seen_store.close()
+        self.source_state.close()
+        self.checkpoints.close()
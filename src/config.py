@@ -15,17 +15,108 @@ class Config:
 
     # 飞书配置
     FEISHU_WEBHOOK = os.getenv("FEISHU_WEBHOOK")
+    # 更多 Webhook：逗号或换行分隔，每项为 url 或 url|sign_key
+    FEISHU_WEBHOOKS = os.getenv("FEISHU_WEBHOOKS", "")
+
+    # 飞书推送：超时、重试、每个 Webhook 的限流（飞书限制 100 次/分钟、5 次/秒）和并发数
+    FEISHU_TIMEOUT = float(os.getenv("FEISHU_TIMEOUT", "10"))
+    FEISHU_MAX_RETRIES = int(os.getenv("FEISHU_MAX_RETRIES", "3"))
+    FEISHU_BACKOFF_BASE = float(os.getenv("FEISHU_BACKOFF_BASE", "1.0"))
+    FEISHU_RATE_PER_MINUTE = float(os.getenv("FEISHU_RATE_PER_MINUTE", "100"))
+    FEISHU_BURST = float(os.getenv("FEISHU_BURST", "5"))
+    FEISHU_SEND_WORKERS = int(os.getenv("FEISHU_SEND_WORKERS", "16"))
+
+    # 飞书卡片：单条消息的字节上限（自定义机器人请求体不超过 20 KB）/ 每张卡片的元素数上限 / 每篇摘要的字节上限
+    FEISHU_CARD_MAX_BYTES = int(os.getenv("FEISHU_CARD_MAX_BYTES", "20000"))
+    FEISHU_CARD_MAX_ELEMENTS = int(os.getenv("FEISHU_CARD_MAX_ELEMENTS", "50"))
+    FEISHU_SUMMARY_MAX_BYTES = int(os.getenv("FEISHU_SUMMARY_MAX_BYTES", "600"))
+
+    # 订阅配置文件（JSON，相对路径相对于项目根目录），不存在时所有 Webhook 订阅全部内容
+    SUBSCRIPTIONS_FILE = BASE_DIR / os.getenv("SUBSCRIPTIONS_FILE", "subscriptions.json")
 
     # Claude API 配置
     ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
     ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com")
     ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
 
+    # 送入模型的正文 token 预算：评分 / 摘要
+    AI_SCORE_CONTENT_TOKENS = int(os.getenv("AI_SCORE_CONTENT_TOKENS", "200"))
+    AI_SUMMARY_CONTENT_TOKENS = int(os.getenv("AI_SUMMARY_CONTENT_TOKENS", "400"))
+
+    # 批量评分配置：每次请求的输入 token 预算（0 表示逐篇评分）/ 每批最多条数
+    AI_BATCH_TOKENS = int(os.getenv("AI_BATCH_TOKENS", "4000"))
+    AI_BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", "20"))
+
+    # 异步并发配置：并发请求数 / 每分钟请求数 / 每分钟 token 数（0 表示不限）/ 重试次数 / 退避基数（秒）
+    # / 单次重试的最长等待（秒，包括服务端的 retry-after）
+    AI_CONCURRENCY = int(os.getenv("AI_CONCURRENCY", "8"))
+    AI_RPM = int(os.getenv("AI_RPM", "50"))
+    AI_TPM = int(os.getenv("AI_TPM", "0"))
+    AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "4"))
+    AI_BACKOFF_BASE = float(os.getenv("AI_BACKOFF_BASE", "1.0"))
+    AI_BACKOFF_MAX = float(os.getenv("AI_BACKOFF_MAX", "60"))
+
+    # LLM 结果缓存：是否启用 / 最多条目数 / 有效天数
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+    LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "14"))
+
+    # AI 执行模式：async（并发逐条调用）/ batch（Message Batches 离线批处理）
+    AI_MODE = os.getenv("AI_MODE", "async")
+    AI_BATCH_API_TIMEOUT = float(os.getenv("AI_BATCH_API_TIMEOUT", "1800"))
+    AI_BATCH_API_POLL = float(os.getenv("AI_BATCH_API_POLL", "15"))
+
     # 系统配置
     NEWS_PER_CATEGORY = int(os.getenv("NEWS_PER_CATEGORY", "10"))
     SCHEDULE_TIME = os.getenv("SCHEDULE_TIME", "10:00")
+    # 常驻模式（run.py --daemon）下额外的运行时间点，逗号分隔，如 "14:00,18:30"
+    SCHEDULE_EXTRA_TIMES = os.getenv("SCHEDULE_EXTRA_TIMES", "")
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+    # 数据获取配置
+    FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+    # feed 解析：只保留多少小时内发布的条目（0 表示不限）/ 每篇正文的最大字符数
+    FEED_MAX_AGE_HOURS = float(os.getenv("FEED_MAX_AGE_HOURS", "72"))
+    FEED_CONTENT_MAX_CHARS = int(os.getenv("FEED_CONTENT_MAX_CHARS", "8000"))
+
+    # 数据源配置文件（JSON，相对路径相对于项目根目录），不存在时使用内置的数据源
+    SOURCES_FILE = BASE_DIR / os.getenv("SOURCES_FILE", "sources.json")
+
+    # 主题分类：路由和 Hacker News 过滤所需的最低匹配分数 / 追加关键词的配置文件（JSON）
+    CLASSIFIER_THRESHOLD = float(os.getenv("CLASSIFIER_THRESHOLD", "1.0"))
+    CLASSIFIER_KEYWORDS_FILE = BASE_DIR / os.getenv("CLASSIFIER_KEYWORDS_FILE", "keywords.json")
+
+    # HTTP 响应缓存配置
+    HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "50"))
+    HTTP_CACHE_MAX_AGE_DAYS = float(os.getenv("HTTP_CACHE_MAX_AGE_DAYS", "7"))
+
+    # 去重相似度阈值（标题 n-gram 的 Jaccard 相似度）
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+
+    # 预排序：每个分类送入 LLM 的候选数 = 倍数 × NEWS_PER_CATEGORY（0 表示不做预排序）
+    PRE_RANK_MULTIPLIER = int(os.getenv("PRE_RANK_MULTIPLIER", "3"))
+
+    # 多样性选择：是否启用 / 归为同一故事的余弦相似度阈值 / MMR 中相似度惩罚的权重（0 表示只按评分）
+    DIVERSITY_ENABLED = os.getenv("DIVERSITY_ENABLED", "true").lower() == "true"
+    DIVERSITY_CLUSTER_THRESHOLD = float(os.getenv("DIVERSITY_CLUSTER_THRESHOLD", "0.36"))
+    DIVERSITY_WEIGHT = float(os.getenv("DIVERSITY_WEIGHT", "0.3"))
+
+    # 流水线阶段之间队列的容量
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+
+    # 运行检查点：是否保存各阶段结果（用于 --resume / --replay）/ 保留最近多少轮
+    CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+    CHECKPOINT_KEEP_RUNS = int(os.getenv("CHECKPOINT_KEEP_RUNS", "10"))
+
+    # 已处理文章索引保留天数
+    SEEN_RETENTION_DAYS = float(os.getenv("SEEN_RETENTION_DAYS", "30"))
+
+    # Hacker News 配置
+    HN_TARGET_STORIES = int(os.getenv("HN_TARGET_STORIES", "20"))
+    HN_WORKERS = int(os.getenv("HN_WORKERS", "16"))
+    HN_SCAN_DEPTH = int(os.getenv("HN_SCAN_DEPTH", "500"))
+    HN_TIME_BUDGET = float(os.getenv("HN_TIME_BUDGET", "20"))
+
     # 数据目录
     DATA_DIR = BASE_DIR / "data"
     LOGS_DIR = BASE_DIR / "logs"
@@ -33,7 +124,7 @@ class Config:
     @classmethod
     def validate(cls):
         """验证配置"""
-        if not cls.FEISHU_WEBHOOK:
+        if not cls.FEISHU_WEBHOOK and not cls.FEISHU_WEBHOOKS.strip() and not cls.SUBSCRIPTIONS_FILE.exists():
             raise ValueError("缺少飞书 Webhook 配置")
         if not cls.ANTHROPIC_API_KEY:
             raise ValueError("缺少 Claude API Key 配置")
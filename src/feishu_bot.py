@@ -1,57 +1,140 @@
 #!/usr/bin/env python3
 """
 飞书机器人 Webhook 消息推送工具
-支持发送文本、富文本、消息卡片等多种格式
+支持发送文本、富文本、消息卡片等多种格式，可同时推送到多个 Webhook
 """
 
 import json
 import hashlib
 import hmac
 import base64
+import random
+import threading
 import time
-from typing import Optional
-from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.rate_limit import TokenBucket
+
+
+@dataclass
+class Webhook:
+    """一个飞书机器人 Webhook"""
+    url: str
+    sign_key: Optional[str] = None
+    name: Optional[str] = None
+
+    def __post_init__(self):
+        # 日志中不显示地址（Webhook 地址本身相当于密钥），默认名称取完整地址的哈希，不同地址不会重名
+        if not self.name:
+            self.name = "hook-" + hashlib.sha256(self.url.strip().encode("utf-8")).hexdigest()[:8]
+
+
+def parse_webhooks(value: Optional[str]) -> List[Webhook]:
+    """
+    解析 Webhook 列表
+
+    Args:
+        value: 逗号或换行分隔的 "url" 或 "url|sign_key"
+
+    Returns:
+        Webhook 列表
+    """
+    webhooks = []
+    for item in (value or "").replace("\n", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        url, _, sign_key = item.partition("|")
+        webhooks.append(Webhook(url.strip(), sign_key.strip() or None))
+    return webhooks
 
 
 class FeishuBot:
-    """飞书自定义机器人客户端"""
+    """
+    飞书自定义机器人客户端
+
+    所有 Webhook 共用一个连接池（keep-alive），消息只序列化一次，并发推送到每个 Webhook。
+    每个 Webhook 有独立的令牌桶（飞书自定义机器人限制为 100 次/分钟、5 次/秒），
+    遇到限流（HTTP 429、错误码 9499/11232）、服务端错误或连接错误时指数退避重试。
+    """
 
-    def __init__(self, webhook_url: str, sign_key: Optional[str] = None):
+    # 飞书的限流错误码
+    THROTTLE_CODES = {9499, 11232}
+
+    def __init__(self, webhook_url: Optional[str] = None, sign_key: Optional[str] = None,
+                 webhooks: Optional[List[Webhook]] = None, timeout: float = 10,
+                 max_retries: int = 3, backoff_base: float = 1.0, rate_per_minute: float = 100,
+                 burst: float = 5, workers: int = 16, session: Optional[requests.Session] = None):
         """
         初始化飞书机器人
 
         Args:
             webhook_url: 飞书机器人 Webhook 地址
             sign_key: 签名密钥（如果启用了签名验证）
+            webhooks: 更多 Webhook，与 webhook_url 一起推送（send_payloads 也可以推送到其它 Webhook）
+            timeout: 单次请求超时（秒）
+            max_retries: 限流或临时错误时的最大重试次数
+            backoff_base: 指数退避的基础等待时间（秒）
+            rate_per_minute: 每个 Webhook 每分钟的请求数上限，<= 0 表示不限流
+            burst: 每个 Webhook 允许的突发请求数
+            workers: 并发推送的线程数
+            session: 复用的 requests.Session，默认新建
         """
-        self.webhook_url = webhook_url
-        self.sign_key = sign_key
+        candidates = ([Webhook(webhook_url, sign_key)] if webhook_url else []) + list(webhooks or [])
+        # 同一个地址只推送一次
+        self.webhooks: List[Webhook] = []
+        for webhook in candidates:
+            if all(webhook.url != existing.url for existing in self.webhooks):
+                self.webhooks.append(webhook)
+
+        self.webhook_url = self.webhooks[0].url if self.webhooks else None
+        self.sign_key = self.webhooks[0].sign_key if self.webhooks else None
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.workers = max(workers, 1)
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.limiters: Dict[str, TokenBucket] = {}
+        self._limiters_lock = threading.Lock()
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
 
-    def _generate_sign(self, timestamp: int) -> str:
-        """生成签名"""
-        if not self.sign_key:
+    def _generate_sign(self, timestamp: int, sign_key: Optional[str] = None) -> str:
+        """生成签名：以 "timestamp\n密钥" 为 HMAC-SHA256 的密钥对空串签名，Base64 编码"""
+        sign_key = sign_key or self.sign_key
+        if not sign_key:
             return ""
 
-        string_to_sign = f"{timestamp}\n{self.sign_key}"
-        hmac_code = hmac.new(
-            self.sign_key.encode("utf-8"),
-            string_to_sign.encode("utf-8"),
-            digestmod=hashlib.sha256
-        ).digest()
+        string_to_sign = f"{timestamp}\n{sign_key}"
+        hmac_code = hmac.new(string_to_sign.encode("utf-8"), b"", digestmod=hashlib.sha256).digest()
+        return base64.b64encode(hmac_code).decode("utf-8")
 
-        sign = base64.b64encode(hmac_code).decode("utf-8")
-        return quote(sign)
+    def _sign_body(self, webhook: Webhook, body: bytes) -> bytes:
+        """
+        为启用签名校验的 Webhook 在请求体中加入 timestamp 和 sign
 
-    def _build_url(self) -> str:
-        """构建带签名的请求 URL"""
-        if not self.sign_key:
-            return self.webhook_url
+        消息体只序列化一次、由所有 Webhook 共用，签名字段直接拼接到 JSON 对象的开头，不重新序列化。
+        """
+        if not webhook.sign_key:
+            return body
 
         timestamp = int(time.time())
-        sign = self._generate_sign(timestamp)
-        return f"{self.webhook_url}&timestamp={timestamp}&sign={sign}"
+        sign = self._generate_sign(timestamp, webhook.sign_key)
+        fields = json.dumps({"timestamp": str(timestamp), "sign": sign})
+        rest = body.lstrip()[1:]
+        separator = b"" if rest.lstrip().startswith(b"}") else b","
+        return fields[:-1].encode("utf-8") + separator + rest
 
     def send_text(self, content: str, at_all: bool = False, at_mobiles: list = None) -> dict:
         """
@@ -149,14 +232,135 @@ class FeishuBot:
         Returns:
             响应结果
         """
-        url = self._build_url()
-        headers = {"Content-Type": "application/json"}
-
-        try:
-            response = requests.post(url, headers=headers, data=json.dumps(data))
-            result = response.json()
-            if result.get("code") != 0:
-                return {"success": False, "error": result.get("msg", "Unknown error")}
-            return {"success": True, "data": result}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return self.send_payload(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    def send_payload(self, body: Union[str, bytes]) -> dict:
+        """
+        把已序列化的消息推送到所有 Webhook
+
+        Args:
+            body: JSON 消息体
+
+        Returns:
+            {"success": 是否全部成功, "delivered": 成功数, "failed": 失败数,
+             "error": 第一个错误, "results": {Webhook 名称: 单个 Webhook 的结果}}
+        """
+        return self.send_payloads([(webhook, [body]) for webhook in self.webhooks])
+
+    def send_payloads(self, plan: List[Tuple[Webhook, List[Union[str, bytes]]]]) -> dict:
+        """
+        按计划推送：每个 Webhook 依次推送自己的若干条消息，不同 Webhook 之间并发
+
+        同一条消息体可以出现在多个 Webhook 的计划中，只需序列化一次。
+
+        Args:
+            plan: [(Webhook, 消息体列表)]
+
+        Returns:
+            与 send_payload 相同；单个 Webhook 的所有消息都成功才算成功
+
+        Raises:
+            ValueError: 计划中有重名的 Webhook（结果按名称汇总，重名会合并不同 Webhook 的结果）
+        """
+        names = [webhook.name for webhook, _ in plan]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Webhook 名称重复: {', '.join(duplicates)}")
+
+        plan = [
+            (webhook, [body.encode("utf-8") if isinstance(body, str) else body for body in bodies])
+            for webhook, bodies in plan
+        ]
+
+        if len(plan) <= 1:
+            results = {webhook.name: self._deliver_all(webhook, bodies) for webhook, bodies in plan}
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(plan))) as executor:
+                futures = {
+                    webhook.name: executor.submit(self._deliver_all, webhook, bodies)
+                    for webhook, bodies in plan
+                }
+                results = {name: future.result() for name, future in futures.items()}
+
+        failed = [result for result in results.values() if not result["success"]]
+        return {
+            "success": not failed,
+            "delivered": len(results) - len(failed),
+            "failed": len(failed),
+            "error": failed[0]["error"] if failed else None,
+            "results": results,
+        }
+
+    def _deliver_all(self, webhook: Webhook, bodies: List[bytes]) -> dict:
+        """按顺序推送多条消息到同一个 Webhook，合并结果（某条失败后不再推送后续消息）"""
+        merged = {"success": True, "attempts": 0, "seconds": 0.0}
+        for body in bodies:
+            result = self._deliver(webhook, body)
+            merged["attempts"] += result["attempts"]
+            merged["seconds"] += result["seconds"]
+            if not result["success"]:
+                merged["success"] = False
+                merged["error"] = result["error"]
+                break
+            merged["data"] = result["data"]
+        return merged
+
+    def _limiter(self, webhook: Webhook) -> TokenBucket:
+        """每个 Webhook 地址一个令牌桶"""
+        with self._limiters_lock:
+            if webhook.url not in self.limiters:
+                self.limiters[webhook.url] = TokenBucket(self.rate_per_minute, self.burst)
+            return self.limiters[webhook.url]
+
+    def _deliver(self, webhook: Webhook, body: bytes) -> dict:
+        """
+        推送到单个 Webhook，限流或临时错误时重试
+
+        Returns:
+            {"success", "data" 或 "error", "attempts", "seconds"}
+        """
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        limiter = self._limiter(webhook)
+        start = time.perf_counter()
+        result = {"success": False, "error": "未发送"}
+
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            retryable = False
+            try:
+                # 每次尝试重新签名，重试时时间戳不会过期
+                response = self.session.post(webhook.url, data=self._sign_body(webhook, body),
+                                             headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                result = {"success": False, "error": str(e)}
+                retryable = True
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            else:
+                # 限流和服务端错误先按状态码判断，网关返回的错误页不是 JSON
+                retryable = response.status_code == 429 or response.status_code >= 500
+                try:
+                    data = response.json() if response.content else {}
+                except ValueError:
+                    data = {}
+                if not isinstance(data, dict):
+                    data = {}
+                code = data.get("code", data.get("StatusCode"))
+                if response.status_code == 200 and code == 0:
+                    result = {"success": True, "data": data}
+                    break
+
+                result = {"success": False, "error": data.get("msg") or f"HTTP {response.status_code}"}
+                retryable = retryable or code in self.THROTTLE_CODES
+
+            if not retryable or attempt >= self.max_retries:
+                break
+            time.sleep(self.backoff_base * (2 ** attempt) * random.uniform(0.8, 1.2))
+
+        result["attempts"] = attempt + 1
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
@@ -0,0 +1,182 @@
+"""流式 feed 解析 - 用 XMLPullParser 增量解析 RSS 2.0 / RSS 1.0 / Atom，达到条数或遇到过期条目即停止"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterator, List, Optional
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+import feedparser
+
+# 每次送入解析器的字节数
+CHUNK_SIZE = 64 * 1024
+
+# 连续遇到这么多条过期条目后停止解析（个别置顶的旧条目不会让解析提前结束）
+STALE_STREAK = 3
+
+_ENTRY_TAGS = {"item", "entry"}
+
+
+@dataclass
+class FeedEntry:
+    """feed 中的一个条目"""
+    title: str
+    link: str
+    content: str
+    published_at: Optional[datetime] = None  # UTC，不带时区
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(element: Element) -> str:
+    """元素的全部文本（Atom 的 xhtml 内容是子元素，需要拼接）"""
+    return "".join(element.itertext()).strip()
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """解析 RFC 822（RSS）或 ISO 8601（Atom / Dublin Core）时间，统一为不带时区的 UTC"""
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed is None:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _entry(element: Element, max_content: Optional[int]) -> FeedEntry:
+    """从 item / entry 元素提取字段"""
+    fields = {}
+    link = ""
+    for child in element:
+        name = _local(child.tag)
+        if name == "link":
+            # Atom 的链接在 href 属性中，取 alternate（或未标注 rel 的）链接
+            href = child.get("href")
+            if href is None:
+                link = link or _text(child)
+            elif child.get("rel", "alternate") == "alternate" and not link:
+                link = href
+        elif name == "guid" and child.get("isPermaLink", "true") == "true":
+            fields.setdefault("guid", _text(child))
+        elif name == "encoded":
+            fields.setdefault("content", _text(child))
+        elif name in ("title", "description", "summary", "content", "pubDate", "published", "updated", "date"):
+            fields.setdefault(name, _text(child))
+
+    content = fields.get("description") or fields.get("summary") or fields.get("content") or ""
+    if max_content is not None and len(content) > max_content:
+        content = content[:max_content]
+
+    published = (fields.get("pubDate") or fields.get("published") or fields.get("date")
+                 or fields.get("updated") or "")
+    return FeedEntry(
+        title=fields.get("title", ""),
+        link=link or (fields.get("guid", "") if fields.get("guid", "").startswith("http") else ""),
+        content=content,
+        published_at=_parse_date(published),
+    )
+
+
+def iter_entries(data: bytes, limit: Optional[int] = None, since: Optional[datetime] = None,
+                 max_content: Optional[int] = None) -> Iterator[FeedEntry]:
+    """
+    增量解析 feed，逐个产出条目
+
+    文档按块送入解析器，每个条目解析完后立即产出并释放其元素，
+    已产出 limit 个条目，或连续遇到 STALE_STREAK 个早于 since 的条目时停止，后面的内容不再解析。
+
+    Args:
+        data: feed 原文
+        limit: 最多产出的条目数
+        since: 新鲜度截止时间（不带时区的 UTC），更早的条目被跳过
+        max_content: 每个条目正文的最大字符数
+
+    Raises:
+        xml.etree.ElementTree.ParseError: 不是格式良好的 XML（如含有未定义的 HTML 实体）
+        ValueError: 文档使用 expat 不支持的编码
+    """
+    parser = XMLPullParser(events=("end",))
+    produced = stale = 0
+
+    for start in range(0, len(data), CHUNK_SIZE):
+        parser.feed(data[start:start + CHUNK_SIZE])
+        for _, element in parser.read_events():
+            if _local(element.tag) not in _ENTRY_TAGS:
+                continue
+            entry = _entry(element, max_content)
+            element.clear()
+
+            if since is not None and entry.published_at is not None and entry.published_at < since:
+                stale += 1
+                if stale >= STALE_STREAK:
+                    return
+                continue
+            stale = 0
+
+            if not entry.title or not entry.link:
+                continue
+            yield entry
+            produced += 1
+            if limit is not None and produced >= limit:
+                return
+
+    parser.close()
+
+
+def _iter_feedparser(data: bytes, limit: Optional[int], since: Optional[datetime],
+                     max_content: Optional[int]) -> Iterator[FeedEntry]:
+    """feedparser 解析（容错，但需要构建整个文档）"""
+    produced = 0
+    for item in feedparser.parse(data).entries:
+        published_at = None
+        if getattr(item, "published_parsed", None):
+            published_at = datetime(*item.published_parsed[:6])
+        if since is not None and published_at is not None and published_at < since:
+            continue
+        if not getattr(item, "title", None) or not getattr(item, "link", None):
+            continue
+
+        content = getattr(item, "description", None) or getattr(item, "summary", None) or ""
+        if max_content is not None:
+            content = content[:max_content]
+        yield FeedEntry(title=item.title, link=item.link, content=content, published_at=published_at)
+        produced += 1
+        if limit is not None and produced >= limit:
+            return
+
+
+def parse_feed(data: bytes, limit: Optional[int] = None, since: Optional[datetime] = None,
+               max_content: Optional[int] = None) -> List[FeedEntry]:
+    """
+    解析 feed：优先流式解析，XML 格式错误时退回 feedparser
+
+    Args:
+        data: feed 原文
+        limit: 最多返回的条目数
+        since: 新鲜度截止时间（不带时区的 UTC）
+        max_content: 每个条目正文的最大字符数
+
+    Returns:
+        FeedEntry 列表，按 feed 中的顺序
+    """
+    try:
+        return list(iter_entries(data, limit, since, max_content))
+    except (ParseError, ValueError):
+        # ValueError：expat 不支持的多字节编码（如 GB2312）
+        return list(_iter_feedparser(data, limit, since, max_content))
+
+
+def freshness_cutoff(max_age_hours: float) -> Optional[datetime]:
+    """max_age_hours 小时之前的时间（不带时区的 UTC），0 表示不限"""
+    if max_age_hours <= 0:
+        return None
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=max_age_hours)
@@ -1,72 +1,191 @@
 """Hacker News API 数据获取器"""
+import asyncio
+import json
+import time
 import httpx
-from typing import List
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
 from src.models.article import Article, NewsCategory
 from src.fetcher.base import BaseFetcher
+from src.processor.classifier import TopicClassifier, default_classifier
+from src.config import Config
+from src.storage.http_cache import HTTPCache
+from src.utils.metrics import metrics
 
 
 class HackerNewsFetcher(BaseFetcher):
     """Hacker News API 数据获取器"""
 
-    def __init__(self, timeout: int = 10):
+    BASE_URL = "https://hacker-news.firebaseio.com/v0"
+    SOURCE_NAME = "Hacker News"
+
+    # 只对头条列表发送条件请求：故事详情每轮请求数百个且很少重复，写入缓存只会挤占 HTTP 缓存的容量
+    CACHED_PATHS = ("/topstories.json",)
+
+    def __init__(self, timeout: int = 10, workers: Optional[int] = None,
+                 scan_depth: Optional[int] = None, time_budget: Optional[float] = None,
+                 cache: Optional[HTTPCache] = None, classifier: Optional[TopicClassifier] = None,
+                 name: Optional[str] = None, base_url: Optional[str] = None):
+        """
+        Args:
+            timeout: 单个请求的超时时间（秒）
+            workers: 并发获取故事详情的协程数量
+            scan_depth: 最多扫描的头条 ID 数量（API 最多返回 500 条）
+            time_budget: 扫描的总时间预算（秒），超时后返回已找到的故事
+            cache: HTTP 响应缓存，提供时发送条件请求
+            classifier: 主题分类器，用于筛选 AI 相关的故事
+            name: 来源名称（文章的 source 和指标中的源名），默认 SOURCE_NAME
+            base_url: API 地址，默认 BASE_URL
+        """
+        self.name = name or self.SOURCE_NAME
+        self.base_url = base_url or self.BASE_URL
         self.timeout = timeout
-        self.client = httpx.Client(timeout=timeout, base_url="https://hacker-news.firebaseio.com/v0")
+        self.workers = workers or Config.HN_WORKERS
+        self.scan_depth = scan_depth or Config.HN_SCAN_DEPTH
+        self.time_budget = time_budget or Config.HN_TIME_BUDGET
+        self.cache = cache
+        self.classifier = classifier or default_classifier()
+        # 异步客户端绑定到事件循环，常驻进程中多轮运行复用同一个连接池
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._loop = None
 
     def fetch(self, category: NewsCategory, limit: int = 50) -> List[Article]:
-        """获取 Hacker News 头条"""
-        articles = []
+        """
+        获取 Hacker News 头条中的 AI 相关故事
+
+        Args:
+            category: 新闻分类
+            limit: 目标 AI 相关故事数量，达到后提前停止扫描
+
+        Returns:
+            按头条排名排序的文章列表
+        """
+        async def run():
+            try:
+                return await self.fetch_async(category, limit)
+            finally:
+                await self.aclose()
 
+        return asyncio.run(run())
+
+    async def fetch_async(self, category: NewsCategory, limit: int = 50) -> List[Article]:
+        """并发扫描头条，找到 limit 条 AI 相关故事或超出时间预算时停止"""
         try:
-            # 获取头条列表
-            response = self.client.get("/topstories.json")
-            story_ids = response.json()[:limit]
+            client = self._ensure_async_client()
+            story_ids = (await self._get_json(client, "/topstories.json"))[:self.scan_depth]
+            found = await self._scan_stories(client, story_ids, limit)
+        except Exception as e:
+            print(f"× 获取 {self.name} 失败: {e!r}")
+            return []
 
-            for story_id in story_ids:
+        # 保持头条排名顺序
+        articles = [found[rank] for rank in sorted(found)][:limit]
+        metrics.record_articles(self.name, len(articles))
+        return articles
+
+    def _ensure_async_client(self) -> httpx.AsyncClient:
+        """为当前事件循环创建（或复用）异步客户端"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout, base_url=self.base_url,
+                limits=httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers)
+            )
+            self._loop = loop
+        return self._async_client
+
+    async def aclose(self):
+        """关闭异步客户端"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+        self._async_client = None
+        self._loop = None
+
+    async def _scan_stories(self, client: httpx.AsyncClient, story_ids: List[int],
+                            limit: int) -> Dict[int, Article]:
+        """多个 worker 按排名顺序领取故事 ID，返回 排名 -> 文章 的映射"""
+        queue = asyncio.Queue()
+        for rank, story_id in enumerate(story_ids):
+            queue.put_nowait((rank, story_id))
+
+        found = {}
+        done = asyncio.Event()
+
+        async def worker():
+            while not done.is_set():
                 try:
-                    # 获取每条详情
-                    story_response = self.client.get(f"/item/{story_id}.json")
-                    story = story_response.json()
-
-                    # 过滤非 AI 相关的新闻
-                    if not self._is_ai_related(story.get("title", "")):
-                        continue
-
-                    # 解析时间
-                    published_at = None
-                    if story.get("time"):
-                        published_at = datetime.fromtimestamp(story["time"])
-
-                    article = Article(
-                        title=story.get("title", ""),
-                        url=story.get("url", f"https://news.ycombinator.com/item?id={story_id}"),
-                        content=story.get("text", ""),
-                        category=NewsCategory.AI,
-                        source="Hacker News",
-                        published_at=published_at
-                    )
-                    articles.append(article)
-
-                except Exception as e:
-                    print(f"× 获取故事 {story_id} 失败: {e}")
-                    continue
+                    rank, story_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                article = await self._fetch_story(client, story_id)
+                if article is not None:
+                    found[rank] = article
+                    if len(found) >= limit:
+                        done.set()
 
+        tasks = [asyncio.create_task(worker()) for _ in range(min(self.workers, len(story_ids)))]
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), timeout=self.time_budget)
+        except asyncio.TimeoutError:
+            print(f"× Hacker News 扫描超出时间预算 {self.time_budget}s，已找到 {len(found)} 条")
+
+        return found
+
+    async def _fetch_story(self, client: httpx.AsyncClient, story_id: int) -> Optional[Article]:
+        """获取单条故事详情，非 AI 相关或失败时返回 None"""
+        try:
+            story = await self._get_json(client, f"/item/{story_id}.json") or {}
         except Exception as e:
-            print(f"× 获取 Hacker News 失败: {e}")
+            print(f"× 获取故事 {story_id} 失败: {e!r}")
+            return None
 
-        return articles
+        return self._to_article(story_id, story)
+
+    async def _get_json(self, client: httpx.AsyncClient, path: str):
+        """GET 一个 JSON 接口，CACHED_PATHS 中的接口有缓存时发送条件请求，304 时复用缓存的响应体"""
+        url = f"{self.base_url}{path}"
+        cache = self.cache if path in self.CACHED_PATHS else None
+        headers = cache.conditional_headers(url) if cache is not None else {}
+        start = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+        except Exception:
+            metrics.record_fetch(self.name, time.perf_counter() - start, error=True)
+            raise
+        metrics.record_fetch(self.name, time.perf_counter() - start, len(response.content),
+                             response.status_code, error=response.status_code >= 400)
+
+        if response.status_code == 304 and cache is not None:
+            cached = cache.get(url)
+            if cached is not None:
+                cache.touch(url)
+                return json.loads(cached.body)
+
+        response.raise_for_status()
+        if cache is not None:
+            cache.store(url, response.headers, response.content)
+        return response.json()
+
+    def _to_article(self, story_id: int, story: dict) -> Optional[Article]:
+        """将故事详情转换为文章，过滤非 AI 相关的新闻"""
+        topics = self.classifier.classify(story.get("title", ""), story.get("text", ""))
+        if topics.get(NewsCategory.AI, 0.0) < Config.CLASSIFIER_THRESHOLD:
+            return None
+
+        # 解析时间（与 RSS 一致，统一为不带时区的 UTC）
+        published_at = None
+        if story.get("time"):
+            published_at = datetime.fromtimestamp(story["time"], timezone.utc).replace(tzinfo=None)
 
-    def _is_ai_related(self, title: str) -> bool:
-        """判断是否与 AI 相关"""
-        ai_keywords = [
-            "AI", "artificial intelligence", "machine learning",
-            "deep learning", "neural network", "GPT", "LLM",
-            "人工智能", "机器学习", "深度学习"
-        ]
-        title_lower = title.lower()
-        return any(keyword.lower() in title_lower for keyword in ai_keywords)
-
-    def __del__(self):
-        """清理资源"""
-        if hasattr(self, 'client'):
-            self.client.close()
+        return Article(
+            title=story.get("title", ""),
+            url=story.get("url", f"https://news.ycombinator.com/item?id={story_id}"),
+            content=story.get("text", ""),
+            category=NewsCategory.AI,
+            source=self.name,
+            published_at=published_at,
+            points=story.get("score"),
+            topics=topics
+        )
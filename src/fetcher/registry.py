@@ -0,0 +1,202 @@
+"""数据源注册表 - 按配置把每个源分派给对应的获取器，按刷新间隔决定是否重新获取"""
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from src.config import Config
+from src.fetcher.feed_parser import freshness_cutoff
+from src.fetcher.hn_fetcher import HackerNewsFetcher
+from src.fetcher.rss_fetcher import RSSFetcher
+from src.models.article import Article, NewsCategory
+from src.models.source import Source
+from src.processor.classifier import TopicClassifier, default_classifier
+from src.storage.source_state import SourceStateStore
+
+
+def default_sources(rss_sources: Optional[dict] = None) -> List[Source]:
+    """
+    内置的数据源：RSSFetcher.SOURCES 中的 RSS 源加上 Hacker News
+
+    Args:
+        rss_sources: 分类到 RSS 源配置列表的映射，默认 RSSFetcher.SOURCES
+    """
+    rss_sources = RSSFetcher.SOURCES if rss_sources is None else rss_sources
+    sources = [
+        Source(name=feed["name"], type="rss", category=category, url=feed["url"])
+        for category, feeds in rss_sources.items()
+        for feed in feeds
+    ]
+    sources.append(Source(
+        name=HackerNewsFetcher.SOURCE_NAME, type="hn", category=NewsCategory.AI,
+        limit=Config.HN_TARGET_STORIES
+    ))
+    return sources
+
+
+def load_sources(path: Optional[Path] = None) -> List[Source]:
+    """
+    读取数据源配置
+
+    配置文件是一个 JSON 数组，每项包含 name、category，可选 type（rss / hn，默认 rss）、
+    url、limit、timeout、concurrency、min_interval（分钟）和 route。文件不存在时使用内置的数据源。
+
+    Args:
+        path: 配置文件路径，默认 SOURCES_FILE
+
+    Returns:
+        数据源列表
+    """
+    path = Path(path or Config.SOURCES_FILE)
+    if not path.exists():
+        return default_sources()
+
+    sources = [Source.from_dict(item) for item in json.loads(path.read_text(encoding="utf-8"))]
+    names = [source.name for source in sources]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"数据源名称重复: {', '.join(duplicates)}")
+    return sources
+
+
+class SourceRegistry:
+    """
+    数据源注册表
+
+    每个源按 type 交给对应的获取器，使用自己的 limit / timeout / concurrency。
+    提供状态存储时记录每个源上次成功获取的时间和结果：未到 min_interval 的源不发请求，
+    直接复用上次的结果；获取失败或没有结果时也复用上次的结果（只复用 FEED_MAX_AGE_HOURS 之内的文章）。
+    产出的文章都带有主题分类分数，route 源的文章按分数分到得分最高的分类。
+    """
+
+    # 判断是否到期时的容差（秒），定时运行的时间抖动不会让源推迟一整个周期
+    DUE_SLACK = 300
+
+    def __init__(self, sources: List[Source], rss_fetcher: RSSFetcher,
+                 state: Optional[SourceStateStore] = None, classifier: Optional[TopicClassifier] = None):
+        """
+        Args:
+            sources: 数据源列表
+            rss_fetcher: RSS 获取器（所有 RSS 源共用，同时下载的源数量受其 concurrency 限制）
+            state: 源状态存储（为 None 时每轮获取所有源）
+            classifier: 主题分类器
+        """
+        self.sources = sources
+        self.rss_fetcher = rss_fetcher
+        self.state = state
+        self.classifier = classifier or default_classifier()
+        # 每个 hn 源一个获取器，常驻模式下多轮复用
+        self._hn_fetchers: Dict[Source, HackerNewsFetcher] = {}
+
+    @classmethod
+    def from_fetchers(cls, rss_fetcher: RSSFetcher,
+                      hn_fetcher: Optional[HackerNewsFetcher] = None) -> "SourceRegistry":
+        """由已有的获取器构建：rss_fetcher.SOURCES 中的源，加上 hn_fetcher（可选），不记录状态"""
+        sources = [source for source in default_sources(rss_fetcher.SOURCES) if source.type == "rss"]
+        registry = cls(sources, rss_fetcher)
+        if hn_fetcher is not None:
+            source = Source(
+                name=hn_fetcher.name, type="hn", category=NewsCategory.AI,
+                url=hn_fetcher.base_url, limit=Config.HN_TARGET_STORIES
+            )
+            registry.sources.append(source)
+            registry._hn_fetchers[source] = hn_fetcher
+        return registry
+
+    def sources_for(self, categories: Iterable[NewsCategory]) -> List[Source]:
+        """可能产出这些分类文章的数据源（route 源可以产出任何分类）"""
+        categories = set(categories)
+        return [source for source in self.sources if source.route or source.category in categories]
+
+    @staticmethod
+    def targets(source: Source, categories: Iterable[NewsCategory]) -> List[NewsCategory]:
+        """源的文章可能归入的分类（限于 categories 之内）"""
+        return [category for category in categories if source.route or category is source.category]
+
+    async def iter_fetch_async(self, categories: Optional[Iterable[NewsCategory]] = None
+                               ) -> AsyncIterator[Tuple[Source, List[Article]]]:
+        """
+        并发获取所有到期的源，按完成顺序逐个产出结果（未到期的源立即产出上次的结果）
+
+        Args:
+            categories: 要获取的分类，默认全部
+
+        Yields:
+            (数据源, 文章列表)
+        """
+        categories = list(categories) if categories is not None else list(NewsCategory)
+        tasks = [asyncio.ensure_future(self._fetch(source)) for source in self.sources_for(categories)]
+        for future in asyncio.as_completed(tasks):
+            yield await future
+
+    async def _fetch(self, source: Source) -> Tuple[Source, List[Article]]:
+        """获取一个源，任何异常都只影响这个源（产出空结果），不会中断其它源和下游阶段"""
+        try:
+            return await self._fetch_source(source)
+        except Exception as e:
+            print(f"× [获取] {source.name} 失败: {e}")
+            return source, []
+
+    async def _fetch_source(self, source: Source) -> Tuple[Source, List[Article]]:
+        stored = self.state.get(source.name, source.url) if self.state is not None else None
+        now = time.time()
+
+        if stored is not None and now - stored[0] + self.DUE_SLACK < source.min_interval * 60:
+            due_at = time.strftime("%m-%d %H:%M", time.localtime(stored[0] + source.min_interval * 60))
+            articles = self._restore(stored, source)
+            print(f"  - [复用] {source.name}: 未到刷新时间（{due_at}），复用 {len(articles)} 篇")
+            return source, self._classify(articles, source)
+
+        if source.type == "hn":
+            articles = await self._hn_fetcher(source).fetch_async(source.category, limit=source.limit)
+        else:
+            articles = await self.rss_fetcher.fetch_source_async(source.to_feed(), source.category)
+
+        if articles:
+            if self.state is not None:
+                try:
+                    self.state.store(source.name, source.url, [article.to_dict() for article in articles], now)
+                except Exception as e:
+                    print(f"× [获取] {source.name}: 保存源状态失败: {e}")
+        elif stored is not None:
+            articles = self._restore(stored, source)
+            print(f"  - [复用] {source.name}: 本次没有获取到内容，复用上次的 {len(articles)} 篇")
+
+        return source, self._classify(articles, source)
+
+    def _classify(self, articles: List[Article], source: Source) -> List[Article]:
+        """计算主题分类分数，route 源的文章改分到得分最高的分类（保存的状态中是源的默认分类）"""
+        self.classifier.annotate(articles, route=source.route)
+        return articles
+
+    @staticmethod
+    def _restore(stored: Tuple[float, List[dict]], source: Source) -> List[Article]:
+        """
+        上次保存的文章，只保留 FEED_MAX_AGE_HOURS 之内的（连续多天获取失败的源不会一直复用旧文章）
+
+        保存时间早于截止时间时全部丢弃：其中的文章都早于截止时间，没有发布时间的也是一样。
+        """
+        fetched_at, entries = stored
+        since = freshness_cutoff(Config.FEED_MAX_AGE_HOURS)
+        if since is not None and datetime.fromtimestamp(fetched_at, timezone.utc).replace(tzinfo=None) < since:
+            return []
+        articles = [Article.from_dict(entry) for entry in entries[:source.limit]]
+        return [
+            article for article in articles
+            if since is None or article.published_at is None or article.published_at >= since
+        ]
+
+    def _hn_fetcher(self, source: Source) -> HackerNewsFetcher:
+        fetcher = self._hn_fetchers.get(source)
+        if fetcher is None:
+            fetcher = HackerNewsFetcher(timeout=source.timeout, workers=source.concurrency,
+                                        cache=self.rss_fetcher.cache, name=source.name, base_url=source.url)
+            self._hn_fetchers[source] = fetcher
+        return fetcher
+
+    async def aclose(self):
+        """关闭各获取器的异步客户端"""
+        await self.rss_fetcher.aclose()
+        for fetcher in self._hn_fetchers.values():
+            await fetcher.aclose()
@@ -1,10 +1,14 @@
 """RSS 数据获取器"""
-import feedparser
+import asyncio
+import time
 import httpx
-from typing import List
-from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from src.models.article import Article, NewsCategory
 from src.fetcher.base import BaseFetcher
+from src.fetcher.feed_parser import freshness_cutoff, parse_feed
+from src.config import Config
+from src.storage.http_cache import HTTPCache
+from src.utils.metrics import metrics
 
 
 class RSSFetcher(BaseFetcher):
@@ -44,9 +48,27 @@ class RSSFetcher(BaseFetcher):
         ]
     }
 
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, concurrency: Optional[int] = None,
+                 cache: Optional[HTTPCache] = None, max_age_hours: Optional[float] = None,
+                 max_content: Optional[int] = None):
+        """
+        Args:
+            timeout: 单个源的超时时间（秒）
+            concurrency: 异步模式下同时下载的源数量上限
+            cache: HTTP 响应缓存，提供时发送条件请求
+            max_age_hours: 只保留这么多小时内发布的条目（0 表示不限）
+            max_content: 每篇文章正文的最大字符数
+        """
         self.timeout = timeout
-        self.client = httpx.Client(timeout=timeout)
+        self.concurrency = concurrency or Config.FETCH_CONCURRENCY
+        self.max_age_hours = Config.FEED_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+        self.max_content = max_content or Config.FEED_CONTENT_MAX_CHARS
+        self.cache = cache
+        self.client = httpx.Client(timeout=timeout, follow_redirects=True)
+        # 异步客户端和并发信号量绑定到事件循环，常驻进程中多轮运行复用同一个连接池
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
 
     def fetch(self, category: NewsCategory, limit: int = 50) -> List[Article]:
         """获取 RSS 新闻"""
@@ -54,37 +76,194 @@ class RSSFetcher(BaseFetcher):
         sources = self.SOURCES.get(category, [])
 
         for source in sources:
+            start = time.perf_counter()
+            response, fetched, latency = None, None, None
             try:
-                feed = feedparser.parse(source["url"])
-                for entry in feed.entries[:limit]:
-                    # 解析发布时间
-                    published_at = None
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        published_at = datetime(*entry.published_parsed[:6])
-
-                    # 获取内容
-                    content = ""
-                    if hasattr(entry, 'description'):
-                        content = entry.description
-                    elif hasattr(entry, 'summary'):
-                        content = entry.summary
-
-                    article = Article(
-                        title=entry.title,
-                        url=entry.link,
-                        content=content,
-                        category=category,
-                        source=source["name"],
-                        published_at=published_at
-                    )
-                    articles.append(article)
-
+                response = self.client.get(source["url"], headers=self._request_headers(source))
+                latency = time.perf_counter() - start
+                fetched = self._handle_response(response, source, category, limit)
+                articles.extend(fetched)
             except Exception as e:
                 print(f"× 获取 {source['name']} 失败: {e}")
-                continue
+            self._record_metrics(source, latency or time.perf_counter() - start, response, fetched)
+
+        return articles
+
+    async def fetch_all_async(self, categories: Optional[Iterable[NewsCategory]] = None,
+                              limit: int = 50) -> Dict[NewsCategory, List[Article]]:
+        """
+        使用 httpx.AsyncClient 并发下载所有源，总耗时约等于最慢的单个源
+
+        Args:
+            categories: 要获取的分类，默认全部
+            limit: 每个源的最大获取数量
+
+        Returns:
+            分类到文章列表的映射
+        """
+        categories = list(categories) if categories is not None else list(NewsCategory)
+        results = {category: [] for category in categories}
+        order = {
+            id(source): i
+            for i, source in enumerate(
+                source for category in categories for source in self.SOURCES.get(category, [])
+            )
+        }
+        completed = []
+
+        async for category, source, articles in self.iter_fetch_async(categories, limit):
+            completed.append((order[id(source)], category, articles))
+
+        # 按源的配置顺序合并，保证输出稳定
+        for _, category, articles in sorted(completed, key=lambda item: item[0]):
+            results[category].extend(articles)
+
+        return results
+
+    async def iter_fetch_async(self, categories: Optional[Iterable[NewsCategory]] = None,
+                               limit: int = 50) -> AsyncIterator[Tuple[NewsCategory, dict, List[Article]]]:
+        """
+        并发下载所有源，按完成顺序逐个产出结果
+
+        Args:
+            categories: 要获取的分类，默认全部
+            limit: 每个源的最大获取数量
+
+        Yields:
+            (分类, 源配置, 文章列表)，失败的源产出空列表
+        """
+        categories = list(categories) if categories is not None else list(NewsCategory)
+
+        async def run(category: NewsCategory, source: dict):
+            articles = await self.fetch_source_async(source, category, limit)
+            return category, source, articles
+
+        tasks = [
+            asyncio.ensure_future(run(category, source))
+            for category in categories
+            for source in self.SOURCES.get(category, [])
+        ]
+        for future in asyncio.as_completed(tasks):
+            yield await future
+
+    def _ensure_async_client(self) -> httpx.AsyncClient:
+        """为当前事件循环创建（或复用）异步客户端和并发信号量"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._async_client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._async_client
+
+    async def aclose(self):
+        """关闭异步客户端"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+        self._async_client = None
+        self._semaphore = None
+        self._loop = None
+
+    async def fetch_source_async(self, source: dict, category: NewsCategory, limit: int = 50) -> List[Article]:
+        """
+        下载并解析单个源（与其它源共享 concurrency 限制），失败时返回空列表
+
+        Args:
+            source: 源配置，可选的 limit / timeout 覆盖参数和实例的默认值
+            category: 新闻分类
+            limit: 最大获取数量
+        """
+        client = self._ensure_async_client()
+        limit = source.get("limit") or limit
+        timeout = source.get("timeout") or self.timeout
+        async with self._semaphore:
+            start = time.perf_counter()
+            response, articles, latency = None, None, None
+            try:
+                response = await asyncio.wait_for(
+                    client.get(source["url"], headers=self._request_headers(source), timeout=timeout),
+                    timeout=timeout
+                )
+                latency = time.perf_counter() - start
+                articles = self._handle_response(response, source, category, limit)
+            except Exception as e:
+                print(f"× 获取 {source['name']} 失败: {e!r}")
+            self._record_metrics(source, latency or time.perf_counter() - start, response, articles)
+            return articles or []
 
+    @staticmethod
+    def _record_metrics(source: dict, latency: float, response: Optional[httpx.Response],
+                        articles: Optional[List[Article]]):
+        """记录一次源请求的指标（articles 为 None 表示失败）"""
+        metrics.record_fetch(
+            source["name"], latency,
+            nbytes=len(response.content) if response is not None else 0,
+            status=response.status_code if response is not None else None,
+            error=articles is None
+        )
+        if articles is not None:
+            metrics.record_articles(source["name"], len(articles))
+
+    def _request_headers(self, source: dict) -> dict:
+        """生成请求头（有缓存时附带条件请求头）"""
+        if self.cache is None:
+            return {}
+        return self.cache.conditional_headers(source["url"])
+
+    def _handle_response(self, response: httpx.Response, source: dict,
+                         category: NewsCategory, limit: int) -> List[Article]:
+        """处理响应：304 时复用缓存的条目，否则解析并写入缓存"""
+        if response.status_code == 304 and self.cache is not None:
+            cached = self.cache.get(source["url"])
+            if cached is not None:
+                self.cache.touch(source["url"])
+                # 缓存的条目是按上次的 limit 解析的：已包含全部新鲜条目或条数足够时直接复用，
+                # 否则（本次的 limit 更大）重新解析缓存的响应体；新鲜度按本次的时间重新过滤
+                if cached.entries is not None and (cached.complete or len(cached.entries) >= limit):
+                    since = freshness_cutoff(self.max_age_hours)
+                    articles = [Article.from_dict(entry) for entry in cached.entries[:limit]]
+                    # 同一个 feed 可能被多个分类使用，分类以本次请求为准
+                    for article in articles:
+                        article.category = category
+                    return [
+                        article for article in articles
+                        if since is None or article.published_at is None or article.published_at >= since
+                    ]
+                return self._parse_feed(cached.body, source, category, limit)
+
+        response.raise_for_status()
+
+        articles = self._parse_feed(response.content, source, category, limit)
+        if self.cache is not None:
+            self.cache.store(
+                source["url"], response.headers, response.content,
+                entries=[article.to_dict() for article in articles],
+                # 不足 limit 条说明解析到了 feed 末尾或过期的条目，缓存的条目已经完整
+                complete=limit is None or len(articles) < limit
+            )
         return articles
 
+    def _parse_feed(self, data: bytes, source: dict, category: NewsCategory,
+                    limit: Optional[int]) -> List[Article]:
+        """
+        解析已下载的 RSS 内容
+
+        流式解析，取到 limit 条或遇到早于 FEED_MAX_AGE_HOURS 的条目后停止，正文按 FEED_CONTENT_MAX_CHARS 截断。
+        """
+        entries = parse_feed(
+            data, limit=limit, since=freshness_cutoff(self.max_age_hours), max_content=self.max_content
+        )
+        return [
+            Article(
+                title=entry.title,
+                url=entry.link,
+                content=entry.content,
+                category=category,
+                source=source["name"],
+                published_at=entry.published_at
+            )
+            for entry in entries
+        ]
+
     def __del__(self):
         """清理资源"""
         if hasattr(self, 'client'):
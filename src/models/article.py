@@ -1,8 +1,9 @@
 """新闻文章数据模型"""
-from dataclasses import dataclass, field
+import sys
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from enum import Enum
+from src.utils.normalize import content_hash, normalize_title, normalize_url, title_fingerprint
 
 
 class NewsCategory(Enum):
@@ -12,33 +13,140 @@ class NewsCategory(Enum):
     TECH = "tech"
 
 
-@dataclass
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
 class Article:
-    """文章数据模型"""
-    title: str
-    url: str
-    content: str
-    category: NewsCategory
-    source: str
-    published_at: Optional[datetime] = None
-    author: Optional[str] = None
-    score: float = 0.0  # AI 评分
-    summary: Optional[str] = None  # AI 摘要
+    """
+    文章数据模型
+
+    使用 __slots__，每篇文章不带 __dict__。设置 url / title / content 时同时计算去重用的键：
+    norm_url（归一化 URL）、norm_title（归一化标题）、title_fingerprint（标题指纹）和 content_hash（正文哈希），
+    去重、已处理索引和推送直接使用，不再各自重复归一化。相等和哈希基于 norm_url。
+    """
+
+    __slots__ = (
+        "_title", "_url", "_content", "category", "source", "published_at", "author",
+        "score", "summary", "points", "topics", "score_fallback", "summary_fallback",
+        "norm_url", "norm_title", "title_fingerprint", "content_hash",
+    )
+
+    def __init__(self, title: str, url: str, content: str, category: NewsCategory, source: str,
+                 published_at: Optional[datetime] = None, author: Optional[str] = None,
+                 score: float = 0.0, summary: Optional[str] = None, points: Optional[int] = None,
+                 topics: Optional[Dict[NewsCategory, float]] = None):
+        self.title = title
+        self.url = url
+        self.content = content
+        self.category = category
+        self.source = _intern(source)  # 同一来源的文章共用一个字符串
+        self.published_at = published_at  # 发布时间（不带时区的 UTC）
+        self.author = _intern(author)
+        self.score = score  # AI 评分
+        self.summary = summary  # AI 摘要
+        self.points = points  # 社区热度（如 Hacker News 分数）
+        self.topics = topics  # 各分类的关键词匹配分数
+        # 评分/摘要是 AI 调用失败时的默认值（不写入已处理索引，之后的运行重新调用）
+        self.score_fallback = False
+        self.summary_fallback = False
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, value: str):
+        self._title = value
+        self.norm_title = normalize_title(value)
+        self.title_fingerprint = title_fingerprint(self.norm_title, normalized=True)
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    @url.setter
+    def url(self, value: str):
+        self._url = value
+        self.norm_url = normalize_url(value)
+
+    @property
+    def content(self) -> str:
+        return self._content
+
+    @content.setter
+    def content(self, value: str):
+        self._content = value
+        self.content_hash = content_hash(value)
 
     def __hash__(self):
         """用于去重的哈希值"""
-        return hash(self.url)
+        return hash(self.norm_url)
 
     def __eq__(self, other):
         """用于去重的比较"""
         if not isinstance(other, Article):
             return False
-        return self.url == other.url
+        return self.norm_url == other.norm_url
+
+    def __repr__(self):
+        return (f"Article(title={self._title!r}, url={self._url!r}, category={self.category}, "
+                f"source={self.source!r}, score={self.score!r})")
+
+    def to_dict(self) -> dict:
+        """序列化为可 JSON 存储的字典"""
+        return {
+            "title": self.title,
+            "url": self.url,
+            "content": self.content,
+            "category": self.category.value,
+            "source": self.source,
+            "published_at": self.published_at.isoformat() if self.published_at else None,
+            "author": self.author,
+            "score": self.score,
+            "summary": self.summary,
+            "points": self.points,
+            "score_fallback": self.score_fallback,
+            "summary_fallback": self.summary_fallback,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Article":
+        """从 to_dict 的结果还原文章"""
+        published_at = data.get("published_at")
+        article = cls(
+            title=data["title"],
+            url=data["url"],
+            content=data.get("content", ""),
+            category=NewsCategory(data["category"]),
+            source=data["source"],
+            published_at=datetime.fromisoformat(published_at) if published_at else None,
+            author=data.get("author"),
+            score=data.get("score", 0.0),
+            summary=data.get("summary"),
+            points=data.get("points"),
+        )
+        article.score_fallback = data.get("score_fallback", False)
+        article.summary_fallback = data.get("summary_fallback", False)
+        return article
 
 
-@dataclass
 class ProcessedArticle:
     """处理后的文章"""
-    article: Article
-    rank: int  # 排名
-    category: NewsCategory
+
+    __slots__ = ("article", "rank", "category")
+
+    def __init__(self, article: Article, rank: int, category: NewsCategory):
+        self.article = article
+        self.rank = rank  # 排名
+        self.category = category
+
+    def __eq__(self, other):
+        if not isinstance(other, ProcessedArticle):
+            return NotImplemented
+        return (self.article, self.rank, self.category) == (other.article, other.rank, other.category)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ProcessedArticle(article={self.article!r}, rank={self.rank}, category={self.category})"
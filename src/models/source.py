@@ -0,0 +1,51 @@
+"""数据源配置模型"""
+from dataclasses import dataclass
+from typing import Optional
+from src.models.article import NewsCategory
+
+# 支持的获取器类型
+FETCHER_TYPES = ("rss", "hn")
+
+
+@dataclass(frozen=True)
+class Source:
+    """一个数据源及其获取参数"""
+    name: str
+    type: str  # rss / hn
+    category: NewsCategory
+    url: str = ""  # hn 为 API 地址，留空使用官方地址
+    limit: int = 50
+    timeout: float = 10
+    concurrency: Optional[int] = None  # 源内部的并发请求数（hn 的故事详情请求），默认使用全局配置
+    min_interval: float = 0  # 两次获取之间的最小间隔（分钟），0 表示每轮都获取
+    route: bool = False  # 是否按内容把文章分到得分最高的分类（综合类源），否则都归入 category
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Source":
+        """
+        由配置项创建
+
+        Raises:
+            ValueError: 缺少必填项或类型不支持
+        """
+        source_type = data.get("type", "rss")
+        if source_type not in FETCHER_TYPES:
+            raise ValueError(f"不支持的数据源类型: {source_type}")
+        if source_type == "rss" and not data.get("url"):
+            raise ValueError(f"RSS 源 {data.get('name')} 缺少 url")
+
+        return cls(
+            name=data["name"],
+            type=source_type,
+            category=NewsCategory(data["category"]),
+            url=data.get("url", ""),
+            limit=int(data.get("limit", 50)),
+            timeout=float(data.get("timeout", 10)),
+            concurrency=int(data["concurrency"]) if data.get("concurrency") else None,
+            min_interval=float(data.get("min_interval", 0)),
+            route=bool(data.get("route", False)),
+        )
+
+    def to_feed(self) -> dict:
+        """RSSFetcher 使用的源配置"""
+        return {"name": self.name, "url": self.url, "limit": self.limit, "timeout": self.timeout}
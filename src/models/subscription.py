@@ -0,0 +1,108 @@
+"""订阅数据模型"""
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from src.config import Config
+from src.feishu_bot import Webhook, parse_webhooks
+from src.models.article import NewsCategory, ProcessedArticle
+
+# 订阅的选择条件：(分类, 来源, 每个分类的篇数)
+Selection = Tuple[Tuple[NewsCategory, ...], Optional[FrozenSet[str]], int]
+
+
+@dataclass
+class Subscription:
+    """一个订阅者（飞书群）及其订阅的内容"""
+    name: str
+    webhook: Webhook
+    categories: Tuple[NewsCategory, ...] = tuple(NewsCategory)
+    sources: Optional[FrozenSet[str]] = None  # None 表示不限来源
+    top_n: int = 10
+
+    @property
+    def selection(self) -> Selection:
+        """选择条件相同的订阅者收到完全相同的卡片"""
+        return self.categories, self.sources, self.top_n
+
+    def select(self, articles: List[ProcessedArticle]) -> Dict[NewsCategory, List[ProcessedArticle]]:
+        """
+        从处理结果中选出订阅的文章
+
+        Args:
+            articles: 处理后的文章列表（已按分类和排名排序）
+
+        Returns:
+            分类到文章列表的映射（每个分类最多 top_n 篇，排名重新编号）
+        """
+        selected = {category: [] for category in self.categories}
+        for item in articles:
+            if item.category not in selected or len(selected[item.category]) >= self.top_n:
+                continue
+            if self.sources is not None and item.article.source not in self.sources:
+                continue
+            bucket = selected[item.category]
+            bucket.append(ProcessedArticle(article=item.article, rank=len(bucket) + 1, category=item.category))
+        return selected
+
+
+def _from_dict(data: dict, index: int) -> Subscription:
+    categories = data.get("categories")
+    sources = data.get("sources")
+    # 按 NewsCategory 的定义顺序排列，顺序不同的相同选择归为一组
+    wanted = {NewsCategory(value) for value in categories} if categories else set(NewsCategory)
+    return Subscription(
+        name=data.get("name") or f"subscriber-{index}",
+        webhook=Webhook(data["webhook"], data.get("sign_key"), data.get("name")),
+        categories=tuple(category for category in NewsCategory if category in wanted),
+        sources=frozenset(sources) if sources else None,
+        top_n=int(data.get("top_n") or Config.NEWS_PER_CATEGORY),
+    )
+
+
+def load_subscriptions(path: Optional[Path] = None) -> List[Subscription]:
+    """
+    读取订阅配置
+
+    配置文件是一个 JSON 数组，每项包含 webhook，可选 name、sign_key、
+    categories（分类值列表）、sources（来源名称列表）和 top_n。
+    文件不存在时，FEISHU_WEBHOOK 和 FEISHU_WEBHOOKS 中的每个 Webhook 订阅全部内容。
+
+    Args:
+        path: 配置文件路径，默认 SUBSCRIPTIONS_FILE
+
+    Returns:
+        订阅列表
+    """
+    path = Path(path or Config.SUBSCRIPTIONS_FILE)
+    if path.exists():
+        items = json.loads(path.read_text(encoding="utf-8"))
+        subscriptions = [_from_dict(item, i) for i, item in enumerate(items, 1)]
+    else:
+        webhooks = parse_webhooks(Config.FEISHU_WEBHOOKS)
+        if Config.FEISHU_WEBHOOK:
+            webhooks.insert(0, Webhook(Config.FEISHU_WEBHOOK))
+        subscriptions = [
+            Subscription(name=webhook.name, webhook=webhook, top_n=Config.NEWS_PER_CATEGORY)
+            for webhook in webhooks
+        ]
+
+    # 推送结果按名称汇报，名称需要唯一
+    seen = set()
+    for subscription in subscriptions:
+        name = subscription.name
+        suffix = 2
+        while subscription.name in seen:
+            subscription.name = f"{name}-{suffix}"
+            suffix += 1
+        subscription.webhook.name = subscription.name
+        seen.add(subscription.name)
+    return subscriptions
+
+
+def group_subscriptions(subscriptions: List[Subscription]) -> Dict[Selection, List[Subscription]]:
+    """按选择条件分组（保持首次出现的顺序）"""
+    groups: Dict[Selection, List[Subscription]] = {}
+    for subscription in subscriptions:
+        groups.setdefault(subscription.selection, []).append(subscription)
+    return groups
@@ -0,0 +1,299 @@
+"""流水线执行 - 各分类按 获取 -> 归一化/去重 -> 筛选 -> 摘要 -> 渲染 逐级流动"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from src.config import Config
+from src.fetcher.hn_fetcher import HackerNewsFetcher
+from src.fetcher.registry import SourceRegistry
+from src.fetcher.rss_fetcher import RSSFetcher
+from src.models.article import Article, NewsCategory, ProcessedArticle
+from src.processor.ai_processor import AIProcessor
+from src.processor.deduplication import DeduplicationProcessor
+from src.processor.normalizer import ContentNormalizer
+from src.processor.pre_ranker import PreRanker
+from src.storage.checkpoints import STAGES, RunCheckpoint
+from src.storage.seen_store import SeenStore
+from src.utils.metrics import metrics
+
+# 流水线中流动的单元：(分类, 文章列表)
+Item = Tuple[NewsCategory, List[Article]]
+
+# 阶段结束标记
+_DONE = object()
+
+
+class NewsPipeline:
+    """
+    新闻处理流水线
+
+    各阶段之间用有界队列连接，某个分类的源全部获取完成后立即进入去重，
+    去重完成后立即进入 AI 筛选，不必等待其它分类。端到端耗时接近最长的单条路径，
+    而不是各阶段耗时之和。
+
+    跨分类去重按分类就绪的先后进行，同一故事保留在最先就绪的分类中。
+
+    提供检查点时，每个分类完成一个阶段后保存结果；已有检查点的分类从最后完成的阶段之后继续，
+    不再重复获取和调用 LLM。
+    """
+
+    def __init__(self, rss_fetcher: RSSFetcher, hn_fetcher: Optional[HackerNewsFetcher],
+                 dedup_processor: DeduplicationProcessor, ai_processor: AIProcessor,
+                 seen_store: Optional[SeenStore] = None, pre_ranker: Optional[PreRanker] = None,
+                 top_k: Optional[int] = None, queue_size: Optional[int] = None,
+                 batch_mode: Optional[bool] = None, normalizer: Optional[ContentNormalizer] = None,
+                 registry: Optional[SourceRegistry] = None, checkpoint: Optional[RunCheckpoint] = None):
+        """
+        Args:
+            rss_fetcher: RSS 获取器
+            hn_fetcher: Hacker News 获取器（为 None 时不获取）
+            dedup_processor: 去重处理器
+            ai_processor: AI 处理器
+            seen_store: 已处理文章索引（为 None 时不过滤历史文章）
+            pre_ranker: 预排序器（为 None 时不做预排序）
+            top_k: 每个分类保留的文章数
+            queue_size: 阶段之间队列的容量
+            batch_mode: 是否使用 Message Batches 完成 AI 阶段，默认由 AI_MODE 决定
+            normalizer: 内容归一化处理器，默认新建一个
+            registry: 数据源注册表，默认由 rss_fetcher.SOURCES 和 hn_fetcher 构建（每轮获取所有源）
+            checkpoint: 本轮的检查点（为 None 时不保存也不恢复）
+        """
+        self.rss_fetcher = rss_fetcher
+        self.hn_fetcher = hn_fetcher
+        self.dedup_processor = dedup_processor
+        self.ai_processor = ai_processor
+        self.seen_store = seen_store
+        self.pre_ranker = pre_ranker
+        self.top_k = top_k or Config.NEWS_PER_CATEGORY
+        self.queue_size = queue_size or Config.PIPELINE_QUEUE_SIZE
+        self.batch_mode = Config.AI_MODE == "batch" if batch_mode is None else batch_mode
+        self.normalizer = normalizer or ContentNormalizer()
+        self.registry = registry or SourceRegistry.from_fetchers(rss_fetcher, hn_fetcher)
+        self.checkpoint = checkpoint
+
+    def run(self, categories: Optional[List[NewsCategory]] = None) -> List[ProcessedArticle]:
+        """运行流水线（同步入口），结束后关闭异步客户端"""
+        async def run():
+            try:
+                return await self.run_async(categories)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(run())
+
+    async def aclose(self):
+        """关闭获取器和 AI 处理器的异步客户端（常驻进程退出时调用）"""
+        await self.registry.aclose()
+        await self.ai_processor.aclose()
+
+    async def run_async(self, categories: Optional[List[NewsCategory]] = None) -> List[ProcessedArticle]:
+        """
+        运行流水线
+
+        Args:
+            categories: 要处理的分类，默认全部
+
+        Returns:
+            按分类和排名排序的处理结果
+        """
+        categories = list(categories) if categories is not None else list(NewsCategory)
+        fetched, deduped, filtered, summarized = (asyncio.Queue(self.queue_size) for _ in range(4))
+        index = self.dedup_processor.new_index()
+        rendered: Dict[NewsCategory, List[ProcessedArticle]] = {}
+
+        async def dedup(item: Item) -> Item:
+            category, articles = item
+            total = len(articles)
+            articles = self.normalizer.process(articles)
+            articles = [article for article in articles if index.add(article)]
+            metrics.record_counts("dedup", category.value, total, len(articles))
+            if self.seen_store is not None:
+                count = len(articles)
+                articles = self.seen_store.filter_new(articles)
+                metrics.record_counts("seen_filter", category.value, count, len(articles))
+            if self.pre_ranker is not None:
+                count = len(articles)
+                articles = self.pre_ranker.rank(articles, top_k=self.top_k, category=category)
+                metrics.record_counts("pre_rank", category.value, count, len(articles))
+            print(f"  - [去重] {category.value}: {total} -> {len(articles)} 篇")
+            self._save("deduped", category, articles)
+            return category, articles
+
+        async def filter_(item: Item) -> Item:
+            category, articles = item
+            top_articles = await self.ai_processor.filter_articles_async(articles, top_k=self.top_k)
+            metrics.record_counts("filter", category.value, len(articles), len(top_articles))
+            if self.seen_store is not None:
+                self.seen_store.mark_scored(articles)
+            print(f"  - [筛选] {category.value}: 已筛选 {len(top_articles)} 篇")
+            self._save("scored", category, top_articles)
+            return category, top_articles
+
+        async def summarize(item: Item) -> Item:
+            category, articles = item
+            articles = await self.ai_processor.summarize_articles_async(articles)
+            print(f"  - [摘要] {category.value}: 已生成 {len(articles)} 篇")
+            self._save("summarized", category, articles)
+            return category, articles
+
+        async def render(item: Item) -> None:
+            category, articles = item
+            rendered[category] = [
+                ProcessedArticle(article=article, rank=i, category=category)
+                for i, article in enumerate(articles, 1)
+            ]
+            self._save("rendered", category, articles)
+
+        if self.batch_mode:
+            # 批处理模式需要整轮的请求一起提交，AI 阶段等待所有分类去重完成
+            ai_stages = [self._batch_ai(deduped, summarized)]
+        else:
+            ai_stages = [
+                self._stage("筛选", "filter", deduped, filtered, filter_, workers=len(categories)),
+                self._stage("摘要", "summarize", filtered, summarized, summarize, workers=len(categories)),
+            ]
+
+        # 有检查点的分类直接进入最后完成的阶段之后的队列（在获取阶段的结束标记之前），其余分类重新获取
+        entries = {"fetched": fetched, "deduped": deduped, "scored": filtered, "summarized": summarized}
+        restored = self._restore(categories)
+
+        async def source():
+            for category, (stage, articles) in restored.items():
+                if stage != "fetched":
+                    # 已去重的分类也加入索引，重新获取的分类仍与它们跨分类去重
+                    for article in articles:
+                        index.add(article)
+                if stage == "rendered":
+                    rendered[category] = [
+                        ProcessedArticle(article=article, rank=i, category=category)
+                        for i, article in enumerate(articles, 1)
+                    ]
+                else:
+                    await entries[stage].put((category, articles))
+            await self._fetch([category for category in categories if category not in restored], fetched)
+
+        stages = [
+            self._stage("去重", "dedup", fetched, deduped, dedup),
+            *ai_stages,
+            self._stage("渲染", "render", summarized, None, render),
+        ]
+        await asyncio.gather(source(), *stages)
+
+        return [item for category in categories for item in rendered.get(category, [])]
+
+    def _restore(self, categories: List[NewsCategory]) -> Dict[NewsCategory, Tuple[str, List[Article]]]:
+        """读取各分类最后完成的阶段及其文章（批处理模式的 AI 阶段不分评分和摘要，不从 scored 继续）"""
+        if self.checkpoint is None:
+            return {}
+        stages = [stage for stage in STAGES if not (self.batch_mode and stage == "scored")]
+        restored = {}
+        for category in categories:
+            stage = self.checkpoint.latest(category, stages)
+            if stage is None:
+                continue
+            articles = self.checkpoint.load(stage, category)
+            restored[category] = (stage, articles)
+            print(f"  - [检查点] {category.value}: 从 {stage} 继续（{len(articles)} 篇）")
+        return restored
+
+    def _save(self, stage: str, category: NewsCategory, articles: List[Article]):
+        """保存检查点，失败只打印不影响本轮处理"""
+        if self.checkpoint is None:
+            return
+        try:
+            self.checkpoint.save(stage, category, articles)
+        except Exception as e:
+            print(f"× [检查点] 保存 {category.value} 的 {stage} 失败: {e}")
+
+    async def _fetch(self, categories: List[NewsCategory], out: asyncio.Queue):
+        """获取阶段：某个分类的所有源完成后，把该分类整体送入下一阶段"""
+        if not categories:
+            await out.put(_DONE)
+            return
+
+        pending = {category: len(self.registry.sources_for([category])) for category in categories}
+        buffers: Dict[NewsCategory, List[Article]] = {category: [] for category in categories}
+
+        async def complete(category: NewsCategory, articles: List[Article]):
+            buffers[category].extend(articles)
+            pending[category] -= 1
+            if pending[category] == 0:
+                print(f"  - [获取] {category.value}: {len(buffers[category])} 篇")
+                self._save("fetched", category, buffers[category])
+                await out.put((category, buffers[category]))
+
+        # 结束标记总是发出，获取出错时下游阶段也能退出，不会一直等待队列
+        try:
+            # 没有任何源的分类直接结束
+            for category in categories:
+                if pending[category] == 0:
+                    await out.put((category, []))
+
+            with metrics.stage("fetch"):
+                async for source, articles in self.registry.iter_fetch_async(categories):
+                    for category in self.registry.targets(source, categories):
+                        await complete(category, [article for article in articles if article.category is category])
+        finally:
+            await out.put(_DONE)
+
+    async def _batch_ai(self, inbox: asyncio.Queue, outbox: asyncio.Queue):
+        """批处理模式的 AI 阶段：收齐所有分类后一次提交评分和摘要"""
+        categorized: Dict[NewsCategory, List[Article]] = {}
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                break
+            category, articles = item
+            categorized[category] = articles
+
+        try:
+            with metrics.stage("ai_batch"):
+                results = await self.ai_processor.process_categories_batch_async(categorized, top_k=self.top_k)
+        except Exception as e:
+            print(f"× [批处理] AI 处理失败: {e}")
+            results = {}
+
+        for category, articles in categorized.items():
+            metrics.record_counts("filter", category.value, len(articles), len(results.get(category, [])))
+
+        if self.seen_store is not None:
+            for articles in categorized.values():
+                self.seen_store.mark_scored(articles)
+
+        for category, articles in results.items():
+            print(f"  - [批处理] {category.value}: 已筛选 {len(articles)} 篇")
+            self._save("summarized", category, articles)
+            await outbox.put((category, articles))
+        await outbox.put(_DONE)
+
+    async def _stage(self, name: str, key: str, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                     handler: Callable[[Item], Awaitable[Optional[Item]]], workers: int = 1):
+        """
+        通用阶段：workers 个协程从 inbox 取任务，处理结果放入 outbox
+
+        收到结束标记后转发给同阶段的其它 worker，最后一个退出的 worker 通知下游。
+        每次处理的耗时以 key 为阶段名记录到运行指标。
+        """
+        remaining = max(workers, 1)
+
+        async def worker():
+            nonlocal remaining
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    await inbox.put(_DONE)
+                    break
+
+                try:
+                    with metrics.stage(key):
+                        result = await handler(item)
+                except Exception as e:
+                    print(f"× [{name}] {item[0].value} 处理失败: {e}")
+                    continue
+
+                if outbox is not None and result is not None:
+                    await outbox.put(result)
+
+            remaining -= 1
+            if remaining == 0 and outbox is not None:
+                await outbox.put(_DONE)
+
+        await asyncio.gather(*[worker() for _ in range(max(workers, 1))])
@@ -1,115 +1,699 @@
 """AI 处理器 - 使用 Claude API 进行筛选和摘要"""
+import asyncio
+import json
+import math
+import random
+import re
+import time
 import anthropic
-from typing import List
+from collections import Counter
+from typing import Any, Dict, List, Optional
 from src.models.article import Article, NewsCategory
 from src.config import Config
+from src.processor.diversity import StorySelector
+from src.processor.normalizer import estimate_tokens, truncate_to_tokens
+from src.storage.llm_cache import LLMCache, make_key
+from src.utils.metrics import metrics
+from src.utils.rate_limit import RateLimiter
+
+
+def extract_json(text: str) -> Any:
+    """从模型回复中提取第一个 JSON 对象或数组（容忍代码块和前后说明文字）"""
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"[\[{]", text):
+        try:
+            value, _ = decoder.raw_decode(text, match.start())
+            return value
+        except ValueError:
+            continue
+    return None
 
 
 class AIProcessor:
     """AI 处理器"""
 
-    # 筛选提示词
-    FILTER_PROMPT = """你是一个新闻质量评估专家。请根据以下标准对新闻进行 1-10 分评分：
+    # 筛选系统提示词（评分标准，各请求共用，标记为可缓存）
+    FILTER_SYSTEM = """你是一个新闻质量评估专家。请根据以下标准对新闻进行 1-10 分评分：
 
 1. 信息价值（3 分）：是否有独特信息、深度分析
 2. 时效性（2 分）：是否是最新热点
 3. 影响力（3 分）：对行业/社会的潜在影响
 4. 可读性（2 分）：内容是否清晰易懂
 
-新闻标题：{title}
+只输出 JSON，不要输出其它内容。
+"""
+
+    # 筛选提示词
+    FILTER_PROMPT = """新闻标题：{title}
 新闻内容：{content}
 
 请只返回 JSON：{{"score": 分数, "reason": "评分理由"}}
 """
 
-    # 摘要提示词
-    SUMMARY_PROMPT = """请用 1-2 句话提炼这篇新闻的核心价值，突出关键信息。
+    # 批量筛选提示词
+    BATCH_FILTER_PROMPT = """请对下列每条新闻分别评分。
 
-标题：{title}
-内容：{content}
+新闻列表（方括号内为编号）：
+{items}
+请只返回 JSON 数组，每条新闻一个元素：[{{"id": 编号, "score": 分数, "reason": "评分理由"}}]
+"""
+
+    # 批量评分时每条新闻预留的输出 token 数
+    BATCH_ITEM_MAX_TOKENS = 80
+
+    # 摘要系统提示词（写作要求，各请求共用，标记为可缓存）
+    SUMMARY_SYSTEM = """请用 1-2 句话提炼新闻的核心价值，突出关键信息。
 
 要求：
 - 简洁有力，不超过 100 字
 - 突出最关键的信息点
 - 如果是技术新闻，提及技术名称/公司
+- 直接输出摘要，不要添加前缀或解释
+"""
+
+    # 摘要提示词
+    SUMMARY_PROMPT = """标题：{title}
+内容：{content}
 """
 
-    def __init__(self):
-        """初始化 AI 处理器"""
+    def __init__(self, cache: Optional[LLMCache] = None, selector: Optional[StorySelector] = None):
+        """
+        初始化 AI 处理器
+
+        Args:
+            cache: 评分/摘要结果缓存，默认在 LLM_CACHE_ENABLED 时使用 DATA_DIR 下的缓存
+            selector: Top K 选择器，默认在 DIVERSITY_ENABLED 时按故事归组并兼顾多样性，否则只按评分
+        """
         self.client = anthropic.Anthropic(
             api_key=Config.ANTHROPIC_API_KEY,
             base_url=Config.ANTHROPIC_BASE_URL
         )
         self.model = Config.ANTHROPIC_MODEL
+        if cache is None and Config.LLM_CACHE_ENABLED:
+            cache = LLMCache()
+        self.cache = cache
+        if selector is None and Config.DIVERSITY_ENABLED:
+            selector = StorySelector()
+        self.selector = selector
+
+        # 异步执行路径（客户端和信号量绑定到事件循环，首次使用时创建）
+        self.concurrency = Config.AI_CONCURRENCY
+        self.max_retries = Config.AI_MAX_RETRIES
+        self.rate_limiter = RateLimiter(Config.AI_RPM, Config.AI_TPM)
+        self._async_client = None
+        self._semaphore = None
+        self._loop = None
+
+        # 累计的 token 用量（含提示词缓存的读写）
+        self.usage = Counter()
+
+    # ------------------------------------------------------------------
+    # 请求构建与结果解析（同步/异步路径共用）
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _system_block(text: str) -> list:
+        """可缓存的系统提示词块"""
+        return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+    def _single_request(self, article: Article) -> dict:
+        """单篇评分请求参数"""
+        return {
+            "model": self.model,
+            "max_tokens": 200,
+            "system": self._system_block(self.FILTER_SYSTEM),
+            "messages": [{
+                "role": "user",
+                "content": self.FILTER_PROMPT.format(
+                    title=article.title,
+                    content=self._score_content(article)
+                )
+            }]
+        }
 
-    def filter_articles(self, articles: List[Article], top_k: int = 10) -> List[Article]:
+    def _batch_request(self, batch: List[Article]) -> dict:
+        """批量评分请求参数"""
+        return {
+            "model": self.model,
+            "max_tokens": self.BATCH_ITEM_MAX_TOKENS * len(batch) + 100,
+            "system": self._system_block(self.FILTER_SYSTEM),
+            "messages": [{
+                "role": "user",
+                "content": self.BATCH_FILTER_PROMPT.format(items="\n".join(
+                    self._format_batch_item(i, article) for i, article in enumerate(batch)
+                ))
+            }]
+        }
+
+    def _summary_request(self, article: Article) -> dict:
+        """摘要请求参数"""
+        return {
+            "model": self.model,
+            "max_tokens": 150,
+            "system": self._system_block(self.SUMMARY_SYSTEM),
+            "messages": [{
+                "role": "user",
+                "content": self.SUMMARY_PROMPT.format(
+                    title=article.title,
+                    content=self._summary_content(article)
+                )
+            }]
+        }
+
+    @staticmethod
+    def _score_content(article: Article) -> str:
+        """评分时使用的内容（按 token 预算截断）"""
+        return truncate_to_tokens(article.content, Config.AI_SCORE_CONTENT_TOKENS)
+
+    @staticmethod
+    def _summary_content(article: Article) -> str:
+        """生成摘要时使用的内容（按 token 预算截断）"""
+        return truncate_to_tokens(article.content, Config.AI_SUMMARY_CONTENT_TOKENS)
+
+    def _format_batch_item(self, item_id: int, article: Article) -> str:
+        """格式化批量评分中的一条新闻"""
+        return f"[{item_id}] 标题：{article.title}\n内容：{self._score_content(article)}\n"
+
+    def _make_batches(self, articles: List[Article], budget: int) -> List[List[Article]]:
+        """按 token 预算把文章分组"""
+        batches = []
+        current, used = [], estimate_tokens(self.FILTER_SYSTEM + self.BATCH_FILTER_PROMPT)
+
+        for article in articles:
+            cost = estimate_tokens(self._format_batch_item(0, article))
+            if current and (used + cost > budget or len(current) >= Config.AI_BATCH_MAX_ITEMS):
+                batches.append(current)
+                current, used = [], estimate_tokens(self.FILTER_SYSTEM + self.BATCH_FILTER_PROMPT)
+            current.append(article)
+            used += cost
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _apply_batch_scores(self, batch: List[Article], text: str) -> List[List[Article]]:
+        """
+        把批量评分结果写回文章
+
+        Returns:
+            缺失或格式错误的条目拆分成的更小批次，需要重新评分
+        """
+        scores = self._parse_batch_scores(text, len(batch))
+
+        missing = []
+        for i, article in enumerate(batch):
+            if i in scores:
+                self._store_score(article, scores[i])
+            else:
+                missing.append(article)
+
+        if not missing:
+            return []
+        middle = (len(missing) + 1) // 2
+        return [part for part in (missing[:middle], missing[middle:]) if part]
+
+    def _parse_batch_scores(self, text: str, size: int) -> Dict[int, float]:
+        """解析批量评分结果，返回 编号 -> 分数，忽略格式错误的条目"""
+        data = extract_json(text)
+        if isinstance(data, dict):
+            # 兼容模型把数组包在对象里的情况
+            data = next((value for value in data.values() if isinstance(value, list)), [])
+        if not isinstance(data, list):
+            return {}
+
+        scores = {}
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            try:
+                item_id = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            score = self._parse_score(item)
+            if 0 <= item_id < size and score is not None:
+                scores[item_id] = score
+        return scores
+
+    @staticmethod
+    def _parse_score(data) -> Optional[float]:
+        """从 {"score": ...} 中取出 1-10 之间的分数"""
+        if not isinstance(data, dict):
+            return None
+        try:
+            score = float(data.get("score"))
+        except (TypeError, ValueError):
+            return None
+        if score != score:  # NaN
+            return None
+        return min(max(score, 1.0), 10.0)
+
+    def _score_key(self, article: Article) -> str:
+        """评分缓存键"""
+        return make_key(self.model, self.FILTER_SYSTEM + self.FILTER_PROMPT, article.title, self._score_content(article))
+
+    def _summary_key(self, article: Article) -> str:
+        """摘要缓存键"""
+        return make_key(self.model, self.SUMMARY_SYSTEM + self.SUMMARY_PROMPT, article.title, self._summary_content(article))
+
+    def _load_cached_score(self, article: Article) -> bool:
+        """命中缓存时直接写入评分"""
+        if self.cache is None:
+            return False
+        score = self.cache.get(self._score_key(article))
+        if score is None:
+            return False
+        article.score = score
+        article.score_fallback = False
+        return True
+
+    def _load_cached_summary(self, article: Article) -> bool:
+        """命中缓存时直接写入摘要"""
+        if self.cache is None:
+            return False
+        summary = self.cache.get(self._summary_key(article))
+        if summary is None:
+            return False
+        article.summary = summary
+        article.summary_fallback = False
+        return True
+
+    def _store_score(self, article: Article, score: float):
+        """写入评分并缓存（失败时的默认分数不缓存）"""
+        article.score = score
+        article.score_fallback = False
+        if self.cache is not None:
+            self.cache.set(self._score_key(article), score)
+
+    def _store_summary(self, article: Article, summary: str):
+        """写入摘要并缓存"""
+        article.summary = summary
+        article.summary_fallback = False
+        if self.cache is not None:
+            self.cache.set(self._summary_key(article), summary)
+
+    def _flush_cache(self):
+        """评分或摘要阶段结束时一次写入本阶段的缓存"""
+        if self.cache is not None:
+            self.cache.flush()
+
+    @staticmethod
+    def _fallback_score(article: Article):
+        """评分失败时的默认分数（标记为默认值，不缓存也不写入已处理索引）"""
+        article.score = 5.0
+        article.score_fallback = True
+
+    @staticmethod
+    def _fallback_summary(article: Article):
+        """摘要失败时使用标题作为摘要（标记为默认值，不缓存也不写入已处理索引）"""
+        article.summary = article.title
+        article.summary_fallback = True
+
+    def _record_usage(self, response, kind: str, seconds: Optional[float] = None):
+        """累计一次响应的 token 用量，并记录到运行指标"""
+        usage = getattr(response, "usage", None)
+        metrics.record_llm(kind, seconds, usage)
+        if usage is None:
+            return
+        self.usage["requests"] += 1
+        for field in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+            self.usage[field] += getattr(usage, field, None) or 0
+
+    def usage_report(self) -> str:
+        """token 用量摘要"""
+        return (
+            f"请求 {self.usage['requests']} 次 | 输入 {self.usage['input_tokens']} | "
+            f"输出 {self.usage['output_tokens']} | 缓存读取 {self.usage['cache_read_input_tokens']} | "
+            f"缓存写入 {self.usage['cache_creation_input_tokens']}"
+        )
+
+    def _top_k(self, articles: List[Article], top_k: int) -> List[Article]:
+        """按分数排序，返回前 K 篇（有选择器时同一故事只保留一篇，并兼顾多样性）"""
+        articles.sort(key=lambda x: x.score, reverse=True)
+        if self.selector is not None:
+            return self.selector.select(articles, top_k)
+        return articles[:top_k]
+
+    # ------------------------------------------------------------------
+    # 同步路径
+    # ------------------------------------------------------------------
+
+    def _create(self, params: dict, kind: str):
+        """同步 messages.create，记录用量和耗时"""
+        start = time.perf_counter()
+        try:
+            response = self.client.messages.create(**params)
+        except Exception as e:
+            metrics.record_llm(kind, time.perf_counter() - start, error=e)
+            raise
+        self._record_usage(response, kind, time.perf_counter() - start)
+        return response
+
+    def filter_articles(self, articles: List[Article], top_k: int = 10,
+                        batch_tokens: Optional[int] = None) -> List[Article]:
         """
         筛选优质文章
 
         Args:
-            articles: 文章列表
+            articles: 文章列表（已有评分的文章不再调用 AI）
             top_k: 返回前 K 篇
+            batch_tokens: 每次批量评分请求的输入 token 预算，默认 AI_BATCH_TOKENS；
+                为 0 时逐篇评分
 
         Returns:
             评分最高的文章列表
         """
-        for article in articles:
-            try:
-                # 调用 AI 评分
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=200,
-                    messages=[{
-                        "role": "user",
-                        "content": self.FILTER_PROMPT.format(
-                            title=article.title,
-                            content=article.content[:500]  # 限制长度
-                        )
-                    }]
-                )
+        if batch_tokens is None:
+            batch_tokens = Config.AI_BATCH_TOKENS
 
-                # 解析评分（简化处理）
-                content = response.content[0].text
-                # 实际需要解析 JSON，这里简化为直接赋值
-                article.score = 7.0  # 默认分数
+        pending = [
+            article for article in articles
+            if article.score <= 0 and not self._load_cached_score(article)
+        ]
+        if batch_tokens > 0:
+            for batch in self._make_batches(pending, batch_tokens):
+                self._score_batch(batch)
+        else:
+            for article in pending:
+                self._score_single(article)
 
-            except Exception as e:
-                print(f"× AI 评分失败: {e}")
-                article.score = 5.0  # 默认分数
+        self._flush_cache()
+        return self._top_k(articles, top_k)
 
-        # 按分数排序，返回前 K 篇
-        articles.sort(key=lambda x: x.score, reverse=True)
-        return articles[:top_k]
+    def _score_batch(self, batch: List[Article]):
+        """
+        一次请求为一组文章评分
+
+        返回结果中缺失或格式错误的条目会拆成更小的批次重试，单篇时退回逐篇评分。
+        """
+        if len(batch) == 1:
+            self._score_single(batch[0])
+            return
+
+        try:
+            response = self._create(self._batch_request(batch), "score_batch")
+            retry = self._apply_batch_scores(batch, response.content[0].text)
+        except Exception as e:
+            print(f"× AI 批量评分失败: {e}")
+            for article in batch:
+                self._fallback_score(article)
+            return
+
+        for part in retry:
+            self._score_batch(part)
+
+    def _score_single(self, article: Article):
+        """为单篇文章评分"""
+        try:
+            response = self._create(self._single_request(article), "score")
+            score = self._parse_score(extract_json(response.content[0].text))
+            if score is not None:
+                self._store_score(article, score)
+            else:
+                self._fallback_score(article)
+        except Exception as e:
+            print(f"× AI 评分失败: {e}")
+            self._fallback_score(article)
 
     def summarize_articles(self, articles: List[Article]) -> List[Article]:
         """
         为文章生成摘要
 
         Args:
-            articles: 文章列表
+            articles: 文章列表（已有摘要的文章不再调用 AI）
 
         Returns:
             带摘要的文章列表
         """
         for article in articles:
+            if article.summary or self._load_cached_summary(article):
+                continue
+
             try:
-                # 调用 AI 生成摘要
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=150,
-                    messages=[{
-                        "role": "user",
-                        "content": self.SUMMARY_PROMPT.format(
-                            title=article.title,
-                            content=article.content[:1000]
-                        )
-                    }]
-                )
+                response = self._create(self._summary_request(article), "summary")
+                self._store_summary(article, response.content[0].text)
+            except Exception as e:
+                print(f"× AI 摘要失败: {e}")
+                self._fallback_summary(article)
+
+        self._flush_cache()
+        return articles
 
-                article.summary = response.content[0].text
+    # ------------------------------------------------------------------
+    # 异步并发路径
+    # ------------------------------------------------------------------
 
+    async def filter_articles_async(self, articles: List[Article], top_k: int = 10,
+                                    batch_tokens: Optional[int] = None) -> List[Article]:
+        """filter_articles 的并发版本，各批次同时请求"""
+        if batch_tokens is None:
+            batch_tokens = Config.AI_BATCH_TOKENS
+
+        pending = [
+            article for article in articles
+            if article.score <= 0 and not self._load_cached_score(article)
+        ]
+        if batch_tokens > 0:
+            await asyncio.gather(*[
+                self._score_batch_async(batch) for batch in self._make_batches(pending, batch_tokens)
+            ])
+        else:
+            await asyncio.gather(*[self._score_single_async(article) for article in pending])
+
+        self._flush_cache()
+        return self._top_k(articles, top_k)
+
+    async def _score_batch_async(self, batch: List[Article]):
+        """_score_batch 的异步版本"""
+        if len(batch) == 1:
+            await self._score_single_async(batch[0])
+            return
+
+        try:
+            response = await self._acreate(self._batch_request(batch), "score_batch")
+            retry = self._apply_batch_scores(batch, response.content[0].text)
+        except Exception as e:
+            print(f"× AI 批量评分失败: {e}")
+            for article in batch:
+                self._fallback_score(article)
+            return
+
+        await asyncio.gather(*[self._score_batch_async(part) for part in retry])
+
+    async def _score_single_async(self, article: Article):
+        """_score_single 的异步版本"""
+        try:
+            response = await self._acreate(self._single_request(article), "score")
+            score = self._parse_score(extract_json(response.content[0].text))
+            if score is not None:
+                self._store_score(article, score)
+            else:
+                self._fallback_score(article)
+        except Exception as e:
+            print(f"× AI 评分失败: {e}")
+            self._fallback_score(article)
+
+    async def summarize_articles_async(self, articles: List[Article]) -> List[Article]:
+        """summarize_articles 的并发版本"""
+        async def summarize(article: Article):
+            try:
+                response = await self._acreate(self._summary_request(article), "summary")
+                self._store_summary(article, response.content[0].text)
             except Exception as e:
                 print(f"× AI 摘要失败: {e}")
-                article.summary = article.title  # 使用标题作为摘要
+                self._fallback_summary(article)
 
+        await asyncio.gather(*[
+            summarize(article) for article in articles
+            if not article.summary and not self._load_cached_summary(article)
+        ])
+        self._flush_cache()
         return articles
+
+    # ------------------------------------------------------------------
+    # Message Batches 离线批处理路径
+    # ------------------------------------------------------------------
+
+    async def process_categories_batch_async(self, categorized: Dict[NewsCategory, List[Article]],
+                                             top_k: int = 10) -> Dict[NewsCategory, List[Article]]:
+        """
+        整轮的评分请求作为一个 message batch 提交并轮询至完成，
+        再把选出的 Top K 的摘要请求作为第二个 batch 提交。
+
+        结果按 custom_id 映射回文章；超时、失败或缺失的条目回退到逐条并发调用。
+
+        Args:
+            categorized: 分类到文章列表的映射
+            top_k: 每个分类保留的文章数
+
+        Returns:
+            分类到带摘要的 Top K 文章的映射
+        """
+        self._ensure_async_client()
+        categories = [category for category, articles in categorized.items() if articles]
+
+        # 1. 评分
+        requests, groups = [], {}
+        for category in categories:
+            pending = [
+                article for article in categorized[category]
+                if article.score <= 0 and not self._load_cached_score(article)
+            ]
+            if Config.AI_BATCH_TOKENS > 0:
+                batches = self._make_batches(pending, Config.AI_BATCH_TOKENS)
+            else:
+                batches = [[article] for article in pending]
+
+            for batch in batches:
+                custom_id = f"score-{len(requests)}"
+                params = self._single_request(batch[0]) if len(batch) == 1 else self._batch_request(batch)
+                requests.append({"custom_id": custom_id, "params": params})
+                groups[custom_id] = batch
+
+        results = await self._run_message_batch(requests)
+        for custom_id, batch in groups.items():
+            message = results.get(custom_id)
+            if message is None:
+                continue
+            text = message.content[0].text
+            if len(batch) == 1:
+                score = self._parse_score(extract_json(text))
+                if score is not None:
+                    self._store_score(batch[0], score)
+            else:
+                # 缺失的条目保持未评分，下面统一回退
+                self._apply_batch_scores(batch, text)
+
+        # 未完成的评分回退到逐条调用（已评分的文章会被跳过）
+        top_lists = await asyncio.gather(*[
+            self.filter_articles_async(categorized[category], top_k) for category in categories
+        ])
+        top_by_category = dict(zip(categories, top_lists))
+
+        # 2. 摘要
+        requests, targets = [], {}
+        for category in categories:
+            for article in top_by_category[category]:
+                if article.summary or self._load_cached_summary(article):
+                    continue
+                custom_id = f"summary-{len(requests)}"
+                requests.append({"custom_id": custom_id, "params": self._summary_request(article)})
+                targets[custom_id] = article
+
+        results = await self._run_message_batch(requests)
+        for custom_id, article in targets.items():
+            message = results.get(custom_id)
+            if message is not None:
+                self._store_summary(article, message.content[0].text)
+
+        await asyncio.gather(*[
+            self.summarize_articles_async(top_by_category[category]) for category in categories
+        ])
+        return top_by_category
+
+    async def _run_message_batch(self, requests: List[dict]) -> Dict[str, Any]:
+        """
+        提交一个 message batch 并轮询至结束
+
+        Returns:
+            custom_id -> 成功的 Message；超时或出错时返回已有结果（可能为空）
+        """
+        if not requests:
+            return {}
+
+        batches = self._async_client.messages.batches
+        with metrics.stage("message_batch"):
+            try:
+                batch = await batches.create(requests=requests)
+                print(f"  - 已提交 message batch {batch.id}（{len(requests)} 个请求）")
+
+                deadline = time.monotonic() + Config.AI_BATCH_API_TIMEOUT
+                while batch.processing_status != "ended":
+                    if time.monotonic() >= deadline:
+                        print(f"× message batch {batch.id} 超时，回退到逐条调用")
+                        await batches.cancel(batch.id)
+                        return {}
+                    await asyncio.sleep(Config.AI_BATCH_API_POLL)
+                    batch = await batches.retrieve(batch.id)
+
+                results = {}
+                async for entry in await batches.results(batch.id):
+                    if entry.result.type == "succeeded":
+                        self._record_usage(entry.result.message, "message_batch")
+                        results[entry.custom_id] = entry.result.message
+                return results
+
+            except Exception as e:
+                print(f"× message batch 处理失败: {e}")
+                return {}
+
+    def _ensure_async_client(self):
+        """为当前事件循环创建（或复用）异步客户端和并发信号量"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._async_client = anthropic.AsyncAnthropic(
+                api_key=Config.ANTHROPIC_API_KEY,
+                base_url=Config.ANTHROPIC_BASE_URL,
+                max_retries=0  # 重试由 _acreate 统一处理
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+
+    async def aclose(self):
+        """关闭异步客户端"""
+        if self._async_client is not None:
+            await self._async_client.close()
+        self._async_client = None
+        self._semaphore = None
+        self._loop = None
+
+    async def _acreate(self, params: dict, kind: str):
+        """
+        限流、限并发并带指数退避重试的 messages.create
+
+        429、5xx 和连接错误会重试（优先使用服务端 retry-after），其余错误直接抛出。
+        每次尝试的耗时和结果按 kind 记录到运行指标。
+        """
+        self._ensure_async_client()
+        tokens = (
+            estimate_tokens(params["system"][0]["text"])
+            + estimate_tokens(params["messages"][0]["content"])
+            + params["max_tokens"]
+        )
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire_async(tokens)
+            try:
+                async with self._semaphore:
+                    start = time.perf_counter()
+                    response = await self._async_client.messages.create(**params)
+                self._record_usage(response, kind, time.perf_counter() - start)
+                return response
+            except Exception as e:
+                metrics.record_llm(kind, error=e)
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self._retry_delay(e, attempt)
+                print(f"× AI 请求失败（{e.__class__.__name__}），{delay:.1f}s 后重试")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """是否为可重试的错误（限流、服务端错误、连接错误）"""
+        if isinstance(error, anthropic.APIConnectionError):
+            return True
+        if isinstance(error, anthropic.APIStatusError):
+            return error.status_code == 429 or error.status_code >= 500
+        return False
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """指数退避时间，服务端给出 retry-after 时以其为准，都不超过 AI_BACKOFF_MAX"""
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                delay = float(response.headers.get("retry-after"))
+                if math.isfinite(delay) and delay >= 0:
+                    return min(delay, Config.AI_BACKOFF_MAX)
+            except (TypeError, ValueError):
+                pass
+        return min(Config.AI_BACKOFF_BASE * (2 ** attempt), Config.AI_BACKOFF_MAX) * random.uniform(0.8, 1.2)
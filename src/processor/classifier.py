@@ -0,0 +1,236 @@
+"""主题分类 - 所有分类的关键词编译成一个匹配器，一次扫描标题和正文得出各分类的匹配分数"""
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.config import Config
+from src.models.article import Article, NewsCategory
+
+# 拉丁字母和数字（已转小写）：以它们开头/结尾的关键词要求整词匹配，避免 "ai" 命中 "said"；
+# 以字母结尾的关键词后面可以紧跟数字（"gpt" 命中 "gpt4"）
+_LETTERS = "a-zÀ-ɏ"
+_LATIN = "0-9" + _LETTERS
+_LATIN_RE = re.compile(f"[{_LATIN}]")
+_LETTER_RE = re.compile(f"[{_LETTERS}]")
+
+# 标签、链接和 HTML 实体不参与匹配
+_MARKUP_RE = re.compile(r"<[^>]*>|https?://\S+|&#?\w+;")
+
+# 关键词 -> 权重：强信号 1.0，容易出现在其它语境中的弱信号 0.5
+DEFAULT_KEYWORDS: Dict[NewsCategory, Dict[str, float]] = {
+    NewsCategory.AI: {
+        **dict.fromkeys([
+            "ai", "a.i.", "artificial intelligence", "machine learning", "deep learning", "neural network",
+            "neural networks", "llm", "llms", "large language model", "large language models", "gpt", "chatgpt",
+            "openai", "anthropic", "claude", "gemini", "deepmind", "mistral", "llama", "deepseek", "qwen",
+            "copilot", "transformer", "transformers", "diffusion model", "reinforcement learning", "rlhf",
+            "fine-tuning", "fine-tune", "agi", "ai agent", "ai agents", "multimodal", "computer vision",
+            "generative ai", "genai", "prompt", "prompts", "embedding", "embeddings", "hugging face",
+            "人工智能", "机器学习", "深度学习", "神经网络", "大模型", "大语言模型", "生成式", "智能体",
+            "通义千问", "文心一言", "豆包", "强化学习", "多模态", "算力", "具身智能", "aigc",
+        ], 1.0),
+        **dict.fromkeys([
+            "model", "models", "agent", "agents", "inference", "training", "benchmark", "reasoning",
+            "chatbot", "robotics", "robot", "gpu", "gpus", "模型", "机器人", "推理", "训练",
+        ], 0.5),
+    },
+    NewsCategory.FINANCE: {
+        **dict.fromkeys([
+            "central bank", "interest rate", "interest rates", "rate cut", "rate hike", "inflation", "cpi",
+            "federal reserve", "fed", "ecb", "bond", "bonds", "treasury", "treasuries", "yield", "yields",
+            "stock market", "stocks", "equities", "earnings", "ipo", "nasdaq", "s&p 500", "dow jones",
+            "recession", "gdp", "tariff", "tariffs", "currency", "forex", "hedge fund", "dividend",
+            "央行", "利率", "降息", "加息", "降准", "股市", "a股", "港股", "美股", "债券", "国债", "汇率",
+            "人民币", "通胀", "财报", "营收", "净利润", "上市", "证监会", "银行", "基金", "期货", "关税",
+            "经济", "货币政策", "财政", "楼市", "房地产",
+        ], 1.0),
+        **dict.fromkeys([
+            "market", "markets", "investor", "investors", "shares", "revenue", "profit", "economy",
+            "投资", "市场", "股价", "融资",
+        ], 0.5),
+    },
+    NewsCategory.TECH: {
+        **dict.fromkeys([
+            "smartphone", "iphone", "android", "semiconductor", "semiconductors", "chip", "chips", "chipmaker",
+            "apple", "google", "microsoft", "nvidia", "amd", "intel", "tsmc", "qualcomm", "samsung", "huawei",
+            "xiaomi", "tesla", "spacex", "startup", "startups", "open source", "open-source", "software",
+            "hardware", "cloud", "cybersecurity", "data breach", "linux", "windows", "macos", "ios",
+            "electric vehicle", "electric vehicles", "ev", "evs", "5g", "quantum computing", "vr", "ar headset",
+            "芯片", "半导体", "手机", "苹果", "华为", "小米", "英伟达", "开源", "云计算", "电动车", "新能源汽车",
+            "自动驾驶", "操作系统", "网络安全", "量子计算", "创业公司",
+        ], 1.0),
+        **dict.fromkeys([
+            "launch", "launches", "release", "releases", "app", "apps", "device", "devices", "funding",
+            "gadget", "发布", "推出", "科技", "数码",
+        ], 0.5),
+    },
+}
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    把关键词构建成前缀树并转成正则表达式
+
+    共同前缀只出现一次，匹配时在每个位置沿前缀树前进，耗时与关键词数量基本无关；
+    分支按长到短排列，同一位置优先匹配最长的关键词。
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    多关键词匹配器
+
+    关键词按首尾字符是否为拉丁字母/数字分组，每组编译成一个前缀树正则，
+    再在拉丁字母一侧加上整词边界；中日韩关键词不要求边界。各组合并为一个正则，一次扫描文本。
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        groups: Dict[Tuple[bool, str], List[str]] = {}
+        for keyword in {keyword.lower() for keyword in keywords if keyword}:
+            if _LETTER_RE.match(keyword[-1]):
+                end = _LETTERS
+            elif _LATIN_RE.match(keyword[-1]):
+                end = _LATIN
+            else:
+                end = ""
+            groups.setdefault((bool(_LATIN_RE.match(keyword[0])), end), []).append(keyword)
+
+        alternatives = []
+        # 有边界要求的组放在前面，同一位置优先尝试
+        for (start, end), words in sorted(groups.items(), reverse=True):
+            pattern = _trie_pattern(words)
+            if start:
+                pattern = f"(?<![{_LATIN}])" + pattern
+            if end:
+                pattern += f"(?![{end}])"
+            alternatives.append(f"(?:{pattern})")
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        在已转小写的文本中查找关键词
+
+        Yields:
+            (起始位置, 命中的关键词)，互不重叠
+        """
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text):
+            yield match.start(), match.group()
+
+
+class TopicClassifier:
+    """
+    主题分类器
+
+    标题和正文拼接后一次扫描，每个命中的关键词按权重计入其所属的分类：
+    标题中命中记全部权重，只在正文中命中记 CONTENT_WEIGHT；同一关键词只计一次。
+    """
+
+    # 只在正文中命中的关键词的权重系数
+    CONTENT_WEIGHT = 0.5
+
+    # 正文只扫描前这么多字符（导语足以判断主题）
+    CONTENT_CHARS = 1000
+
+    def __init__(self, keywords: Optional[Dict[NewsCategory, Dict[str, float]]] = None):
+        """
+        Args:
+            keywords: 分类 -> {关键词: 权重}，默认 DEFAULT_KEYWORDS
+        """
+        keywords = DEFAULT_KEYWORDS if keywords is None else keywords
+        # 关键词 -> [(分类, 权重)]，同一个关键词可以属于多个分类
+        self._index: Dict[str, List[Tuple[NewsCategory, float]]] = {}
+        for category, words in keywords.items():
+            for word, weight in words.items():
+                self._index.setdefault(word.lower(), []).append((category, weight))
+        self.matcher = KeywordMatcher(self._index)
+
+    def classify(self, title: str, content: str = "") -> Dict[NewsCategory, float]:
+        """
+        计算各分类的匹配分数
+
+        Returns:
+            分类 -> 分数，只包含分数大于 0 的分类
+        """
+        content = _MARKUP_RE.sub(" ", content[:self.CONTENT_CHARS]) if content else ""
+        text = f"{title}\n{content}".lower()
+        title_end = len(title)
+
+        hits: Dict[str, float] = {}
+        for start, keyword in self.matcher.finditer(text):
+            factor = 1.0 if start < title_end else self.CONTENT_WEIGHT
+            if factor > hits.get(keyword, 0.0):
+                hits[keyword] = factor
+
+        scores: Dict[NewsCategory, float] = {}
+        for keyword, factor in hits.items():
+            for category, weight in self._index[keyword]:
+                scores[category] = scores.get(category, 0.0) + weight * factor
+        return scores
+
+    def route(self, scores: Dict[NewsCategory, float], default: NewsCategory,
+              threshold: Optional[float] = None) -> NewsCategory:
+        """得分最高且不低于阈值的分类，没有时返回 default"""
+        threshold = Config.CLASSIFIER_THRESHOLD if threshold is None else threshold
+        if not scores:
+            return default
+        best = max(scores, key=lambda category: (scores[category], category is default))
+        return best if scores[best] >= threshold else default
+
+    def annotate(self, articles: List[Article], route: bool = False):
+        """
+        为文章记录各分类的匹配分数（article.topics）
+
+        Args:
+            articles: 文章列表
+            route: 是否按分数把文章改分到得分最高的分类
+        """
+        for article in articles:
+            article.topics = self.classify(article.title, article.content)
+            if route:
+                article.category = self.route(article.topics, article.category)
+
+
+def load_keywords(path: Optional[Path] = None) -> Dict[NewsCategory, Dict[str, float]]:
+    """
+    DEFAULT_KEYWORDS 加上配置文件中的关键词
+
+    配置文件是一个 JSON 对象：分类值 -> {关键词: 权重}（或关键词列表，权重为 1）。
+
+    Args:
+        path: 配置文件路径，默认 CLASSIFIER_KEYWORDS_FILE
+    """
+    keywords = {category: dict(words) for category, words in DEFAULT_KEYWORDS.items()}
+    path = Path(path or Config.CLASSIFIER_KEYWORDS_FILE)
+    if path.exists():
+        for value, words in json.loads(path.read_text(encoding="utf-8")).items():
+            if isinstance(words, list):
+                words = dict.fromkeys(words, 1.0)
+            keywords.setdefault(NewsCategory(value), {}).update(words)
+    return keywords
+
+
+@lru_cache(maxsize=1)
+def default_classifier() -> TopicClassifier:
+    """所有获取器和预排序器共用的分类器（只编译一次）"""
+    return TopicClassifier(load_keywords())
@@ -1,6 +1,148 @@
 """去重处理器"""
-from typing import List
-from src.models.article import Article
+import hashlib
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from src.models.article import Article, NewsCategory
+from src.utils.normalize import normalize_title
+
+
+def _is_cjk(char: str) -> bool:
+    """是否为中日韩文字"""
+    return "぀" <= char <= "ヿ" or "㐀" <= char <= "鿿" or "가" <= char <= "힯"
+
+
+def shingles(text: str, size: int = 3, normalized: bool = False) -> FrozenSet[str]:
+    """
+    生成字符 n-gram 集合
+
+    以中日韩文字为主的文本使用 2-gram（中文标题通常很短），其余使用 size-gram。
+    normalized 为 True 表示 text 已经归一化（如 Article.norm_title）。
+    """
+    if not normalized:
+        text = normalize_title(text)
+    if not text:
+        return frozenset()
+
+    cjk_count = sum(1 for char in text if _is_cjk(char))
+    n = 2 if cjk_count * 2 >= len(text) else size
+    if len(text) <= n:
+        return frozenset([text])
+    return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard 相似度"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """
+    基于 MinHash + LSH 分桶的近重复索引
+
+    每篇文章只与落在同一个桶中的候选比较，整体复杂度近似线性。
+    归一化 URL 相同，或正文足够长且完全相同（转载）的文章直接判为重复。
+    """
+
+    # 正文至少这么多字符才参与完全相同判断（过短的正文多是通用简介）
+    MIN_CONTENT_CHARS = 200
+
+    def __init__(self, threshold: float, num_perm: int = 64, shingle_size: int = 3):
+        """
+        Args:
+            threshold: Jaccard 相似度阈值（0-1）
+            num_perm: MinHash 签名长度
+            shingle_size: 非中日韩文本的 n-gram 长度
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = self._optimal_bands(threshold, num_perm)
+
+        self._shingle_hashes: Dict[str, List[int]] = {}
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._shingles: List[FrozenSet[str]] = []
+        self._urls = set()
+        self._contents = set()
+
+    @staticmethod
+    def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """
+        选择 (bands, rows)，使 LSH 的近似阈值 (1/b)^(1/r) 不高于 threshold 且尽量接近，
+        宁可多出候选（随后精确校验），也不漏掉近重复
+        """
+        best = (num_perm, 1)
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            if (1 / bands) ** (1 / rows) <= threshold:
+                best = (bands, rows)
+        return best
+
+    def _signature(self, shingle_set: FrozenSet[str]) -> List[int]:
+        """
+        计算 MinHash 签名
+
+        每个 n-gram 用 SHAKE-128 一次生成 num_perm 个 32 位哈希值（相当于 num_perm 个独立哈希函数），
+        结果按 n-gram 缓存，逐列取最小值在 C 层完成。
+        """
+        rows = []
+        for shingle in shingle_set:
+            hashes = self._shingle_hashes.get(shingle)
+            if hashes is None:
+                digest = hashlib.shake_128(shingle.encode("utf-8")).digest(self.num_perm * 4)
+                hashes = self._shingle_hashes[shingle] = memoryview(digest).cast("I").tolist()
+            rows.append(hashes)
+        return list(map(min, zip(*rows)))
+
+    def add(self, article: Article) -> bool:
+        """
+        尝试加入文章
+
+        Returns:
+            True 表示是新文章并已加入索引；False 表示与已有文章重复
+        """
+        url_key = article.norm_url
+        if url_key in self._urls:
+            return False
+        content_key = article.content_hash if len(article.content or "") >= self.MIN_CONTENT_CHARS else None
+        if content_key is not None and content_key in self._contents:
+            return False
+
+        shingle_set = shingles(article.norm_title, self.shingle_size, normalized=True)
+        if not shingle_set:
+            self._remember(url_key, content_key)
+            return True
+
+        signature = self._signature(shingle_set)
+        band_keys = [
+            tuple(signature[i * self.rows:(i + 1) * self.rows])
+            for i in range(self.bands)
+        ]
+
+        # 只校验同桶候选
+        checked = set()
+        for band, key in enumerate(band_keys):
+            for candidate in self._buckets[band].get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if jaccard(shingle_set, self._shingles[candidate]) >= self.threshold:
+                    return False
+
+        doc_id = len(self._shingles)
+        self._shingles.append(shingle_set)
+        self._remember(url_key, content_key)
+        for band, key in enumerate(band_keys):
+            self._buckets[band][key].append(doc_id)
+        return True
+
+    def _remember(self, url_key: str, content_key: Optional[int]):
+        self._urls.add(url_key)
+        if content_key is not None:
+            self._contents.add(content_key)
 
 
 class DeduplicationProcessor:
@@ -9,10 +151,14 @@ class DeduplicationProcessor:
     def __init__(self, similarity_threshold: float = 0.85):
         """
         Args:
-            similarity_threshold: 相似度阈值（0-1）
+            similarity_threshold: 相似度阈值（0-1），标题字符 n-gram 的 Jaccard 相似度
         """
         self.similarity_threshold = similarity_threshold
 
+    def new_index(self) -> NearDuplicateIndex:
+        """创建一个空的近重复索引"""
+        return NearDuplicateIndex(self.similarity_threshold)
+
     def process(self, articles: List[Article]) -> List[Article]:
         """
         去除重复文章
@@ -23,33 +169,21 @@ class DeduplicationProcessor:
         Returns:
             去重后的文章列表
         """
-        seen_urls = set()
-        unique_articles = []
-
-        for article in articles:
-            # URL 去重
-            if article.url in seen_urls:
-                continue
-
-            # 标题去重（简单版本）
-            is_duplicate = False
-            for seen_article in unique_articles:
-                if self._is_similar(article.title, seen_article.title):
-                    is_duplicate = True
-                    break
+        index = self.new_index()
+        return [article for article in articles if index.add(article)]
 
-            if not is_duplicate:
-                unique_articles.append(article)
-                seen_urls.add(article.url)
-
-        return unique_articles
+    def process_all(self, categorized: Dict[NewsCategory, List[Article]]) -> Dict[NewsCategory, List[Article]]:
+        """
+        跨分类一次性去重，同一故事只保留最先出现的分类中的那篇
 
-    def _is_similar(self, title1: str, title2: str) -> bool:
-        """判断两个标题是否相似"""
-        # 简化版本：检查包含关系
-        title1_lower = title1.lower()
-        title2_lower = title2.lower()
+        Args:
+            categorized: 分类到文章列表的映射
 
-        # 如果一个标题包含另一个，认为相似
-        return (title1_lower in title2_lower or
-                title2_lower in title1_lower)
+        Returns:
+            去重后的映射
+        """
+        index = self.new_index()
+        return {
+            category: [article for article in articles if index.add(article)]
+            for category, articles in categorized.items()
+        }
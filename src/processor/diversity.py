@@ -0,0 +1,152 @@
+"""多样性选择 - 把报道同一事件的文章聚成一组，按最大边际相关性（MMR）选出最终的 Top K"""
+import re
+import unicodedata
+import zlib
+from typing import List, Optional, Tuple
+import numpy as np
+from src.config import Config
+from src.models.article import Article
+from src.utils.normalize import tokenize
+
+# 不区分事件的词：虚词和新闻标题中的常见动词（"X releases A" 与 "Y releases B" 不是同一事件）
+_STOP_WORDS = frozenset("""
+a an the and or but of to in on at for with by from as is are was were be been being it its this that these
+those what you your we our they their he she his her i me my us new says said say will would can could may
+might just now than then there here into over after before about up down out off more most less very also not
+no how why when who which while amid via per vs yet still all any some one two first last latest top
+launch launches launched unveil unveils unveiled release releases released announce announces announced
+debut debuts debuted introduce introduces introduced arrive arrives arrived reveal reveals revealed
+issue issues issued make makes made get gets got take takes took report reports reported show shows showed
+know need today week year
+""".split())
+
+# 首字母大写或含数字的词（人名、公司、产品、型号、金额），是区分事件的主要依据
+_ENTITY_RE = re.compile(r"\b(?:[A-Z][\w'-]*|\w*\d[\w'-]*)")
+
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+
+def _stem(token: str) -> str:
+    """去掉英文单词常见的词尾（launches / launched -> launch），其它词原样返回"""
+    if token.isascii() and token.isalpha():
+        for suffix in _SUFFIXES:
+            if len(token) > len(suffix) + 3 and token.endswith(suffix):
+                return token[:-len(suffix)]
+    return token
+
+
+class StorySelector:
+    """
+    多样性感知的 Top K 选择器
+
+    每篇候选文章表示为标题和导语的词袋向量（L2 归一化），一次矩阵乘法得到两两余弦相似度。
+    按评分从高到低，每篇尚未归组的文章与所有相似度不低于阈值的未归组文章组成一个故事，
+    评分最高的那篇作为代表；最后在各故事的代表中按 MMR 选出 top_k 篇：
+    每一步选 λ × 评分 − (1 − λ) × 与已选文章的最大相似度 最高的文章。
+    同一故事只有代表进入卡片，也只有代表需要生成摘要。
+    """
+
+    # 正文只取前这么多字符参与向量化（导语足以区分事件）
+    CONTENT_CHARS = 300
+
+    # 标题特征的权重（相对正文）
+    TITLE_WEIGHT = 2.0
+
+    # 专有名词和数字的权重（相对普通词）
+    ENTITY_WEIGHT = 3.0
+
+    # AI 评分的满分
+    MAX_SCORE = 10.0
+
+    def __init__(self, threshold: Optional[float] = None, diversity: Optional[float] = None):
+        """
+        Args:
+            threshold: 归为同一故事的余弦相似度阈值，默认 DIVERSITY_CLUSTER_THRESHOLD
+            diversity: MMR 中相似度惩罚的权重（1 − λ，0 表示只按评分），默认 DIVERSITY_WEIGHT
+        """
+        self.threshold = Config.DIVERSITY_CLUSTER_THRESHOLD if threshold is None else threshold
+        self.diversity = Config.DIVERSITY_WEIGHT if diversity is None else diversity
+
+    def features(self, text: str, weight: float) -> List[Tuple[str, float]]:
+        """
+        文本的特征及权重
+
+        分词后去掉停用词并归并词尾；拉丁文为单词，中日韩文字为字符二元组。
+        原文中首字母大写或含数字的词再乘以 ENTITY_WEIGHT。
+        """
+        text = unicodedata.normalize("NFKC", text or "")
+        entities = {token for match in _ENTITY_RE.findall(text) for token in tokenize(match)}
+        return [
+            (_stem(token), weight * self.ENTITY_WEIGHT if token in entities else weight)
+            for token in tokenize(text)
+            if token not in _STOP_WORDS
+        ]
+
+    def vectorize(self, articles: List[Article]) -> np.ndarray:
+        """
+        词袋向量（每行一篇文章，L2 归一化）
+
+        特征用 CRC32 哈希后按候选集中实际出现的哈希值编号，列数等于不同特征的数量，
+        不会因为取模把不相关的特征合并到同一列。
+        """
+        rows, hashes, weights = [], [], []
+        for row, article in enumerate(articles):
+            features = self.features(article.title, self.TITLE_WEIGHT)
+            features += self.features((article.content or "")[:self.CONTENT_CHARS], 1.0)
+            for feature, weight in features:
+                rows.append(row)
+                hashes.append(zlib.crc32(feature.encode("utf-8")))
+                weights.append(weight)
+
+        columns, inverse = np.unique(np.asarray(hashes, dtype=np.int64), return_inverse=True)
+        vectors = np.zeros((len(articles), max(len(columns), 1)), dtype=np.float32)
+        np.add.at(vectors, (np.asarray(rows, dtype=np.int64), inverse), np.asarray(weights, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def cluster(self, similarities: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        按评分从高到低贪心归组
+
+        Returns:
+            每篇文章所属故事的代表（文章下标）
+        """
+        labels = np.full(len(scores), -1, dtype=np.int64)
+        for i in np.argsort(-scores, kind="stable"):
+            if labels[i] < 0:
+                labels[(labels < 0) & (similarities[i] >= self.threshold)] = i
+                labels[i] = i
+        return labels
+
+    def select(self, articles: List[Article], top_k: int) -> List[Article]:
+        """
+        选出 top_k 篇互不重复、兼顾评分和多样性的文章
+
+        Args:
+            articles: 已评分的候选文章
+            top_k: 需要的文章数
+
+        Returns:
+            按选择顺序排列的文章（各故事的代表，可能少于 top_k 篇）
+        """
+        if not articles:
+            return []
+
+        vectors = self.vectorize(articles)
+        similarities = vectors @ vectors.T
+        scores = np.array([article.score for article in articles], dtype=np.float32)
+
+        representatives = np.flatnonzero(self.cluster(similarities, scores) == np.arange(len(articles)))
+        relevance = scores[representatives] / self.MAX_SCORE
+        similarities = similarities[np.ix_(representatives, representatives)]
+
+        redundancy = np.zeros(len(representatives), dtype=np.float32)
+        available = np.ones(len(representatives), dtype=bool)
+        selected = []
+        for _ in range(min(top_k, len(representatives))):
+            mmr = (1 - self.diversity) * relevance - self.diversity * redundancy
+            best = int(np.argmax(np.where(available, mmr, -np.inf)))
+            selected.append(articles[representatives[best]])
+            available[best] = False
+            redundancy = np.maximum(redundancy, similarities[:, best])
+        return selected
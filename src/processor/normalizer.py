@@ -0,0 +1,129 @@
+"""内容归一化 - 在调用 LLM 之前清洗 RSS 内容并按 token 预算截断"""
+import html
+import re
+from html.parser import HTMLParser
+from typing import List
+from src.models.article import Article
+
+_CJK_RE = re.compile(r"[぀-ヿ㐀-鿿가-힯＀-￯]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_TAG_HINT_RE = re.compile(r"<[a-zA-Z!/]")
+
+# 常见的 feed 模板文字
+BOILERPLATE_PATTERNS = [
+    re.compile(r"The post .{0,300}? appeared first on .{0,100}?\.?$", re.I),
+    re.compile(r"(Continue reading|Read more|Read the full story|Full story)[.…\s]*(»|→)?\s*$", re.I),
+    re.compile(r"(阅读全文|查看原文|点击查看|点击阅读原文)[>》…。.\s]*$"),
+    re.compile(r"^arXiv:\S+\s+Announce Type:\s*\S+\s*", re.I),
+    re.compile(r"^Abstract:\s*", re.I),
+    re.compile(r"Article URL:\s*\S+\s*Comments URL:\s*\S+\s*Points:\s*\d+\s*# Comments:\s*\d+", re.I),
+    re.compile(r"本文(来自|转载自|经授权转载自).{0,60}$"),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数：中日韩字符约 1 token/字，其余约 4 字符/token"""
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    按 token 预算截断文本（与 estimate_tokens 使用相同的估算规则）
+
+    Args:
+        text: 文本
+        budget: token 预算
+
+    Returns:
+        截断后的文本，发生截断时以省略号结尾
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+
+    used = 0.0
+    for i, char in enumerate(text):
+        used += 1.0 if _CJK_RE.match(char) else 0.25
+        if used > budget:
+            cut = text[:i]
+            # 尽量在空白处截断，避免切断英文单词
+            space = cut.rfind(" ")
+            if space > len(cut) * 0.8:
+                cut = cut[:space]
+            return cut.rstrip() + "…"
+    return text
+
+
+class _TextExtractor(HTMLParser):
+    """提取 HTML 中的可见文本"""
+
+    SKIP_TAGS = {"script", "style", "iframe", "noscript", "svg", "figure", "figcaption"}
+    BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "blockquote", "section"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(content: str) -> str:
+    """HTML 转纯文本（不含标签的内容只做实体解码）"""
+    if not content:
+        return ""
+    if not _TAG_HINT_RE.search(content):
+        return html.unescape(content)
+
+    extractor = _TextExtractor()
+    try:
+        extractor.feed(content)
+        extractor.close()
+    except Exception:
+        return re.sub(r"<[^>]+>", " ", html.unescape(content))
+    return "".join(extractor.parts)
+
+
+class ContentNormalizer:
+    """内容归一化处理器"""
+
+    def normalize_text(self, content: str) -> str:
+        """HTML 转文本、去除模板文字、合并空白"""
+        text = _WHITESPACE_RE.sub(" ", html_to_text(content)).strip()
+        for pattern in BOILERPLATE_PATTERNS:
+            text = pattern.sub("", text).strip()
+        return text
+
+    def process(self, articles: List[Article]) -> List[Article]:
+        """
+        归一化文章的标题和内容
+
+        Args:
+            articles: 文章列表
+
+        Returns:
+            原列表（文章被原地修改）
+        """
+        for article in articles:
+            # 只在内容变化时赋值，避免重新计算文章的归一化键
+            title = _WHITESPACE_RE.sub(" ", html.unescape(article.title or "")).strip()
+            if title != article.title:
+                article.title = title
+            content = self.normalize_text(article.content or "")
+            if content != article.content:
+                article.content = content
+        return articles
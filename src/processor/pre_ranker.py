@@ -0,0 +1,165 @@
+"""本地预排序 - 在调用 LLM 之前缩小候选集"""
+import math
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from src.models.article import Article, NewsCategory
+from src.config import Config
+from src.processor.classifier import TopicClassifier, default_classifier
+from src.utils.normalize import tokenize
+
+
+class PreRanker:
+    """
+    本地预排序器
+
+    综合时效性、来源权重、社区热度、关键词命中和新颖度（与近期推送标题越相似越低），
+    每个分类只保留 multiplier × top_k 篇送入 LLM 评分，已推送过的事件的后续报道排在后面。
+    """
+
+    # 各信号的权重
+    WEIGHTS = {
+        "recency": 0.30,
+        "source": 0.15,
+        "points": 0.20,
+        "keywords": 0.20,
+        "novelty": 0.15,
+    }
+
+    # 来源权重（未列出的来源为 1.0）
+    SOURCE_WEIGHTS = {
+        "MIT Tech Review AI": 1.2,
+        "财新网": 1.2,
+        "FT 中文": 1.2,
+        "The Verge": 1.0,
+        "36氪": 1.0,
+        "Hacker News": 1.0,
+        "arXiv CS.AI": 0.8,
+    }
+
+    # 时效性半衰期（小时）
+    RECENCY_HALF_LIFE = 24.0
+
+    # HN 分数的饱和点
+    POINTS_SATURATION = 500
+
+    def __init__(self, multiplier: Optional[int] = None, reference_titles: Optional[List[str]] = None,
+                 classifier: Optional[TopicClassifier] = None):
+        """
+        Args:
+            multiplier: 每个分类保留 multiplier × top_k 篇，0 表示不做预排序
+            reference_titles: 近期推送过的标题，与其相似的文章新颖度低
+            classifier: 主题分类器，文章没有 topics 时用它计算关键词分数
+        """
+        self.multiplier = Config.PRE_RANK_MULTIPLIER if multiplier is None else multiplier
+        self.reference_titles = reference_titles or []
+        self.classifier = classifier or default_classifier()
+        self._max_source_weight = max(self.SOURCE_WEIGHTS.values())
+
+    def rank(self, articles: List[Article], top_k: int, category: Optional[NewsCategory] = None,
+             now: Optional[datetime] = None) -> List[Article]:
+        """
+        预排序并截断候选集
+
+        已有评分（来自历史运行或缓存）的文章不占用名额，原样保留。
+
+        Args:
+            articles: 文章列表
+            top_k: 最终需要的文章数
+            category: 文章所属分类，默认取第一篇文章的分类
+            now: 当前时间（不带时区的 UTC，与 published_at 一致；便于测试）
+
+        Returns:
+            按预排序分数降序的候选文章
+        """
+        limit = self.multiplier * top_k
+        unscored = [article for article in articles if article.score <= 0]
+        if self.multiplier <= 0 or len(unscored) <= limit:
+            return articles
+
+        category = category or articles[0].category
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        similarities = self._similarities(unscored)
+
+        ranked = sorted(
+            zip(unscored, similarities),
+            key=lambda pair: self.score(pair[0], category, now, pair[1]),
+            reverse=True
+        )
+        return [article for article in articles if article.score > 0] + [
+            article for article, _ in ranked[:limit]
+        ]
+
+    def score(self, article: Article, category: NewsCategory, now: datetime,
+              similarity: float = 0.0) -> float:
+        """
+        计算单篇文章的预排序分数（0-1）
+
+        Args:
+            similarity: 与近期推送标题的最大相似度（新颖度为 1 − similarity）
+        """
+        signals = {
+            "recency": self._recency(article, now),
+            "source": self.SOURCE_WEIGHTS.get(article.source, 1.0) / self._max_source_weight,
+            "points": self._points(article),
+            "keywords": self._keyword_hits(article, category),
+            "novelty": 1.0 - similarity,
+        }
+        return sum(self.WEIGHTS[name] * value for name, value in signals.items())
+
+    def _recency(self, article: Article, now: datetime) -> float:
+        """按半衰期衰减的时效性，缺少发布时间时取中间值"""
+        if article.published_at is None:
+            return 0.5
+        age_hours = max((now - article.published_at).total_seconds() / 3600, 0.0)
+        return 0.5 ** (age_hours / self.RECENCY_HALF_LIFE)
+
+    def _points(self, article: Article) -> float:
+        """对数缩放的社区热度"""
+        if not article.points or article.points <= 0:
+            return 0.0
+        return min(math.log1p(article.points) / math.log1p(self.POINTS_SATURATION), 1.0)
+
+    def _keyword_hits(self, article: Article, category: NewsCategory) -> float:
+        """分类关键词的匹配分数（3 分即满分），获取时已计算的直接使用"""
+        topics = article.topics or self.classifier.classify(article.title, article.content)
+        return min(topics.get(category, 0.0) / 3, 1.0)
+
+    def _similarities(self, articles: List[Article]) -> List[float]:
+        """每篇文章与近期推送标题的最大 TF-IDF 余弦相似度（与任意一条已推送的标题相近即视为重复报道）"""
+        if not self.reference_titles:
+            return [0.0] * len(articles)
+
+        docs = [tokenize(article.title) for article in articles]
+        references = [tokenize(title) for title in self.reference_titles]
+
+        # 文档频率
+        df = Counter()
+        for tokens in docs + references:
+            df.update(set(tokens))
+        total = len(docs) + len(references)
+        idf = {token: math.log((1 + total) / (1 + count)) + 1 for token, count in df.items()}
+
+        # 倒排索引：词 -> [(参考标题下标, 权重)]，每篇文章只与有共同词的参考标题计算
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for index, tokens in enumerate(references):
+            for token, weight in self._normalize(Counter(tokens), idf).items():
+                postings.setdefault(token, []).append((index, weight))
+
+        similarities = []
+        for tokens in docs:
+            dots = Counter()
+            for token, weight in self._normalize(Counter(tokens), idf).items():
+                for index, reference_weight in postings.get(token, ()):
+                    dots[index] += weight * reference_weight
+            similarities.append(min(max(dots.values(), default=0.0), 1.0))
+        return similarities
+
+    @staticmethod
+    def _normalize(counts: Counter, idf: Dict[str, float]) -> Dict[str, float]:
+        """TF-IDF 加权并做 L2 归一化"""
+        vector = {token: count * idf[token] for token, count in counts.items()}
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if norm == 0:
+            return {}
+        return {token: value / norm for token, value in vector.items()}
@@ -0,0 +1,123 @@
+"""定时调度 - 常驻进程模式下每天在 SCHEDULE_TIME 及额外时间点运行任务"""
+import asyncio
+import signal
+from datetime import datetime, time, timedelta
+from typing import Awaitable, Callable, Iterable, List, Optional
+from src.config import Config
+
+
+def parse_times(value: str) -> List[time]:
+    """
+    解析逗号分隔的 HH:MM 时间点
+
+    Raises:
+        ValueError: 格式不正确
+    """
+    times = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            times.append(datetime.strptime(part, "%H:%M").time())
+        except ValueError:
+            raise ValueError(f"无效的时间点: {part}（应为 HH:MM）")
+    return times
+
+
+class DailySchedule:
+    """每天固定时间点的调度表"""
+
+    def __init__(self, times: Iterable[time]):
+        self.times = sorted(set(times))
+        if not self.times:
+            raise ValueError("调度表中没有任何时间点")
+
+    @classmethod
+    def from_config(cls) -> "DailySchedule":
+        """由 SCHEDULE_TIME 和 SCHEDULE_EXTRA_TIMES 构建"""
+        return cls(parse_times(Config.SCHEDULE_TIME) + parse_times(Config.SCHEDULE_EXTRA_TIMES))
+
+    def next_run(self, now: Optional[datetime] = None) -> datetime:
+        """now 之后的下一个运行时间"""
+        now = now or datetime.now()
+        for slot in self.times:
+            candidate = datetime.combine(now.date(), slot)
+            if candidate > now:
+                return candidate
+        return datetime.combine(now.date() + timedelta(days=1), self.times[0])
+
+    def __str__(self) -> str:
+        return ", ".join(slot.strftime("%H:%M") for slot in self.times)
+
+
+class Daemon:
+    """
+    常驻进程：按调度表反复运行任务
+
+    任务在同一个事件循环中运行，任务持有的客户端和缓存在多轮之间保持可用。
+    收到 SIGINT/SIGTERM 后不再开始新的一轮；正在运行的一轮会执行完毕后再退出。
+    """
+
+    # 等待期间最长的单次休眠（秒），系统时间调整或休眠唤醒后能及时重新计算
+    MAX_SLEEP = 60
+
+    def __init__(self, job: Callable[[], Awaitable[None]], schedule: DailySchedule):
+        """
+        Args:
+            job: 每轮运行的协程函数，异常由调用方自行处理
+            schedule: 调度表
+        """
+        self.job = job
+        self.schedule = schedule
+        self._stop: Optional[asyncio.Event] = None
+
+    def stop(self):
+        """请求退出（可在事件循环线程中调用）"""
+        if self._stop is not None and not self._stop.is_set():
+            print("\n⏹ 收到退出信号，当前任务结束后退出")
+            self._stop.set()
+
+    def _install_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> List[int]:
+        installed = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows 的事件循环不支持 add_signal_handler
+                signal.signal(sig, lambda *_: loop.call_soon_threadsafe(self.stop))
+            else:
+                installed.append(sig)
+        return installed
+
+    async def serve(self):
+        """运行直到收到退出信号"""
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        installed = self._install_signal_handlers(loop)
+        print(f"⏰ 常驻模式已启动，运行时间: {self.schedule}")
+
+        try:
+            while not self._stop.is_set():
+                next_run = self.schedule.next_run()
+                print(f"⏳ 下次运行: {next_run.strftime('%Y-%m-%d %H:%M')}")
+                if not await self._sleep_until(next_run):
+                    break
+                await self.job()
+        finally:
+            for sig in installed:
+                loop.remove_signal_handler(sig)
+
+        print("常驻进程已退出")
+
+    async def _sleep_until(self, when: datetime) -> bool:
+        """等待到 when，期间收到退出信号返回 False"""
+        while True:
+            remaining = (when - datetime.now()).total_seconds()
+            if remaining <= 0:
+                return True
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=min(remaining, self.MAX_SLEEP))
+                return False
+            except asyncio.TimeoutError:
+                pass
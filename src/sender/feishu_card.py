@@ -1,9 +1,100 @@
 """飞书卡片推送"""
-from src.feishu_bot import FeishuBot
-from typing import List
+import json
+from src.feishu_bot import FeishuBot, Webhook, parse_webhooks
+from typing import Dict, List, Optional
 from datetime import datetime
 from src.models.article import Article, ProcessedArticle, NewsCategory
+from src.models.subscription import Subscription, group_subscriptions
 from src.config import Config
+from src.utils.metrics import metrics
+
+
+def _encode(value) -> bytes:
+    """紧凑的 UTF-8 JSON（中文不转义，体积约为转义的一半）"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def truncate_bytes(text: str, max_bytes: int) -> str:
+    """
+    按 UTF-8 字节数截断文本（不切断多字节字符）
+
+    Args:
+        text: 文本
+        max_bytes: 最大字节数（含省略号）
+
+    Returns:
+        截断后的文本，发生截断时以省略号结尾
+    """
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    ellipsis = "…".encode("utf-8")
+    return data[:max(max_bytes - len(ellipsis), 0)].decode("utf-8", errors="ignore").rstrip() + "…"
+
+
+class _CardPacker:
+    """
+    按字节和元素数上限把元素装入若干张卡片
+
+    每个元素只序列化一次，卡片大小按已序列化元素的字节数累加，
+    最终的消息体直接拼接这些字节，不再整体序列化。
+    """
+
+    # 卡片标题中的页码等可变部分预留的字节数
+    HEADER_RESERVE = 64
+
+    def __init__(self, title: str, max_bytes: int, max_elements: int):
+        self.title = title
+        self.max_elements = max_elements
+        prefix, suffix = self._envelope(title)
+        self.budget = max_bytes - len(prefix) - len(suffix) - self.HEADER_RESERVE
+        self.cards: List[List[bytes]] = [[]]
+        self._used = 0
+
+    @staticmethod
+    def _envelope(title: str):
+        """消息体中元素列表之前和之后的部分"""
+        data = _encode({
+            "msg_type": "interactive",
+            "card": {
+                "config": {"wide_screen_mode": True},
+                "header": {"title": {"content": title, "tag": "plain_text"}, "template": "blue"},
+                "elements": "\0",
+            },
+        })
+        prefix, suffix = data.split(_encode("\0"))
+        return prefix + b"[", b"]" + suffix
+
+    def fits(self, size: int, count: int = 1) -> bool:
+        """当前卡片能否再放入 count 个、共 size 字节的元素"""
+        current = self.cards[-1]
+        separators = count if current else count - 1
+        return (self._used + size + separators <= self.budget
+                and len(current) + count <= self.max_elements)
+
+    def fits_empty(self, size: int, count: int) -> bool:
+        """一张空卡片能否放下 count 个、共 size 字节的元素"""
+        return size + count - 1 <= self.budget and count <= self.max_elements
+
+    def add(self, element: bytes):
+        current = self.cards[-1]
+        self._used += len(element) + (1 if current else 0)
+        current.append(element)
+
+    def new_card(self):
+        if self.cards[-1]:
+            self.cards.append([])
+            self._used = 0
+
+    def bodies(self) -> List[bytes]:
+        """生成每张卡片的消息体（多张时标题带页码）"""
+        cards = [card for card in self.cards if card]
+        bodies = []
+        for i, card in enumerate(cards, 1):
+            title = self.title if len(cards) == 1 else f"{self.title}（{i}/{len(cards)}）"
+            prefix, suffix = self._envelope(title)
+            bodies.append(prefix + b",".join(card) + suffix)
+        return bodies
 
 
 class FeishuCardSender:
@@ -16,19 +107,49 @@ class FeishuCardSender:
         NewsCategory.TECH: "💻 科技资讯"
     }
 
-    def __init__(self):
-        """初始化"""
-        self.bot = FeishuBot(Config.FEISHU_WEBHOOK)
+    # 卡片标题
+    TITLE = "每日科技资讯"
+
+    # 单篇文章的标题和链接的字节上限（摘要的上限见 FEISHU_SUMMARY_MAX_BYTES）
+    TITLE_MAX_BYTES = 300
+    URL_MAX_BYTES = 1000
+
+    def __init__(self, webhooks: Optional[List[Webhook]] = None):
+        """
+        初始化
+
+        Args:
+            webhooks: 推送目标，默认为 FEISHU_WEBHOOK 和 FEISHU_WEBHOOKS
+        """
+        if webhooks is None:
+            webhooks = parse_webhooks(Config.FEISHU_WEBHOOKS)
+            if Config.FEISHU_WEBHOOK:
+                webhooks.insert(0, Webhook(Config.FEISHU_WEBHOOK))
+
+        self.bot = FeishuBot(
+            webhooks=webhooks,
+            timeout=Config.FEISHU_TIMEOUT,
+            max_retries=Config.FEISHU_MAX_RETRIES,
+            backoff_base=Config.FEISHU_BACKOFF_BASE,
+            rate_per_minute=Config.FEISHU_RATE_PER_MINUTE,
+            burst=Config.FEISHU_BURST,
+            workers=Config.FEISHU_SEND_WORKERS
+        )
+        self.max_bytes = Config.FEISHU_CARD_MAX_BYTES
+        self.max_elements = Config.FEISHU_CARD_MAX_ELEMENTS
+        self.summary_max_bytes = Config.FEISHU_SUMMARY_MAX_BYTES
 
     def send_daily_news(self, articles: List[ProcessedArticle]) -> bool:
         """
-        发送每日新闻卡片
+        发送每日新闻卡片到所有 Webhook
+
+        内容超出飞书的大小或元素数限制时自动拆成多张卡片依次发送。
 
         Args:
             articles: 处理后的文章列表（已按分类和排名排序）
 
         Returns:
-            是否发送成功
+            是否至少送达一个 Webhook（各 Webhook 的结果会逐个打印）
         """
         # 按分类整理
         categorized = {
@@ -40,83 +161,173 @@ class FeishuCardSender:
         for item in articles:
             categorized[item.category].append(item)
 
-        # 构建卡片内容
-        card = self._build_card(categorized)
+        # 构建卡片内容（已序列化的消息体）
+        bodies = self._build_cards(categorized)
+        if len(bodies) > 1:
+            print(f"  - 内容超出单张卡片限制，拆分为 {len(bodies)} 张卡片")
 
-        # 发送
+        # 发送（每个 Webhook 按顺序逐张发送，不同 Webhook 并发）
         try:
-            result = self.bot.send_card(card)
-            return result.get("success", False)
+            result = self.bot.send_payloads([(webhook, bodies) for webhook in self.bot.webhooks])
         except Exception as e:
             print(f"× 发送飞书消息失败: {e}")
             return False
 
-    def _build_card(self, categorized: dict) -> dict:
-        """构建飞书消息卡片"""
-        elements = []
+        return self._report(result) > 0
+
+    def send_subscriptions(self, articles: List[ProcessedArticle], subscriptions: List[Subscription],
+                           delivered_to: Optional[set] = None) -> List[ProcessedArticle]:
+        """
+        按订阅推送个性化日报
+
+        选择条件相同的订阅者归为一组，每组只选择和渲染一次；不同的选择条件选出相同内容时
+        复用已渲染的卡片。所有消息在一次并发推送中发出。
+
+        Args:
+            articles: 处理后的文章列表（已按分类和排名排序）
+            subscriptions: 订阅列表
+            delivered_to: 传入时把送达成功的 Webhook 名称加入其中
+
+        Returns:
+            至少送达一个订阅者的文章
+        """
+        rendered: Dict[tuple, List[bytes]] = {}
+        plan, contents = [], {}
+
+        for selection, group in group_subscriptions(subscriptions).items():
+            categorized = group[0].select(articles)
+            # 以实际选出的内容作为渲染缓存的键
+            key = tuple(
+                (category.value, tuple(item.article.norm_url for item in items))
+                for category, items in categorized.items()
+            )
+            if key not in rendered:
+                rendered[key] = self._build_cards(categorized)
+            for subscription in group:
+                plan.append((subscription.webhook, rendered[key]))
+                contents[subscription.webhook.name] = categorized
+
+        print(f"  - 订阅: {len(subscriptions)} 个订阅者，{len(rendered)} 种卡片")
+
+        try:
+            result = self.bot.send_payloads(plan)
+        except Exception as e:
+            print(f"× 发送飞书消息失败: {e}")
+            return []
+
+        self._report(result)
+
+        delivered: Dict[Article, ProcessedArticle] = {}
+        for name, item in result["results"].items():
+            if item["success"]:
+                if delivered_to is not None:
+                    delivered_to.add(name)
+                for items in contents[name].values():
+                    for processed in items:
+                        delivered.setdefault(processed.article, processed)
+        return list(delivered.values())
+
+    def _report(self, result: dict) -> int:
+        """打印并记录每个 Webhook 的推送结果，返回成功送达的 Webhook 数"""
+        for name, item in result["results"].items():
+            metrics.record_send(name, item["seconds"], item["success"], item.get("error") or "", item["attempts"])
+            if not item["success"]:
+                print(f"× 推送到 {name} 失败（尝试 {item['attempts']} 次）: {item['error']}")
+
+        print(f"  - 飞书推送: 成功 {result['delivered']} 个，失败 {result['failed']} 个")
+        return result["delivered"]
+
+    def _build_cards(self, categorized: dict) -> List[bytes]:
+        """
+        构建飞书消息卡片
+
+        全部内容能放进一张卡片时只生成一张；否则按分类换卡片，单个分类仍放不下时
+        拆到多张卡片（后续卡片的分类标题带"续"）。
+
+        Returns:
+            已序列化的消息体列表
+        """
+        packer = _CardPacker(self.TITLE, self.max_bytes, self.max_elements)
 
         # 标题和日期
         today = datetime.now().strftime("%Y-%m-%d")
         weekday = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"][datetime.now().weekday()]
-
-        elements.append({
-            "tag": "div",
-            "text": {
-                "content": f"📰 每日科技资讯日报 | {today} {weekday}",
-                "tag": "lark_md"
-            }
-        })
+        packer.add(self._text_element(f"📰 每日科技资讯日报 | {today} {weekday}"))
 
         # 每个分类
+        hr = _encode({"tag": "hr"})
         for category, articles in categorized.items():
             if not articles:
                 continue
 
-            # 分类标题
-            elements.append({
-                "tag": "hr"
-            })
-
-            elements.append({
-                "tag": "div",
-                "text": {
-                    "content": f"**{self.CATEGORY_NAMES[category]}（Top {len(articles)}）**",
-                    "tag": "lark_md"
-                }
-            })
-
-            # 文章列表
-            for i, item in enumerate(articles[:10], 1):
-                article = item.article
-                summary = article.summary or article.title
-
-                elements.append({
-                    "tag": "div",
-                    "text": {
-                        "content": f"{i}. **{article.title}**\n   ▸ {summary}\n   ▸ {article.url}",
-                        "tag": "lark_md"
-                    }
-                })
+            name = self.CATEGORY_NAMES[category]
+            heading = self._text_element(f"**{name}（Top {len(articles)}）**")
+            items = [
+                self._article_element(i, item.article, packer.budget)
+                for i, item in enumerate(articles, 1)
+            ]
+
+            # 整个分类能放进当前卡片就放；放不下但能放进一张新卡片时换卡片
+            section = [hr, heading] + items
+            if not packer.fits(sum(map(len, section)), len(section)):
+                if packer.fits_empty(sum(map(len, section[1:])), len(section) - 1):
+                    packer.new_card()
+                    section = section[1:]
+                else:
+                    section = None
+
+            if section is not None:
+                for element in section:
+                    packer.add(element)
+                continue
+
+            # 单个分类放不下一张卡片，从当前卡片开始逐篇拆分
+            if not packer.fits(len(hr) + len(heading), 2):
+                packer.new_card()
+            else:
+                packer.add(hr)
+            packer.add(heading)
+            continued = self._text_element(f"**{name}（续）**")
+            for element in items:
+                if not packer.fits(len(element)):
+                    packer.new_card()
+                    packer.add(continued)
+                packer.add(element)
 
         # 底部信息
         total = sum(len(articles) for articles in categorized.values())
-        elements.append({"tag": "hr"})
-        elements.append({
-            "tag": "div",
-            "text": {
-                "content": f"⚡ 今日处理：{total} 篇 | 📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                "tag": "lark_md"
-            }
-        })
+        footer = [hr, self._text_element(
+            f"⚡ 今日处理：{total} 篇 | 📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        )]
+        if not packer.fits(sum(map(len, footer)), len(footer)):
+            packer.new_card()
+            footer = footer[1:]
+        for element in footer:
+            packer.add(element)
 
-        # 构建卡片
-        card = {
-            "config": {"wide_screen_mode": True},
-            "header": {
-                "title": {"content": "每日科技资讯", "tag": "plain_text"},
-                "template": "blue"
-            },
-            "elements": elements
-        }
+        return packer.bodies()
+
+    @staticmethod
+    def _text_element(content: str) -> bytes:
+        return _encode({"tag": "div", "text": {"content": content, "tag": "lark_md"}})
+
+    def _article_element(self, rank: int, article: Article, budget: int) -> bytes:
+        """
+        单篇文章的元素：摘要按字节预算截断；整体仍超出单张卡片时依次去掉摘要、截断标题和链接
+        """
+        title = truncate_bytes(article.title, self.TITLE_MAX_BYTES)
+        summary = truncate_bytes(article.summary or article.title, self.summary_max_bytes)
+        url = article.url
+
+        element = self._text_element(f"{rank}. **{title}**\n   ▸ {summary}\n   ▸ {url}")
+        if len(element) <= budget:
+            return element
+
+        url = truncate_bytes(url, self.URL_MAX_BYTES)
+        element = self._text_element(f"{rank}. **{title}**\n   ▸ {url}")
+        if len(element) <= budget:
+            return element
 
-        return card
+        # 元素的 JSON 转义会让体积变大，按一半的预算截断保证能放下
+        limit = max(budget // 2 - 64, 16)
+        return self._text_element(f"{rank}. **{truncate_bytes(title, limit // 2)}**\n   ▸ {truncate_bytes(url, limit // 2)}")
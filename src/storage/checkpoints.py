@@ -0,0 +1,208 @@
+"""运行检查点 - 每轮运行的各阶段结果，用于失败后继续或重放"""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable, List, Optional
+from src.config import Config
+from src.models.article import Article, NewsCategory
+
+# 流水线各阶段的检查点，按先后顺序
+STAGES = ("fetched", "deduped", "scored", "summarized", "rendered")
+
+
+class RunCheckpoint:
+    """一轮运行的检查点，由 CheckpointStore 创建或打开"""
+
+    def __init__(self, store: "CheckpointStore", run_id: str, categories: List[NewsCategory],
+                 delivered: Iterable[str] = (), finished: bool = False, replay_of: Optional[str] = None):
+        self.store = store
+        self.run_id = run_id
+        self.categories = categories
+        self.replay_of = replay_of  # 重放的原运行 ID（不是重放时为 None）
+        self.delivered = set(delivered)  # 已送达的 Webhook 名称
+        self.finished = finished
+
+    def save(self, stage: str, category: NewsCategory, articles: List[Article]):
+        """保存某个分类完成某个阶段后的文章（含评分和摘要）"""
+        self.store._save(self.run_id, stage, category, articles)
+
+    def load(self, stage: str, category: NewsCategory) -> Optional[List[Article]]:
+        """读取某个分类某个阶段的文章，没有检查点时返回 None"""
+        return self.store._load(self.run_id, stage, category)
+
+    def latest(self, category: NewsCategory, stages: Iterable[str] = STAGES) -> Optional[str]:
+        """某个分类已完成的最后一个阶段（限于 stages 之内）"""
+        saved = self.store._stages(self.run_id, category)
+        for stage in reversed(STAGES):
+            if stage in saved and stage in stages:
+                return stage
+        return None
+
+    def mark_delivered(self, names: Iterable[str]):
+        """记录已送达的 Webhook，继续运行时不再重复推送"""
+        self.delivered.update(names)
+        self.store._update(self.run_id, delivered=sorted(self.delivered))
+
+    def finish(self):
+        """标记本轮已全部推送完成"""
+        self.finished = True
+        self.store._update(self.run_id, finished=True)
+
+
+class CheckpointStore:
+    """
+    持久化的运行检查点
+
+    每轮运行有一个 run id（启动时间），流水线每个分类完成一个阶段后保存该阶段的文章（压缩的 JSON），
+    推送后记录已送达的 Webhook。只保留最近 CHECKPOINT_KEEP_RUNS 轮。
+    """
+
+    def __init__(self, path: Optional[Path] = None, keep_runs: Optional[int] = None):
+        """
+        Args:
+            path: SQLite 数据库路径，默认 DATA_DIR/checkpoints.db
+            keep_runs: 保留的运行数
+        """
+        self.path = Path(path or Config.DATA_DIR / "checkpoints.db")
+        self.keep_runs = keep_runs or Config.CHECKPOINT_KEEP_RUNS
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                categories TEXT NOT NULL,
+                replay_of TEXT,
+                delivered TEXT NOT NULL DEFAULT '[]',
+                finished INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS stages (
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                category TEXT NOT NULL,
+                articles BLOB NOT NULL,
+                saved_at REAL NOT NULL,
+                PRIMARY KEY (run_id, stage, category)
+            );
+        """)
+        self._conn.commit()
+
+    def create(self, categories: List[NewsCategory], replay_of: Optional[str] = None) -> RunCheckpoint:
+        """开始新的一轮，并清理过旧的运行"""
+        now = time.time()
+        run_id = base = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        with self._lock:
+            suffix = 1
+            while self._conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone():
+                suffix += 1
+                run_id = f"{base}-{suffix}"
+            self._conn.execute(
+                "INSERT INTO runs (run_id, created_at, categories, replay_of) VALUES (?, ?, ?, ?)",
+                (run_id, now, json.dumps([category.value for category in categories]), replay_of)
+            )
+            self._conn.commit()
+        self.prune()
+        return RunCheckpoint(self, run_id, list(categories), replay_of=replay_of)
+
+    def open(self, run_id: str) -> RunCheckpoint:
+        """
+        打开已有的运行
+
+        Raises:
+            ValueError: 没有这个运行
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT categories, delivered, finished, replay_of FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"没有找到运行 {run_id}")
+        categories = [NewsCategory(value) for value in json.loads(row[0])]
+        return RunCheckpoint(self, run_id, categories, json.loads(row[1]), bool(row[2]), row[3])
+
+    def latest(self) -> Optional[RunCheckpoint]:
+        """最近的一轮运行"""
+        with self._lock:
+            row = self._conn.execute("SELECT run_id FROM runs ORDER BY created_at DESC LIMIT 1").fetchone()
+        return self.open(row[0]) if row else None
+
+    def replay(self, run_id: str, stage: str = STAGES[0]) -> RunCheckpoint:
+        """
+        以某轮运行某个阶段的结果开始新的一轮（原运行不变），新一轮只包含有该阶段检查点的分类
+
+        Raises:
+            ValueError: 没有这个运行，或该运行没有这个阶段的检查点
+        """
+        if stage not in STAGES:
+            raise ValueError(f"未知的阶段: {stage}")
+        source = self.open(run_id)
+        categories = [category for category in source.categories if stage in self._stages(run_id, category)]
+        if not categories:
+            raise ValueError(f"运行 {run_id} 没有 {stage} 阶段的检查点")
+
+        run = self.create(categories, replay_of=run_id)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO stages SELECT ?, stage, category, articles, saved_at FROM stages "
+                "WHERE run_id = ? AND stage = ?",
+                (run.run_id, run_id, stage)
+            )
+            self._conn.commit()
+        return run
+
+    def prune(self) -> int:
+        """只保留最近 keep_runs 轮，返回删除的运行数"""
+        with self._lock:
+            stale = [row[0] for row in self._conn.execute(
+                "SELECT run_id FROM runs ORDER BY created_at DESC LIMIT -1 OFFSET ?", (self.keep_runs,)
+            )]
+            for run_id in stale:
+                self._conn.execute("DELETE FROM stages WHERE run_id = ?", (run_id,))
+                self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self._conn.commit()
+        return len(stale)
+
+    def _save(self, run_id: str, stage: str, category: NewsCategory, articles: List[Article]):
+        data = zlib.compress(json.dumps(
+            [article.to_dict() for article in articles], ensure_ascii=False
+        ).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stages VALUES (?, ?, ?, ?, ?)",
+                (run_id, stage, category.value, data, time.time())
+            )
+            self._conn.commit()
+
+    def _load(self, run_id: str, stage: str, category: NewsCategory) -> Optional[List[Article]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT articles FROM stages WHERE run_id = ? AND stage = ? AND category = ?",
+                (run_id, stage, category.value)
+            ).fetchone()
+        if row is None:
+            return None
+        return [Article.from_dict(entry) for entry in json.loads(zlib.decompress(row[0]))]
+
+    def _stages(self, run_id: str, category: NewsCategory) -> set:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage FROM stages WHERE run_id = ? AND category = ?", (run_id, category.value)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _update(self, run_id: str, delivered: Optional[List[str]] = None, finished: Optional[bool] = None):
+        with self._lock:
+            if delivered is not None:
+                self._conn.execute("UPDATE runs SET delivered = ? WHERE run_id = ?",
+                                   (json.dumps(delivered, ensure_ascii=False), run_id))
+            if finished is not None:
+                self._conn.execute("UPDATE runs SET finished = ? WHERE run_id = ?", (int(finished), run_id))
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库"""
+        self._conn.close()
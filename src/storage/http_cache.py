@@ -0,0 +1,177 @@
+"""HTTP 响应缓存 - 基于 ETag / Last-Modified 的条件请求"""
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+from src.config import Config
+
+
+@dataclass
+class CachedResponse:
+    """缓存的响应"""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+    entries: Optional[List[dict]]  # 已解析的条目（可选）
+    fetched_at: float
+    complete: bool = False  # 解析时 feed 在达到条数上限前已结束，entries 即全部新鲜条目
+
+
+class HTTPCache:
+    """
+    持久化 HTTP 响应缓存
+
+    保存每个 URL 的 ETag、Last-Modified、响应体和解析后的条目，
+    下次请求时发送条件请求，服务器返回 304 时直接复用缓存。
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: Optional[int] = None,
+                 max_age_days: Optional[float] = None):
+        """
+        Args:
+            path: SQLite 数据库路径，默认 DATA_DIR/http_cache.db
+            max_bytes: 缓存总大小上限（字节）
+            max_age_days: 超过该天数未刷新的条目会被淘汰
+        """
+        self.path = Path(path or Config.DATA_DIR / "http_cache.db")
+        self.max_bytes = max_bytes or Config.HTTP_CACHE_MAX_MB * 1024 * 1024
+        self.max_age = (max_age_days or Config.HTTP_CACHE_MAX_AGE_DAYS) * 86400
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                entries TEXT,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                entries_complete INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        if "entries_complete" not in columns:
+            self._conn.execute("ALTER TABLE responses ADD COLUMN entries_complete INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """读取缓存"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, entries, fetched_at, entries_complete FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        etag, last_modified, body, entries, fetched_at, complete = row
+        return CachedResponse(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            body=body,
+            entries=json.loads(entries) if entries else None,
+            fetched_at=fetched_at,
+            complete=bool(complete)
+        )
+
+    def conditional_headers(self, url: str) -> dict:
+        """生成条件请求头"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def store(self, url: str, headers, body: bytes, entries: Optional[List[dict]] = None,
+              complete: bool = False):
+        """
+        保存一次完整响应
+
+        Args:
+            url: 请求地址
+            headers: 响应头
+            body: 响应体
+            entries: 解析后的条目
+            complete: entries 是否已包含全部新鲜条目（解析没有因条数上限而停止）
+        """
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            # 服务器不支持条件请求，缓存无意义
+            return
+
+        entries_json = json.dumps(entries, ensure_ascii=False) if entries is not None else None
+        size = len(body) + len(entries_json or "")
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, last_modified, body, entries, size, fetched_at, "
+                "accessed_at, entries_complete) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, entries_json, size, now, now, int(complete))
+            )
+            self._conn.commit()
+
+    def touch(self, url: str):
+        """收到 304 后刷新条目的时间戳"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """
+        淘汰过期条目，并在超出大小上限时按最近访问时间淘汰
+
+        Returns:
+            淘汰的条目数量
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE fetched_at < ?", (time.time() - self.max_age,)
+            )
+            removed = cursor.rowcount
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT url, size FROM responses ORDER BY accessed_at"
+                ).fetchall()
+                stale = []
+                for url, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((url,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE url = ?", stale)
+                removed += len(stale)
+
+            self._conn.commit()
+
+        return removed
+
+    def close(self):
+        """淘汰过期条目并关闭数据库"""
+        self.evict()
+        self._conn.close()
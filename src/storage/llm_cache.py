@@ -0,0 +1,128 @@
+"""LLM 结果缓存 - 按内容寻址，LRU + TTL 淘汰"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from src.config import Config
+
+
+def make_key(model: str, template: str, *parts: str) -> str:
+    """由模型、提示词模板和（截断后的）输入内容计算缓存键"""
+    digest = hashlib.sha256()
+    for part in (model, template) + parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    评分和摘要结果的持久化缓存
+
+    相同模型、相同提示词、相同输入的请求直接返回缓存结果，不再调用 API。
+    超过 TTL 的条目失效，条目数超过上限时淘汰最久未使用的条目。
+    命中的访问时间和新写入的条目先记在内存中，flush 时在一个事务中写入（AI 阶段结束、淘汰和关闭时），
+    命中和写入不会各自提交一次。
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: Optional[int] = None,
+                 ttl_days: Optional[float] = None):
+        """
+        Args:
+            path: SQLite 数据库路径，默认 DATA_DIR/llm_cache.db
+            max_entries: 最多保留的条目数
+            ttl_days: 条目有效天数
+        """
+        self.path = Path(path or Config.DATA_DIR / "llm_cache.db")
+        self.max_entries = max_entries or Config.LLM_CACHE_MAX_ENTRIES
+        self.ttl = (ttl_days or Config.LLM_CACHE_TTL_DAYS) * 86400
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed_at);
+        """)
+        self._conn.commit()
+        self._pending: Dict[str, Tuple[str, float]] = {}  # 未写入的条目：键 -> (值的 JSON, 写入时间)
+        self._accessed: Dict[str, float] = {}  # 未写入的访问时间
+        self.evict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存，过期或不存在时返回 None"""
+        now = time.time()
+        with self._lock:
+            if key in self._pending:
+                value, created_at = self._pending[key]
+            else:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, created_at = row
+
+            # 过期的条目由 evict 删除
+            if created_at < now - self.ttl:
+                return None
+            self._accessed[key] = now
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        """写入缓存（flush 后持久化）"""
+        with self._lock:
+            self._pending[key] = (json.dumps(value, ensure_ascii=False), time.time())
+            self._accessed.pop(key, None)
+
+    def flush(self):
+        """把内存中的新条目和访问时间在一个事务中写入数据库"""
+        with self._lock:
+            if not self._pending and not self._accessed:
+                return
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                [(key, value, created_at, created_at) for key, (value, created_at) in self._pending.items()]
+            )
+            self._conn.executemany(
+                "UPDATE results SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+            )
+            self._conn.commit()
+            self._pending.clear()
+            self._accessed.clear()
+
+    def evict(self) -> int:
+        """
+        淘汰过期条目，并在超出条目上限时淘汰最久未使用的条目
+
+        Returns:
+            淘汰的条目数量
+        """
+        self.flush()
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM results WHERE created_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+            removed += self._conn.execute("""
+                DELETE FROM results WHERE key IN (
+                    SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,)).rowcount
+            self._conn.commit()
+
+        return removed
+
+    def close(self):
+        """写入未保存的条目并关闭数据库"""
+        self.flush()
+        self._conn.close()
@@ -0,0 +1,158 @@
+"""跨运行的已处理文章索引"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+from src.models.article import Article
+from src.config import Config
+
+
+class SeenStore:
+    """
+    已评分/已推送文章的持久化索引
+
+    以归一化 URL 和标题指纹为键。已推送的文章在后续运行中直接丢弃，
+    已评分但未推送的文章附带上次的评分和摘要，跳过 AI 调用。
+    """
+
+    STATUS_SCORED = "scored"
+    STATUS_PUSHED = "pushed"
+
+    def __init__(self, path: Optional[Path] = None, retention_days: Optional[float] = None):
+        """
+        Args:
+            path: SQLite 数据库路径，默认 DATA_DIR/seen_articles.db
+            retention_days: 记录保留天数，compact 时清理更早的记录
+        """
+        self.path = Path(path or Config.DATA_DIR / "seen_articles.db")
+        self.retention = (retention_days or Config.SEEN_RETENTION_DAYS) * 86400
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen (
+                url_key TEXT PRIMARY KEY,
+                title_key TEXT NOT NULL,
+                title TEXT,
+                status TEXT NOT NULL,
+                score REAL,
+                summary TEXT,
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_seen_title ON seen (title_key);
+            CREATE INDEX IF NOT EXISTS idx_seen_updated ON seen (updated_at);
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(seen)")}
+        if "title" not in columns:
+            self._conn.execute("ALTER TABLE seen ADD COLUMN title TEXT")
+        self._conn.commit()
+
+    def lookup(self, article: Article) -> Optional[dict]:
+        """按归一化 URL 或标题指纹查找记录"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, score, summary FROM seen WHERE url_key = ? OR title_key = ? "
+                "ORDER BY status = ? DESC LIMIT 1",
+                (article.norm_url, article.title_fingerprint, self.STATUS_PUSHED)
+            ).fetchone()
+
+        if row is None:
+            return None
+        status, score, summary = row
+        return {"status": status, "score": score, "summary": summary}
+
+    def filter_new(self, articles: List[Article]) -> List[Article]:
+        """
+        过滤已处理过的文章
+
+        Args:
+            articles: 文章列表
+
+        Returns:
+            需要进入 AI 阶段的文章（已推送的被丢弃，已评分的附带缓存结果）
+        """
+        result = []
+        for article in articles:
+            record = self.lookup(article)
+            if record is None:
+                result.append(article)
+                continue
+
+            if record["status"] == self.STATUS_PUSHED:
+                continue
+
+            if record["score"] is not None:
+                article.score = record["score"]
+            if record["summary"] and not article.summary:
+                article.summary = record["summary"]
+            result.append(article)
+
+        return result
+
+    def recent_pushed_titles(self, days: float = 7, limit: int = 200) -> List[str]:
+        """最近推送过的文章标题（用于预排序的相似度参考）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title FROM seen WHERE status = ? AND title IS NOT NULL AND updated_at >= ? "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (self.STATUS_PUSHED, time.time() - days * 86400, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_scored(self, articles: Iterable[Article]):
+        """记录已评分（及已生成摘要）的文章，AI 调用失败时的默认评分不记录"""
+        self._upsert(
+            (article for article in articles if article.score > 0 and not article.score_fallback),
+            self.STATUS_SCORED
+        )
+
+    def mark_pushed(self, articles: Iterable[Article]):
+        """记录已推送的文章"""
+        self._upsert(articles, self.STATUS_PUSHED)
+
+    def _upsert(self, articles: Iterable[Article], status: str):
+        """写入或更新记录，已推送的记录不会被降级为已评分；默认评分和摘要不写入"""
+        now = time.time()
+        rows = [
+            (article.norm_url, article.title_fingerprint, article.title, status,
+             None if article.score_fallback else article.score or None,
+             None if article.summary_fallback else article.summary, now, now)
+            for article in articles
+        ]
+
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO seen (url_key, title_key, title, status, score, summary, first_seen, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url_key) DO UPDATE SET
+                    status = CASE WHEN seen.status = 'pushed' THEN seen.status ELSE excluded.status END,
+                    score = COALESCE(excluded.score, seen.score),
+                    summary = COALESCE(excluded.summary, seen.summary),
+                    updated_at = excluded.updated_at
+            """, rows)
+            self._conn.commit()
+
+    def compact(self) -> int:
+        """
+        清理超出保留期的记录并整理数据库文件
+
+        Returns:
+            清理的记录数量
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM seen WHERE updated_at < ?", (time.time() - self.retention,)
+            )
+            removed = cursor.rowcount
+            self._conn.commit()
+            if removed:
+                self._conn.execute("VACUUM")
+
+        return removed
+
+    def close(self):
+        """关闭数据库"""
+        self._conn.close()
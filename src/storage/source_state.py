@@ -0,0 +1,65 @@
+"""数据源状态 - 每个源的上次获取时间和结果"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+from src.config import Config
+
+
+class SourceStateStore:
+    """
+    持久化的数据源状态
+
+    以源名称为键保存上次成功获取的时间和条目，未到刷新间隔的源直接复用这些条目。
+    源的地址变化后旧状态不再使用。
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite 数据库路径，默认 DATA_DIR/source_state.db
+        """
+        self.path = Path(path or Config.DATA_DIR / "source_state.db")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                name TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                entries TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, name: str, url: str = "") -> Optional[Tuple[float, List[dict]]]:
+        """
+        读取源的状态
+
+        Returns:
+            (上次获取时间戳, 条目列表)，没有记录或地址已变化时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, fetched_at, entries FROM sources WHERE name = ?", (name,)
+            ).fetchone()
+
+        if row is None or row[0] != url:
+            return None
+        return row[1], json.loads(row[2])
+
+    def store(self, name: str, url: str, entries: List[dict], fetched_at: Optional[float] = None):
+        """保存一次成功获取的结果"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                (name, url, fetched_at or time.time(), json.dumps(entries, ensure_ascii=False))
+            )
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库"""
+        self._conn.close()
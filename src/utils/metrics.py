@@ -0,0 +1,277 @@
+"""运行指标 - 记录每轮运行的阶段耗时、获取、LLM 用量和推送结果，导出为 JSON Lines 和 Prometheus 文本格式"""
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.config import Config
+
+TOKEN_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩法百分位数（q 取 0~100），空列表返回 0"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _latency_summary(values: List[float]) -> dict:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 4),
+        "p90": round(percentile(values, 90), 4),
+        "p99": round(percentile(values, 99), 4),
+        "max": round(max(values), 4) if values else 0.0,
+        "sum": round(sum(values), 4),
+    }
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RunMetrics:
+    """
+    单轮运行的指标
+
+    各模块通过模块级的 metrics 实例记录，run.py 在运行结束时调用 export()。
+    记录方法是线程安全的，可以在事件循环和线程池中调用。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, run_id: Optional[str] = None):
+        """开始新一轮运行，清空已有指标"""
+        with self._lock:
+            self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+            self.started_at = time.time()
+            # 阶段 -> {busy, start, end, calls}，流水线中各阶段重叠执行，busy 为处理时间之和
+            self.stages: Dict[str, dict] = {}
+            # 源 -> {requests, errors, bytes, articles, latencies}
+            self.sources: Dict[str, dict] = {}
+            # 阶段 -> 分类 -> {in, out}
+            self.counts: Dict[str, Dict[str, Counter]] = defaultdict(lambda: defaultdict(Counter))
+            self.llm_latencies: Dict[str, List[float]] = defaultdict(list)
+            self.llm_requests: Counter = Counter()
+            self.llm_errors: Counter = Counter()
+            self.llm_tokens: Counter = Counter()
+            self.sends: List[dict] = []
+
+    # ------------------------------------------------------------------
+    # 记录
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """统计一段代码的耗时，计入阶段 name"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record_stage(name, start, time.time())
+
+    def record_stage(self, name: str, start: float, end: float):
+        """记录阶段的一次执行（start/end 为 time.time() 时间戳）"""
+        with self._lock:
+            stage = self.stages.setdefault(name, {"busy": 0.0, "start": start, "end": end, "calls": 0})
+            stage["busy"] += end - start
+            stage["start"] = min(stage["start"], start)
+            stage["end"] = max(stage["end"], end)
+            stage["calls"] += 1
+
+    def _source(self, name: str) -> dict:
+        return self.sources.setdefault(
+            name, {"requests": 0, "errors": 0, "bytes": 0, "articles": 0, "not_modified": 0, "latencies": []}
+        )
+
+    def record_fetch(self, source: str, seconds: float, nbytes: int = 0, status: Optional[int] = None,
+                     error: bool = False):
+        """记录一次源请求"""
+        with self._lock:
+            entry = self._source(source)
+            entry["requests"] += 1
+            entry["bytes"] += nbytes
+            entry["latencies"].append(seconds)
+            if status == 304:
+                entry["not_modified"] += 1
+            if error:
+                entry["errors"] += 1
+
+    def record_articles(self, source: str, count: int):
+        """记录源产出的文章数"""
+        with self._lock:
+            self._source(source)["articles"] += count
+
+    def record_counts(self, stage: str, category: str, count_in: int, count_out: int):
+        """记录某个阶段一个分类的输入/输出文章数"""
+        with self._lock:
+            self.counts[stage][category]["in"] += count_in
+            self.counts[stage][category]["out"] += count_out
+
+    def record_llm(self, kind: str, seconds: Optional[float] = None, usage=None,
+                   error: Optional[Exception] = None):
+        """
+        记录一次 LLM 调用
+
+        Args:
+            kind: 调用类型（score / score_batch / summary / message_batch）
+            seconds: 耗时，批处理结果等无法计时的传 None
+            usage: 响应中的 usage 对象
+            error: 失败时的异常
+        """
+        with self._lock:
+            self.llm_requests[kind] += 1
+            if seconds is not None:
+                self.llm_latencies[kind].append(seconds)
+            if error is not None:
+                self.llm_errors[error.__class__.__name__] += 1
+            if usage is not None:
+                for field in TOKEN_FIELDS:
+                    self.llm_tokens[field] += getattr(usage, field, None) or 0
+
+    def record_send(self, target: str, seconds: float, success: bool, detail: str = "", attempts: int = 1):
+        """记录一次推送"""
+        with self._lock:
+            self.sends.append({
+                "target": target,
+                "seconds": round(seconds, 4),
+                "success": success,
+                "attempts": attempts,
+                "detail": detail,
+            })
+
+    # ------------------------------------------------------------------
+    # 导出
+    # ------------------------------------------------------------------
+
+    def summary(self) -> dict:
+        """当前指标的汇总（可序列化为 JSON）"""
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+                "duration": round(time.time() - self.started_at, 4),
+                "stages": {
+                    name: {
+                        "wall": round(stage["end"] - stage["start"], 4),
+                        "busy": round(stage["busy"], 4),
+                        "calls": stage["calls"],
+                    }
+                    for name, stage in self.stages.items()
+                },
+                "sources": {
+                    name: {
+                        "requests": entry["requests"],
+                        "errors": entry["errors"],
+                        "not_modified": entry["not_modified"],
+                        "bytes": entry["bytes"],
+                        "articles": entry["articles"],
+                        "latency": _latency_summary(entry["latencies"]),
+                    }
+                    for name, entry in self.sources.items()
+                },
+                "counts": {
+                    stage: {category: dict(counter) for category, counter in categories.items()}
+                    for stage, categories in self.counts.items()
+                },
+                "llm": {
+                    "requests": dict(self.llm_requests),
+                    "errors": dict(self.llm_errors),
+                    "tokens": {field: self.llm_tokens[field] for field in TOKEN_FIELDS},
+                    "latency": {kind: _latency_summary(values) for kind, values in self.llm_latencies.items()},
+                },
+                "sends": list(self.sends),
+            }
+
+    def to_prometheus(self, summary: Optional[dict] = None) -> str:
+        """Prometheus textfile 格式（供 node_exporter textfile collector 读取）"""
+        summary = summary or self.summary()
+        lines: List[str] = []
+
+        def metric(name: str, help_text: str, kind: str, samples: List[Tuple[dict, float]]):
+            lines.append(f"# HELP news_{name} {help_text}")
+            lines.append(f"# TYPE news_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"news_{name}{{{label_text}}} {value}" if label_text else f"news_{name} {value}")
+
+        metric("run_timestamp_seconds", "运行开始时间", "gauge", [({}, round(self.started_at, 3))])
+        metric("run_duration_seconds", "运行总耗时", "gauge", [({}, summary["duration"])])
+        metric("stage_wall_seconds", "阶段从开始到结束的时间", "gauge",
+               [({"stage": name}, stage["wall"]) for name, stage in summary["stages"].items()])
+        metric("stage_busy_seconds", "阶段处理时间之和", "gauge",
+               [({"stage": name}, stage["busy"]) for name, stage in summary["stages"].items()])
+
+        sources = summary["sources"].items()
+        metric("fetch_requests", "源请求数", "gauge", [({"source": n}, s["requests"]) for n, s in sources])
+        metric("fetch_errors", "源请求失败数", "gauge", [({"source": n}, s["errors"]) for n, s in sources])
+        metric("fetch_bytes", "源下载字节数", "gauge", [({"source": n}, s["bytes"]) for n, s in sources])
+        metric("fetch_articles", "源产出文章数", "gauge", [({"source": n}, s["articles"]) for n, s in sources])
+        metric("fetch_latency_seconds", "源请求延迟", "gauge", [
+            ({"source": n, "quantile": q}, s["latency"][key])
+            for n, s in sources for q, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"))
+        ])
+
+        metric("articles", "各阶段的输入/输出文章数", "gauge", [
+            ({"stage": stage, "category": category, "direction": direction}, value)
+            for stage, categories in summary["counts"].items()
+            for category, counter in categories.items()
+            for direction, value in counter.items()
+        ])
+
+        llm = summary["llm"]
+        metric("llm_requests", "LLM 调用次数", "gauge", [({"kind": k}, v) for k, v in llm["requests"].items()])
+        metric("llm_errors", "LLM 调用失败次数", "gauge", [({"error": k}, v) for k, v in llm["errors"].items()])
+        metric("llm_tokens", "LLM token 用量", "gauge", [({"type": k}, v) for k, v in llm["tokens"].items()])
+        metric("llm_latency_seconds", "LLM 调用延迟", "gauge", [
+            ({"kind": kind, "quantile": q}, latency[key])
+            for kind, latency in llm["latency"].items()
+            for q, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"))
+        ])
+
+        metric("send_seconds", "推送耗时", "gauge", [({"target": s["target"]}, s["seconds"]) for s in summary["sends"]])
+        metric("send_success", "推送是否成功", "gauge",
+               [({"target": s["target"]}, int(s["success"])) for s in summary["sends"]])
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: Optional[Path] = None) -> Tuple[Path, Path]:
+        """
+        导出指标
+
+        追加一行到 metrics.jsonl（每轮一行），覆盖写入 metrics.prom。
+
+        Args:
+            directory: 输出目录，默认 LOGS_DIR
+
+        Returns:
+            (JSON Lines 文件路径, Prometheus 文件路径)
+        """
+        directory = Path(directory or Config.LOGS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        summary = self.summary()
+
+        jsonl_path = directory / "metrics.jsonl"
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+
+        # 先写临时文件再替换，避免采集端读到写了一半的文件
+        prom_path = directory / "metrics.prom"
+        tmp_path = prom_path.with_suffix(".prom.tmp")
+        tmp_path.write_text(self.to_prometheus(summary), encoding="utf-8")
+        os.replace(tmp_path, prom_path)
+
+        return jsonl_path, prom_path
+
+
+# 全局指标实例
+metrics = RunMetrics()
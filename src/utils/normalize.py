@@ -0,0 +1,82 @@
+"""URL 与标题归一化工具"""
+import hashlib
+import re
+import unicodedata
+from typing import List
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# 不影响文章内容的跟踪参数
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "spm", "from", "ref", "ref_src", "share_token", "mc_cid", "mc_eid",
+}
+
+_PUNCT_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_url(url: str) -> str:
+    """
+    归一化 URL，使 http/https、www 前缀、utm_* 参数、末尾斜杠和锚点的差异不影响去重
+
+    Returns:
+        形如 host/path?query 的归一化键
+    """
+    if not url:
+        return ""
+
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith(":80") or host.endswith(":443"):
+        host = host.rsplit(":", 1)[0]
+
+    path = parts.path.rstrip("/") or ""
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    normalized = f"{host}{path}"
+    if query:
+        normalized += "?" + urlencode(query)
+    return normalized
+
+
+def normalize_title(title: str) -> str:
+    """归一化标题：全角转半角、小写、去掉标点和空白"""
+    text = unicodedata.normalize("NFKC", title or "").lower()
+    return _PUNCT_RE.sub("", text)
+
+
+def title_fingerprint(title: str, normalized: bool = False) -> str:
+    """标题指纹（归一化标题的短哈希），normalized 为 True 表示 title 已经归一化"""
+    text = title if normalized else normalize_title(title)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def content_hash(content: str) -> int:
+    """正文哈希（忽略空白差异的 64 位整数）"""
+    text = " ".join((content or "").split())
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*|[぀-ヿ㐀-鿿가-힯]+")
+_CJK_CHAR_RE = re.compile(r"[぀-ヿ㐀-鿿가-힯]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    简单分词：拉丁文按单词切分，中日韩文字切成二元组（单字词保留原样）
+    """
+    tokens = []
+    for word in _WORD_RE.findall(unicodedata.normalize("NFKC", text or "").lower()):
+        if _CJK_CHAR_RE.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1:
+            tokens.append(word)
+    return tokens
@@ -0,0 +1,77 @@
+"""令牌桶限流器"""
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    以 rate_per_minute 的速度补充令牌，最多积攒 capacity 个。
+    超过容量的请求允许透支，后续请求会等待透支部分补齐。
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: 每分钟补充的令牌数，<= 0 表示不限流
+            capacity: 桶容量，默认等于每分钟速率
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """预留令牌，返回需要等待的秒数"""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, amount: float = 1):
+        """获取令牌（阻塞等待）"""
+        wait = self._reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, amount: float = 1):
+        """获取令牌（异步等待）"""
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RateLimiter:
+    """同时限制每分钟请求数（RPM）和每分钟 token 数（TPM）"""
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        """
+        Args:
+            requests_per_minute: 每分钟请求数上限，0 表示不限
+            tokens_per_minute: 每分钟 token 数上限，0 表示不限
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, tokens: int = 0):
+        """为一次请求获取配额（阻塞等待）"""
+        self.requests.acquire(1)
+        if tokens:
+            self.tokens.acquire(tokens)
+
+    async def acquire_async(self, tokens: int = 0):
+        """为一次请求获取配额（异步等待）"""
+        await self.requests.acquire_async(1)
+        if tokens:
+            await self.tokens.acquire_async(tokens)
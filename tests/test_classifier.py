@@ -0,0 +1,67 @@
+"""主题分类器（整词边界匹配）的单元测试"""
+import unittest
+from src.models.article import NewsCategory
+from src.processor.classifier import KeywordMatcher, TopicClassifier
+
+AI = NewsCategory.AI
+TECH = NewsCategory.TECH
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.matcher = KeywordMatcher(["ai", "gpt", "a.i.", "openai", "人工智能"])
+
+    def matches(self, text: str):
+        return [keyword for _, keyword in self.matcher.finditer(text.lower())]
+
+    def test_latin_keyword_requires_word_boundary(self):
+        self.assertEqual(self.matches("He said the rain stopped"), [])
+        self.assertEqual(self.matches("Maintain the main chain"), [])
+        self.assertEqual(self.matches("AI startup, ai-powered (AI)"), ["ai", "ai", "ai"])
+
+    def test_letter_keyword_may_be_followed_by_digits(self):
+        self.assertEqual(self.matches("gpt4 and GPT-5"), ["gpt", "gpt"])
+        self.assertEqual(self.matches("gpts"), [])
+
+    def test_longest_keyword_wins(self):
+        self.assertEqual(self.matches("OpenAI ships"), ["openai"])
+
+    def test_punctuated_keyword(self):
+        self.assertEqual(self.matches("the a.i. boom"), ["a.i."])
+
+    def test_cjk_keyword_needs_no_boundary(self):
+        self.assertEqual(self.matches("发展人工智能产业"), ["人工智能"])
+
+
+class TopicClassifierTest(unittest.TestCase):
+    def setUp(self):
+        self.classifier = TopicClassifier({
+            AI: {"ai": 1.0, "model": 0.5},
+            TECH: {"chip": 1.0, "model": 0.5},
+        })
+
+    def test_said_does_not_count_as_ai(self):
+        self.assertEqual(TopicClassifier().classify("Officials said on Monday").get(AI, 0.0), 0.0)
+        self.assertGreaterEqual(TopicClassifier().classify("New AI lab opens").get(AI, 0.0), 1.0)
+
+    def test_title_hit_outweighs_content_hit(self):
+        self.assertEqual(self.classifier.classify("AI news"), {AI: 1.0})
+        self.assertEqual(self.classifier.classify("News", "about ai"), {AI: 0.5})
+
+    def test_keyword_counted_once_and_in_every_category(self):
+        scores = self.classifier.classify("model model", "model")
+        self.assertEqual(scores, {AI: 0.5, TECH: 0.5})
+
+    def test_markup_and_links_ignored(self):
+        content = '<a href="https://ai.example.com/ai">link</a> &ai; plain'
+        self.assertEqual(self.classifier.classify("Title", content), {})
+
+    def test_route_uses_threshold_and_default(self):
+        self.assertIs(self.classifier.route({AI: 2.0, TECH: 1.0}, TECH, threshold=1.0), AI)
+        self.assertIs(self.classifier.route({AI: 0.5}, TECH, threshold=1.0), TECH)
+        self.assertIs(self.classifier.route({AI: 1.0, TECH: 1.0}, TECH, threshold=1.0), TECH)
+        self.assertIs(self.classifier.route({}, TECH), TECH)
+
+
+if __name__ == "__main__":
+    unittest.main()
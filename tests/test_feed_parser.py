@@ -0,0 +1,80 @@
+"""流式 feed 解析和 feedparser 回退的单元测试"""
+import unittest
+from datetime import datetime
+from unittest import mock
+from src.fetcher import feed_parser
+from src.fetcher.feed_parser import iter_entries, parse_feed
+
+
+def rss(items: str, encoding: str = "utf-8") -> bytes:
+    return (f'<?xml version="1.0" encoding="{encoding}"?>'
+            f'<rss version="2.0"><channel><title>Feed</title>{items}</channel></rss>').encode(encoding)
+
+
+def item(i: int, pub_date: str = "Thu, 01 Jan 2026 12:00:00 GMT", description: str = "") -> str:
+    return (f"<item><title>Title {i}</title><link>https://example.com/{i}</link>"
+            f"<description>{description or f'Body {i}'}</description><pubDate>{pub_date}</pubDate></item>")
+
+
+class StreamingParserTest(unittest.TestCase):
+    def test_rss_fields_and_utc_dates(self):
+        entries = parse_feed(rss(item(1, "Thu, 01 Jan 2026 20:00:00 +0800")))
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].title, "Title 1")
+        self.assertEqual(entries[0].link, "https://example.com/1")
+        self.assertEqual(entries[0].content, "Body 1")
+        self.assertEqual(entries[0].published_at, datetime(2026, 1, 1, 12, 0))
+
+    def test_atom_alternate_link(self):
+        data = (b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>Atom</title>'
+                b'<link rel="self" href="https://example.com/self"/><link href="https://example.com/a"/>'
+                b'<summary>S</summary><updated>2026-01-01T12:00:00Z</updated></entry></feed>')
+        entries = parse_feed(data)
+        self.assertEqual([(e.title, e.link) for e in entries], [("Atom", "https://example.com/a")])
+
+    def test_limit_and_max_content(self):
+        entries = parse_feed(rss("".join(item(i, description="x" * 50) for i in range(10))), limit=3, max_content=10)
+        self.assertEqual([e.title for e in entries], ["Title 0", "Title 1", "Title 2"])
+        self.assertTrue(all(len(e.content) == 10 for e in entries))
+
+    def test_stops_after_stale_streak(self):
+        fresh = "Thu, 01 Jan 2026 12:00:00 GMT"
+        stale = "Mon, 01 Dec 2025 12:00:00 GMT"
+        items = item(0, fresh) + item(1, stale) + item(2, fresh) + "".join(item(i, stale) for i in range(3, 6))
+        items += item(6, fresh)
+        entries = list(iter_entries(rss(items), since=datetime(2025, 12, 31)))
+        # 单个过期条目只被跳过；连续 STALE_STREAK 个过期条目后不再解析（条目 6 不会产出）
+        self.assertEqual([e.title for e in entries], ["Title 0", "Title 2"])
+
+
+class FallbackTest(unittest.TestCase):
+    def test_undefined_entity_falls_back_to_feedparser(self):
+        data = rss(item(1, description="Caf&eacute; &nbsp; news") + item(2))
+        with mock.patch.object(feed_parser, "_iter_feedparser", wraps=feed_parser._iter_feedparser) as fallback:
+            entries = parse_feed(data)
+        fallback.assert_called_once()
+        self.assertEqual([e.link for e in entries], ["https://example.com/1", "https://example.com/2"])
+        self.assertEqual(entries[1].published_at, datetime(2026, 1, 1, 12, 0))
+
+    def test_error_after_first_entry_does_not_duplicate(self):
+        data = rss(item(1) + item(2, description="broken &nbsp; entity") + item(3))
+        entries = parse_feed(data)
+        self.assertEqual([e.title for e in entries], ["Title 1", "Title 2", "Title 3"])
+
+    def test_fallback_respects_limit_and_since(self):
+        items = item(1) + item(2, "Mon, 01 Dec 2025 12:00:00 GMT", "&nbsp;") + item(3) + item(4)
+        entries = parse_feed(rss(items), limit=2, since=datetime(2025, 12, 31))
+        self.assertEqual([e.title for e in entries], ["Title 1", "Title 3"])
+
+    def test_unsupported_encoding_falls_back(self):
+        data = rss(item(1, description="央行降准"), encoding="gb2312")
+        entries = parse_feed(data)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].content, "央行降准")
+
+    def test_garbage_returns_no_entries(self):
+        self.assertEqual(parse_feed(b"<html><body>not a feed"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""飞书机器人签名、重试和 Webhook 名称的单元测试"""
+import base64
+import hashlib
+import hmac
+import json
+import unittest
+from unittest import mock
+import requests
+from src.feishu_bot import FeishuBot, Webhook
+
+TIMESTAMP = 1700000000
+SECRET = "demo-secret"
+
+
+def reference_sign(timestamp: int, secret: str) -> str:
+    """飞书文档中的签名示例：以 "timestamp\\n密钥" 为密钥对空消息做 HMAC-SHA256，Base64 编码"""
+    string_to_sign = "{}\n{}".format(timestamp, secret)
+    hmac_code = hmac.new(string_to_sign.encode("utf-8"), digestmod=hashlib.sha256).digest()
+    return base64.b64encode(hmac_code).decode("utf-8")
+
+
+def make_response(status: int, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    return response
+
+
+class SignTest(unittest.TestCase):
+    def setUp(self):
+        self.bot = FeishuBot(webhooks=[Webhook("https://example.com/hook/signed", SECRET)], rate_per_minute=0)
+        self.webhook = self.bot.webhooks[0]
+
+    def test_generate_sign_matches_reference(self):
+        self.assertEqual(self.bot._generate_sign(TIMESTAMP, SECRET), reference_sign(TIMESTAMP, SECRET))
+
+    def test_generate_sign_without_key(self):
+        self.assertEqual(FeishuBot()._generate_sign(TIMESTAMP), "")
+
+    def test_sign_body_adds_fields_to_shared_body(self):
+        body = json.dumps({"msg_type": "text", "content": {"text": "你好"}}, ensure_ascii=False).encode("utf-8")
+        original = bytes(body)
+        with mock.patch("src.feishu_bot.time.time", return_value=TIMESTAMP):
+            signed = json.loads(self.bot._sign_body(self.webhook, body))
+
+        self.assertEqual(signed, {
+            "timestamp": str(TIMESTAMP),
+            "sign": reference_sign(TIMESTAMP, SECRET),
+            "msg_type": "text",
+            "content": {"text": "你好"},
+        })
+        self.assertEqual(body, original)
+
+    def test_sign_body_empty_object_and_leading_whitespace(self):
+        with mock.patch("src.feishu_bot.time.time", return_value=TIMESTAMP):
+            self.assertEqual(json.loads(self.bot._sign_body(self.webhook, b"{}"))["timestamp"], str(TIMESTAMP))
+            self.assertEqual(json.loads(self.bot._sign_body(self.webhook, b' \n{"a": 1}'))["a"], 1)
+
+    def test_unsigned_webhook_body_unchanged(self):
+        body = b'{"msg_type":"text"}'
+        self.assertIs(self.bot._sign_body(Webhook("https://example.com/hook/plain"), body), body)
+
+    def test_signature_sent_in_body_not_url(self):
+        calls = []
+
+        def post(url, data=None, headers=None, timeout=None):
+            calls.append((url, json.loads(data)))
+            return make_response(200, b'{"code":0}')
+
+        self.bot.session.post = post
+        self.assertTrue(self.bot._deliver(self.webhook, b'{"msg_type":"text"}')["success"])
+        url, data = calls[0]
+        self.assertEqual(url, self.webhook.url)
+        self.assertEqual(set(data), {"timestamp", "sign", "msg_type"})
+
+
+class DeliverTest(unittest.TestCase):
+    def setUp(self):
+        self.bot = FeishuBot(webhooks=[Webhook("https://example.com/hook/a")], backoff_base=0, rate_per_minute=0)
+        self.webhook = self.bot.webhooks[0]
+
+    def deliver(self, *responses):
+        queue = list(responses)
+        self.bot.session.post = lambda *args, **kwargs: queue.pop(0)
+        return self.bot._deliver(self.webhook, b"{}")
+
+    def test_retries_gateway_error_with_html_body(self):
+        result = self.deliver(make_response(502, b"<html>Bad Gateway</html>"), make_response(200, b'{"code":0}'))
+        self.assertTrue(result["success"])
+        self.assertEqual(result["attempts"], 2)
+
+    def test_retries_throttle_code(self):
+        result = self.deliver(make_response(200, b'{"code":9499,"msg":"too many"}'), make_response(200, b'{"code":0}'))
+        self.assertTrue(result["success"])
+        self.assertEqual(result["attempts"], 2)
+
+    def test_client_error_is_not_retried(self):
+        result = self.deliver(make_response(400, b"not json"))
+        self.assertFalse(result["success"])
+        self.assertEqual(result["attempts"], 1)
+        self.assertEqual(result["error"], "HTTP 400")
+
+
+class WebhookNameTest(unittest.TestCase):
+    def test_default_names_differ_for_same_url_suffix(self):
+        a = Webhook("https://open.feishu.cn/open-apis/bot/v2/hook/aaaa-123456")
+        b = Webhook("https://open.feishu.cn/open-apis/bot/v2/hook/bbbb-123456")
+        self.assertNotEqual(a.name, b.name)
+        self.assertNotIn("123456", a.name)
+
+    def test_duplicate_names_in_plan_rejected(self):
+        bot = FeishuBot()
+        plan = [(Webhook("https://example.com/1", name="team"), [b"{}"]),
+                (Webhook("https://example.com/2", name="team"), [b"{}"])]
+        with self.assertRaises(ValueError):
+            bot.send_payloads(plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
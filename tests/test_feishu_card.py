@@ -0,0 +1,121 @@
+"""飞书卡片装箱（字节和元素数上限）的单元测试"""
+import json
+import re
+import unittest
+from src.models.article import Article, NewsCategory, ProcessedArticle
+from src.sender.feishu_card import FeishuCardSender, _CardPacker, _encode, truncate_bytes
+
+
+def make_digest(counts, summary_chars: int = 100):
+    """分类 -> 文章数 的摘要内容，每篇文章的链接唯一"""
+    categorized = {}
+    for category, count in counts.items():
+        categorized[category] = [
+            ProcessedArticle(
+                Article(f"{category.value} 新闻标题 {i}", f"https://example.com/{category.value}/{i}", "",
+                        category, "source", summary="摘要" * (summary_chars // 2)),
+                rank=i, category=category
+            )
+            for i in range(1, count + 1)
+        ]
+    return categorized
+
+
+def card_elements(body: bytes) -> list:
+    return json.loads(body)["card"]["elements"]
+
+
+class CardPackerTest(unittest.TestCase):
+    def test_bodies_respect_byte_and_element_limits(self):
+        packer = _CardPacker("标题", max_bytes=2000, max_elements=4)
+        element = _encode({"tag": "div", "text": {"content": "内容" * 40, "tag": "lark_md"}})
+        for _ in range(20):
+            if not packer.fits(len(element)):
+                packer.new_card()
+            packer.add(element)
+
+        bodies = packer.bodies()
+        self.assertGreater(len(bodies), 1)
+        for i, body in enumerate(bodies, 1):
+            self.assertLessEqual(len(body), 2000)
+            self.assertLessEqual(len(card_elements(body)), 4)
+            self.assertEqual(json.loads(body)["card"]["header"]["title"]["content"], f"标题（{i}/{len(bodies)}）")
+        self.assertEqual(sum(len(card_elements(body)) for body in bodies), 20)
+
+    def test_single_card_title_has_no_page_number(self):
+        packer = _CardPacker("标题", max_bytes=2000, max_elements=4)
+        packer.add(_encode({"tag": "hr"}))
+        self.assertEqual(json.loads(packer.bodies()[0])["card"]["header"]["title"]["content"], "标题")
+
+    def test_fits_counts_separators_and_elements(self):
+        packer = _CardPacker("标题", max_bytes=1000, max_elements=2)
+        self.assertTrue(packer.fits(packer.budget))
+        self.assertFalse(packer.fits(packer.budget + 1))
+        packer.add(b"x" * 10)
+        # 第二个元素前有一个逗号
+        self.assertTrue(packer.fits(packer.budget - 11))
+        self.assertFalse(packer.fits(packer.budget - 10))
+        packer.add(b"y")
+        self.assertFalse(packer.fits(1))
+        self.assertFalse(packer.fits_empty(1, 3))
+
+
+class BuildCardsTest(unittest.TestCase):
+    def setUp(self):
+        self.sender = FeishuCardSender(webhooks=[])
+
+    def build(self, categorized, max_bytes: int, max_elements: int):
+        self.sender.max_bytes = max_bytes
+        self.sender.max_elements = max_elements
+        return self.sender._build_cards(categorized)
+
+    def assert_all_articles_once(self, bodies, categorized):
+        text = "".join(json.dumps(card_elements(body), ensure_ascii=False) for body in bodies)
+        urls = re.findall(r"https://example\.com/[a-z]+/\d+", text)
+        expected = [item.article.url for articles in categorized.values() for item in articles]
+        self.assertEqual(sorted(urls), sorted(expected))
+
+    def test_small_digest_is_one_card(self):
+        categorized = make_digest({NewsCategory.AI: 3, NewsCategory.TECH: 3})
+        bodies = self.build(categorized, max_bytes=20000, max_elements=50)
+        self.assertEqual(len(bodies), 1)
+        self.assert_all_articles_once(bodies, categorized)
+
+    def test_large_digest_split_by_bytes(self):
+        categorized = make_digest({NewsCategory.AI: 10, NewsCategory.FINANCE: 10, NewsCategory.TECH: 10},
+                                  summary_chars=300)
+        bodies = self.build(categorized, max_bytes=6000, max_elements=50)
+        self.assertGreater(len(bodies), 1)
+        for body in bodies:
+            self.assertLessEqual(len(body), 6000)
+        self.assert_all_articles_once(bodies, categorized)
+
+    def test_large_category_split_by_elements(self):
+        categorized = make_digest({NewsCategory.AI: 25})
+        bodies = self.build(categorized, max_bytes=200000, max_elements=10)
+        self.assertGreater(len(bodies), 2)
+        for body in bodies:
+            self.assertLessEqual(len(card_elements(body)), 10)
+        self.assertIn("（续）", bodies[1].decode("utf-8"))
+        self.assert_all_articles_once(bodies, categorized)
+
+    def test_oversized_article_is_truncated_to_fit(self):
+        categorized = make_digest({NewsCategory.AI: 1})
+        categorized[NewsCategory.AI][0].article.title = "很长的标题" * 500
+        bodies = self.build(categorized, max_bytes=3000, max_elements=50)
+        for body in bodies:
+            self.assertLessEqual(len(body), 3000)
+
+
+class TruncateBytesTest(unittest.TestCase):
+    def test_does_not_split_multibyte_characters(self):
+        text = truncate_bytes("中文字符" * 10, 20)
+        self.assertLessEqual(len(text.encode("utf-8")), 20)
+        self.assertTrue(text.endswith("…"))
+
+    def test_short_text_unchanged(self):
+        self.assertEqual(truncate_bytes("short", 20), "short")
+
+
+if __name__ == "__main__":
+    unittest.main()
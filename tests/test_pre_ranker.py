@@ -0,0 +1,43 @@
+"""本地预排序的单元测试"""
+import unittest
+from datetime import datetime
+from src.models.article import Article, NewsCategory
+from src.processor.pre_ranker import PreRanker
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def make_article(title: str, index: int) -> Article:
+    """除标题外其它信号都相同的文章"""
+    return Article(title, f"https://example.com/{index}", "", NewsCategory.AI, "The Verge", published_at=NOW,
+                   topics={NewsCategory.AI: 3.0})
+
+
+class PreRankerTest(unittest.TestCase):
+    def test_similar_to_pushed_titles_ranks_lower(self):
+        ranker = PreRanker(multiplier=1, reference_titles=["OpenAI GPT-5 model benchmark results"])
+        repeat = make_article("OpenAI GPT-5 model benchmark results leaked", 1)
+        fresh = make_article("Robotics startup raises seed round", 2)
+
+        self.assertEqual(ranker.rank([repeat, fresh], top_k=1, category=NewsCategory.AI, now=NOW), [fresh])
+        self.assertEqual(ranker.rank([fresh, repeat], top_k=1, category=NewsCategory.AI, now=NOW), [fresh])
+
+    def test_similarity_is_max_over_pushed_titles(self):
+        ranker = PreRanker(reference_titles=["Nvidia quarterly earnings", "Fed holds rates steady"])
+        similarities = ranker._similarities([
+            make_article("Fed holds rates steady", 1),
+            make_article("Tesla recalls Model Y", 2),
+        ])
+
+        self.assertAlmostEqual(similarities[0], 1.0, places=6)
+        self.assertEqual(similarities[1], 0.0)
+
+    def test_without_pushed_titles_all_articles_are_novel(self):
+        ranker = PreRanker(reference_titles=[])
+        articles = [make_article("Fed holds rates steady", 1), make_article("Tesla recalls Model Y", 2)]
+
+        self.assertEqual(ranker._similarities(articles), [0.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()